@@ -1,49 +1,72 @@
-import subprocess
+import argparse
+import json
+import os
+import time
+
+from git_backend import (
+    DEFAULT_FETCH_TTL,
+    DEFAULT_SCAN_WORKERS,
+    DEFAULT_TARGET,
+    MergeTreeUnsupportedError,
+    conflict_matrix,
+    predict_merge,
+    predict_merges,
+    read_status,
+    run_git,
+    scan_repositories,
+    StatusCache,
+)
 
 # Title: Git Repository Status Checker
 # Author: [Your Name]
 # Purpose: To check the status of the current Git repository, including the current branch,
 #          any uncommitted changes, whether the branch can be merged with the main branch,
 #          provide feedback for improvement, and merge all branches into the current branch.
-
-def run_command(command):
-    """Run a shell command and return its output and exit code."""
-    result = subprocess.run(command, shell=True, text=True, capture_output=True)
-    return result.stdout.strip(), result.returncode
+#          The status itself is read with a single git call through git_backend, and a whole
+#          directory tree of repositories can be scanned concurrently (--scan). Merges are
+#          predicted in memory with git merge-tree before anything touches the working tree.
+#          Counts and predictions are cached by commit OID and fetches are limited by a TTL,
+#          so repeated checks from the menu return almost immediately.
 
 def list_branches():
     """List all branches in the Git repository."""
     print("\n--- Available Branches ---")
-    branches, _ = run_command("git branch --all")
-    print(branches)
+    branches, _ = run_git(["branch", "--all"])
+    print(branches.rstrip())
     print("---------------------------")
 
-def check_git_status():
+def check_git_status(cache=None):
     """Check the current status of the Git repository and provide feedback."""
-    # Check if we are inside a Git repository
-    stdout, returncode = run_command("git rev-parse --is-inside-work-tree")
-    if returncode != 0:
+    cache = cache if cache is not None else StatusCache()
+    if cache.git_dir is None:
+        print("ERROR: Not inside a Git repository.")
+        return
+
+    # Fetch the latest changes from the remote repository first, unless that was done recently
+    if cache.fetch_due():
+        print("Fetching the latest changes from the remote...")
+        cache.fetch(force=True)
+    else:
+        print(f"Skipping fetch: last fetch was {time.time() - cache.last_fetch():.0f} s ago.")
+
+    # Branch, uncommitted changes and commits ahead/behind main (cached by commit OIDs)
+    status = read_status(cache=cache)
+    if status is None:
         print("ERROR: Not inside a Git repository.")
         return
 
-    # Get the current branch name
-    branch_name, _ = run_command("git branch --show-current")
-    print(f"Current branch: {branch_name}")
+    branch_name = status.branch or "HEAD"
+    print(f"Current branch: {status.branch or '(detached HEAD)'}")
 
     # Check for uncommitted changes
-    status, _ = run_command("git status --porcelain")
-    if status:
+    if status.changes:
         print("You have uncommitted changes:")
-        print(status)
+        print("\n".join(status.changes))
     else:
         print("No uncommitted changes.")
 
-    # Fetch the latest changes from the remote repository
-    print("Fetching the latest changes from the remote...")
-    run_command("git fetch")
-
     # Check for commits ahead/behind main
-    commits_ahead, commits_behind = check_branch_status(branch_name)
+    commits_ahead, commits_behind = status.ahead or 0, status.behind or 0
 
     if commits_ahead > 0:
         print(f"You have {commits_ahead} commits ahead of the main branch.")
@@ -51,34 +74,30 @@ def check_git_status():
         print(f"You are {commits_behind} commits behind the main branch.")
 
     # Check if the branch can be merged with main
-    check_merge_status(branch_name)
+    check_merge_status(branch_name, cache)
 
     # Provide feedback for improvement
     provide_feedback(commits_ahead, commits_behind)
 
-def check_branch_status(branch_name):
-    """Check how many commits the current branch is ahead or behind the main branch."""
-    # Get the number of commits ahead and behind
-    stdout_ahead, _ = run_command(f"git rev-list --count {branch_name}..origin/main")
-    stdout_behind, _ = run_command(f"git rev-list --count origin/main..{branch_name}")
-
-    commits_behind = int(stdout_ahead)
-    commits_ahead = int(stdout_behind)
-
-    return commits_ahead, commits_behind
-
-def check_merge_status(branch_name):
+def check_merge_status(branch_name, cache=None):
     """Check if the current branch can be merged with the main branch."""
-    # Get merge base
-    merge_base, _ = run_command(f"git merge-base {branch_name} origin/main")
-    if not merge_base:
+    # Simulate the merge in memory; the working tree and index are never touched
+    try:
+        if cache is not None:
+            prediction = cache.predict_merge(branch_name, DEFAULT_TARGET)
+        else:
+            prediction = predict_merge(branch_name, DEFAULT_TARGET)
+    except MergeTreeUnsupportedError as error:
+        print(f"ERROR: {error}")
+        return
+    if prediction is None:
         print("ERROR: Unable to determine merge base. You may need to pull the latest changes.")
         return
 
-    # Check if the branch can be merged
-    merge_status, _ = run_command(f"git merge --no-commit --no-ff origin/main")
-    if "CONFLICT" in merge_status:
+    if not prediction.clean:
         print("The branch cannot be merged due to conflicts.")
+        for path in prediction.conflicts:
+            print(f"  CONFLICT: {path}")
     else:
         print("The branch can be merged with the main branch.")
 
@@ -94,49 +113,122 @@ def provide_feedback(commits_ahead, commits_behind):
     else:
         print("Your branch is in sync with the main branch. Good job!")
 
+def local_branches():
+    """Return the names of the local branches."""
+    branches, _ = run_git(["for-each-ref", "--format=%(refname:short)", "refs/heads"])
+    return branches.splitlines()
+
 def merge_all_branches():
     """Merge all branches into the current branch."""
-    current_branch, _ = run_command("git branch --show-current")
+    status = read_status()
+    if status is None or status.branch is None:
+        print("ERROR: Check out a branch to merge into first.")
+        return
+    current_branch = status.branch
     print(f"\nMerging all branches into '{current_branch}'...")
 
-    branches, _ = run_command("git branch --format='%(refname:short)'")
-    branch_list = branches.splitlines()
+    # Predict every merge in parallel first, so only the clean ones touch the working tree
+    branch_list = [branch for branch in local_branches() if branch != current_branch]
+    try:
+        predictions = predict_merges(branch_list, current_branch)
+    except MergeTreeUnsupportedError as error:
+        # Without predictions every branch is tried, and a conflicting merge is aborted below
+        print(f"{error} Trying each merge instead.")
+        predictions = None
 
     for branch in branch_list:
-        if branch.strip() != current_branch:
-            print(f"Merging branch: {branch}")
-            # Checkout to the current branch before merging
-            run_command(f"git checkout {current_branch}")
-            # Merge the branch
-            merge_result, merge_returncode = run_command(f"git merge {branch}")
-
-            if merge_returncode != 0:
-                print(f"ERROR: Could not merge branch '{branch}'. Resolve conflicts manually.")
-                continue
-            print(f"Successfully merged branch: {branch}")
-
-def display_menu():
+        if predictions is not None and (predictions[branch] is None or not predictions[branch].clean):
+            print(f"Skipping branch '{branch}': it does not merge cleanly. Resolve conflicts manually.")
+            continue
+        print(f"Merging branch: {branch}")
+        _, merge_returncode = run_git(["merge", "--no-edit", branch])
+
+        if merge_returncode != 0:
+            # An earlier merge in this run can still conflict with this branch; leave no half-merge behind
+            run_git(["merge", "--abort"])
+            print(f"ERROR: Could not merge branch '{branch}'. Resolve conflicts manually.")
+            continue
+        print(f"Successfully merged branch: {branch}")
+
+def print_conflict_matrix(branches):
+    """Print which pairs of branches would conflict if merged (number of conflicted files)."""
+    try:
+        matrix = conflict_matrix(branches)
+    except MergeTreeUnsupportedError as error:
+        print(f"ERROR: {error}")
+        return
+    width = max([len(branch) for branch in branches] + [6])
+    print(" " * width + "".join(f"{index:>6}" for index in range(len(branches))))
+    for row, a in enumerate(branches):
+        cells = []
+        for b in branches:
+            if a == b:
+                cells.append("-")
+            elif matrix[a, b] is None:
+                cells.append("?")
+            else:
+                cells.append(len(matrix[a, b]) or "ok")
+        print(f"{a:<{width}}" + "".join(f"{cell:>6}" for cell in cells) + f"  ({row})")
+    print("Cells show the number of conflicting files ('ok' merges cleanly, '?' cannot be merged).")
+
+def format_count(count):
+    """Show an ahead/behind count, or '-' when it could not be computed (e.g. no target branch)."""
+    return "-" if count is None else str(count)
+
+def print_scan_table(statuses):
+    """Print one line per repository: branch, dirty state and commits ahead/behind the target."""
+    width = max([len("Repository")] + [len(status.path) for status in statuses])
+    print(f"{'Repository':<{width}}  {'Branch':<24}{'State':<14}{'Ahead':>6}{'Behind':>8}")
+    for status in statuses:
+        state = f"{len(status.changes)} changed" if status.changes else "clean"
+        print(f"{status.path:<{width}}  {status.branch or '(detached)':<24}{state:<14}"
+              f"{format_count(status.ahead):>6}{format_count(status.behind):>8}")
+
+def scan_directory(root, as_json=False, workers=DEFAULT_SCAN_WORKERS, fetch=False, target=DEFAULT_TARGET,
+                   fetch_ttl=DEFAULT_FETCH_TTL):
+    """Check every Git repository under root concurrently and report them as a table or JSON."""
+    start = time.perf_counter()
+    statuses = scan_repositories(root, target, workers, fetch, fetch_ttl)
+    if as_json:
+        print(json.dumps([status._asdict() for status in statuses], indent=2))
+        return
+    if not statuses:
+        print(f"No Git repositories found under '{root}'.")
+        return
+    print_scan_table(statuses)
+    print(f"\nScanned {len(statuses)} repositories in {time.perf_counter() - start:.2f} s.")
+
+def display_menu(fetch_ttl=DEFAULT_FETCH_TTL):
     """Display the main menu options to the user."""
     while True:
+        # Reloaded for every action, so changes made outside the menu are picked up
+        cache = StatusCache(fetch_ttl=fetch_ttl)
         print("\n--- Git Repository Status Checker Menu ---")
         print("1. Check Git Status")
         print("2. Check Merge Status")
         print("3. List Available Branches")
         print("4. Merge All Branches")
+        print("5. Scan a Directory of Repositories")
+        print("6. Show Branch Conflict Matrix")
         print("0. Exit")
         
         choice = input("Select an option: ")
         
         if choice == '1':
-            check_git_status()
+            check_git_status(cache)
         elif choice == '2':
             list_branches()
             branch_name = input("Enter the branch name to check merge status: ")
-            check_merge_status(branch_name)
+            check_merge_status(branch_name, cache)
         elif choice == '3':
             list_branches()
         elif choice == '4':
             merge_all_branches()
+        elif choice == '5':
+            root = input("Enter the directory to scan: ") or os.getcwd()
+            scan_directory(root, fetch_ttl=fetch_ttl)
+        elif choice == '6':
+            print_conflict_matrix([DEFAULT_TARGET] + local_branches())
         elif choice == '0':
             print("Exiting the program.")
             break
@@ -144,4 +236,19 @@ def display_menu():
             print("Invalid choice. Please select a valid option.")
 
 if __name__ == "__main__":
-    display_menu()
+    parser = argparse.ArgumentParser(description="Check the status of Git repositories.")
+    parser.add_argument("--scan", metavar="DIR",
+                        help="Report every repository under DIR instead of opening the menu.")
+    parser.add_argument("--json", action="store_true", help="Print the --scan report as JSON.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SCAN_WORKERS,
+                        help="Repositories checked at the same time by --scan.")
+    parser.add_argument("--fetch", action="store_true", help="Fetch each repository before --scan checks it.")
+    parser.add_argument("--fetch-ttl", type=float, default=DEFAULT_FETCH_TTL,
+                        help="Seconds after a fetch before the remote is fetched again.")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Branch to count commits ahead/behind of.")
+    args = parser.parse_args()
+
+    if args.scan:
+        scan_directory(args.scan, args.json, args.workers, args.fetch, args.target, args.fetch_ttl)
+    else:
+        display_menu(args.fetch_ttl)
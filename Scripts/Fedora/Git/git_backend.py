@@ -0,0 +1,399 @@
+import json
+import os
+import subprocess
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Title: Git Status Backend
+# Purpose: Collect the status of a Git repository (branch, uncommitted changes and commits
+#          ahead/behind a target branch) with as few git processes as possible: one
+#          `git status --porcelain=v2 --branch` call, plus one `git rev-list --left-right --count`
+#          when the target is not the branch's upstream. Commands are run without a shell.
+#          Many repositories under one directory can be scanned concurrently, and merges are
+#          predicted with `git merge-tree --write-tree`, which never touches the working tree.
+#          Ahead/behind counts and merge predictions are cached per repository, keyed by the
+#          commit OIDs they were computed from, and fetches are rate-limited by a TTL.
+
+# Branch that the current branch is compared against
+DEFAULT_TARGET = "origin/main"
+
+# Repositories checked at the same time when scanning a directory tree
+DEFAULT_SCAN_WORKERS = 16
+
+# Seconds after a fetch during which StatusCache.fetch does not fetch again
+DEFAULT_FETCH_TTL = 300
+
+# Cache file kept inside each repository's git directory, and how many results it holds
+# (the least recently used ones are dropped first)
+CACHE_FILE_NAME = "status-checker-cache.json"
+MAX_CACHE_ENTRIES = 1000
+
+# Outcome of merging branch into target as predicted by merge-tree: whether it is clean, the
+# conflicted paths, and the OID of the merged tree (None when the merge could not be attempted)
+MergePrediction = namedtuple("MergePrediction", ["branch", "target", "clean", "conflicts", "tree"])
+
+# Everything check_git_status reports about a repository. changes holds one
+# `git status --porcelain` style line ("XY path") per changed or untracked file.
+RepoStatus = namedtuple("RepoStatus", ["path", "branch", "head", "upstream", "changes", "ahead", "behind", "target"])
+
+
+class MergeTreeUnsupportedError(RuntimeError):
+    """Raised when the installed git is too old for `git merge-tree --write-tree` (added in 2.38)."""
+
+
+def run_git(args, cwd=None):
+    """Run git with the given argument list (no shell) and return its stdout and exit code."""
+    result = subprocess.run(["git", *args], cwd=cwd, text=True, capture_output=True)
+    return result.stdout, result.returncode
+
+
+def parse_porcelain_v2(output):
+    """
+    Parse the output of `git status --porcelain=v2 --branch -z` into a dict of branch
+    headers (oid, head, upstream, ab) and a list of changes in short-format lines.
+    """
+    headers, changes = {}, []
+    records = output.split("\0")
+    index = 0
+    while index < len(records):
+        record = records[index]
+        index += 1
+        if not record:
+            continue
+        if record.startswith("# "):
+            key, _, value = record[2:].partition(" ")
+            headers[key] = value
+        elif record[0] == "1":
+            # 1 XY sub mH mI mW hH hI path
+            fields = record.split(" ", 8)
+            changes.append(f"{fields[1].replace('.', ' ')} {fields[8]}")
+        elif record[0] == "2":
+            # 2 XY sub mH mI mW hH hI Xscore path, followed by the original path as its own record
+            fields = record.split(" ", 9)
+            changes.append(f"{fields[1].replace('.', ' ')} {records[index]} -> {fields[9]}")
+            index += 1
+        elif record[0] == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            fields = record.split(" ", 10)
+            changes.append(f"{fields[1]} {fields[10]}")
+        elif record[0] == "?":
+            changes.append(f"?? {record[2:]}")
+    return headers, changes
+
+
+def ahead_behind(left, right, cwd=None):
+    """Return how many commits right has that left does not, and the reverse, with one rev-list call."""
+    stdout, returncode = run_git(["rev-list", "--left-right", "--count", f"{left}...{right}"], cwd)
+    if returncode != 0:
+        return None, None
+    behind, ahead = (int(count) for count in stdout.split())
+    return ahead, behind
+
+
+def read_status(path=None, target=DEFAULT_TARGET, cache=None):
+    """
+    Return the RepoStatus of the repository at path (the current directory by default),
+    with ahead/behind counted against target, or None if path is not inside a Git repository.
+    With a StatusCache the counts are looked up by commit OIDs and only computed when new.
+    """
+    args = ["status", "--porcelain=v2", "--branch", "-z"]
+    if cache is not None:
+        args.append("--no-ahead-behind")  # Counted through the cache below instead
+    stdout, returncode = run_git(args, path)
+    if returncode != 0:
+        return None
+    headers, changes = parse_porcelain_v2(stdout)
+
+    branch = headers.get("branch.head")
+    branch = None if branch == "(detached)" else branch
+    upstream = headers.get("branch.upstream")
+    head = headers.get("branch.oid")
+    if head == "(initial)":
+        ahead, behind = None, None  # No commits yet
+    elif cache is not None:
+        ahead, behind = cache.ahead_behind(head, target)
+    elif upstream == target and "branch.ab" in headers:
+        # The target is the upstream, so status has already counted the commits
+        ahead, behind = (abs(int(count)) for count in headers["branch.ab"].split())
+    else:
+        ahead, behind = ahead_behind(target, "HEAD", path)
+    return RepoStatus(path or ".", branch, head, upstream, changes, ahead, behind, target)
+
+
+def find_git_dirs(path=None):
+    """
+    Return the git directory and the common directory (shared refs of all worktrees) of the
+    repository containing path, found without running git, or (None, None) outside a repository.
+    """
+    directory = os.path.abspath(path or os.getcwd())
+    while True:
+        dot_git = os.path.join(directory, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git, dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules: .git is a file pointing at the real git directory
+            with open(dot_git) as file:
+                git_dir = file.read().strip().removeprefix("gitdir: ")
+            git_dir = os.path.normpath(os.path.join(directory, git_dir))
+            common_dir = git_dir
+            if os.path.isfile(os.path.join(git_dir, "commondir")):
+                with open(os.path.join(git_dir, "commondir")) as file:
+                    common_dir = os.path.normpath(os.path.join(git_dir, file.read().strip()))
+            return git_dir, common_dir
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None, None
+        directory = parent
+
+
+def _read_packed_refs(common_dir):
+    """Return {ref name: OID} from the packed-refs file."""
+    refs = {}
+    try:
+        with open(os.path.join(common_dir, "packed-refs")) as file:
+            for line in file:
+                if line[0] not in "#^":
+                    oid, _, name = line.strip().partition(" ")
+                    refs[name] = oid
+    except FileNotFoundError:
+        pass
+    return refs
+
+
+def _read_loose_ref(ref, git_dir, common_dir):
+    """Return the contents of a loose ref file (an OID or 'ref: <target>'), or None."""
+    for directory in dict.fromkeys([git_dir, common_dir]):
+        try:
+            with open(os.path.join(directory, ref)) as file:
+                return file.read().strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            continue
+    return None
+
+
+def resolve_ref(name, path=None):
+    """
+    Return the commit OID that name (HEAD, a full ref, or a short branch, remote branch or tag
+    name) points at, by reading the loose and packed refs directly. Returns None if unknown.
+    """
+    git_dir, common_dir = find_git_dirs(path)
+    if git_dir is None:
+        return None
+    if len(name) in (40, 64) and all(char in "0123456789abcdef" for char in name):
+        return name  # Already an OID
+
+    # Same lookup order as git uses for short names
+    if name == "HEAD" or name.startswith("refs/"):
+        candidates = [name]
+    else:
+        candidates = [f"refs/{name}", f"refs/tags/{name}", f"refs/heads/{name}", f"refs/remotes/{name}"]
+    packed = None
+    for _ in range(5):  # Follow symbolic refs such as HEAD -> refs/heads/main
+        value = None
+        for ref in candidates:
+            value = _read_loose_ref(ref, git_dir, common_dir)
+            if value is None:
+                packed = packed if packed is not None else _read_packed_refs(common_dir)
+                value = packed.get(ref)
+            if value is not None:
+                break
+        if value is None or not value.startswith("ref: "):
+            return value
+        candidates = [value[len("ref: "):]]
+    return None
+
+
+def resolve_commit(rev, path=None):
+    """
+    Return the commit OID of rev: refs are read directly with resolve_ref, and anything else
+    (revspecs such as HEAD~1 or feature^2, abbreviated OIDs) is resolved by git rev-parse.
+    Returns None if rev does not name a commit.
+    """
+    oid = resolve_ref(rev, path)
+    if oid is not None:
+        return oid
+    stdout, returncode = run_git(["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], path)
+    return stdout.strip() if returncode == 0 else None
+
+
+class StatusCache:
+    """
+    Results about one repository that only depend on commit OIDs (ahead/behind counts and
+    merge predictions), stored as JSON in its git directory, plus the time of the last fetch.
+    A result is recomputed only when a ref tip has moved, which is checked by reading the refs.
+    At most MAX_CACHE_ENTRIES results are kept, evicting the least recently used.
+    """
+
+    def __init__(self, path=None, fetch_ttl=DEFAULT_FETCH_TTL):
+        self.path = path
+        self.fetch_ttl = fetch_ttl
+        self.git_dir, self.common_dir = find_git_dirs(path)
+        self.cache_path = os.path.join(self.git_dir, CACHE_FILE_NAME) if self.git_dir else None
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as file:
+                data = json.load(file)
+        except (TypeError, FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault("last_fetch", 0)
+        data.setdefault("results", {})
+        return data
+
+    def _save(self):
+        if self.cache_path is None:
+            return
+        results = self.data["results"]
+        for key in list(results)[:max(0, len(results) - MAX_CACHE_ENTRIES)]:
+            del results[key]  # Least recently used first: hits move their entry to the end
+        # Write to a temporary file first so a crash never leaves a truncated cache behind
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.data, file)
+        os.replace(tmp_path, self.cache_path)
+
+    def last_fetch(self):
+        """Return when the repository was last fetched (by this cache or by any git fetch)."""
+        try:
+            fetch_head = os.path.getmtime(os.path.join(self.git_dir, "FETCH_HEAD"))
+        except (TypeError, OSError):
+            fetch_head = 0
+        return max(self.data["last_fetch"], fetch_head)
+
+    def fetch_due(self):
+        """Return whether the last fetch is older than the TTL."""
+        return time.time() - self.last_fetch() >= self.fetch_ttl
+
+    def fetch(self, force=False):
+        """Run git fetch unless the last one is younger than the TTL; returns whether it fetched."""
+        if not force and not self.fetch_due():
+            return False
+        run_git(["fetch", "--quiet"], self.path)
+        self.data["last_fetch"] = time.time()
+        self._save()
+        return True
+
+    def _cached(self, kind, left, right, compute):
+        """Return the result of compute(left_oid, right_oid), reusing the one stored for these OIDs."""
+        left_oid, right_oid = resolve_commit(left, self.path), resolve_commit(right, self.path)
+        if left_oid is None or right_oid is None:
+            return None  # Unknown revision: nothing to cache by
+        key = f"{kind}:{left_oid}:{right_oid}"
+        results = self.data["results"]
+        if key in results:
+            if key != next(reversed(results)):
+                results[key] = results.pop(key)  # Most recently used entries are kept longest
+                self._save()
+            return results[key]
+        result = compute(left_oid, right_oid)
+        if result is None or result == (None, None):
+            return result  # Failures are not stored, so they are retried on the next call
+        results[key] = result
+        self._save()
+        return result
+
+    def ahead_behind(self, branch, target=DEFAULT_TARGET):
+        """Return how many commits branch is ahead of and behind target, or (None, None)."""
+        counts = self._cached("ahead_behind", branch, target,
+                              lambda branch_oid, target_oid: ahead_behind(target_oid, branch_oid, self.path))
+        return tuple(counts) if counts else (None, None)
+
+    def predict_merge(self, branch, target=DEFAULT_TARGET):
+        """Return the MergePrediction of merging branch into target, or None."""
+        def compute(branch_oid, target_oid):
+            prediction = predict_merge(branch_oid, target_oid, self.path)
+            return None if prediction is None else prediction._asdict()
+
+        prediction = self._cached("merge", branch, target, compute)
+        if prediction is None:
+            return None
+        return MergePrediction(**{**prediction, "branch": branch, "target": target})
+
+
+def find_repositories(root):
+    """
+    Return the paths of the Git working trees under root (including root itself), sorted.
+    Directories inside a repository are not searched further, so nested checkouts are skipped.
+    """
+    repositories = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        # .git is a directory in a normal clone and a file in worktrees and submodules
+        if ".git" in dir_names or ".git" in file_names:
+            repositories.append(dir_path)
+            dir_names.clear()
+        else:
+            dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+    return sorted(repositories)
+
+
+def scan_repositories(root, target=DEFAULT_TARGET, workers=DEFAULT_SCAN_WORKERS, fetch=False,
+                      fetch_ttl=DEFAULT_FETCH_TTL):
+    """
+    Find the repositories under root and read their status concurrently in a pool of
+    workers threads (each one waits on its own git process). When fetch is set, repositories
+    not fetched within fetch_ttl seconds are fetched first. Counts come from each repository's
+    StatusCache. Returns the RepoStatus of every repository, in path order.
+    """
+    def check(path):
+        cache = StatusCache(path, fetch_ttl)
+        if fetch:
+            cache.fetch()
+        return read_status(path, target, cache)
+
+    repositories = find_repositories(root)
+    if not repositories:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(repositories))) as executor:
+        return [status for status in executor.map(check, repositories) if status is not None]
+
+
+def predict_merge(branch, target=DEFAULT_TARGET, cwd=None):
+    """
+    Predict the result of merging branch into target with `git merge-tree --write-tree`.
+    The merge is computed entirely in the object database; the working tree, index and HEAD
+    are left alone. Returns None if the merge cannot be attempted (unknown branch, unrelated histories).
+    Raises MergeTreeUnsupportedError when git is older than 2.38.
+    """
+    stdout, returncode = run_git(
+        ["merge-tree", "--write-tree", "--name-only", "--no-messages", "-z", target, branch], cwd)
+    if returncode == 129:
+        # git exits with 129 on a usage error: older merge-tree only takes <base> <branch1> <branch2>
+        raise MergeTreeUnsupportedError("Predicting merges requires git 2.38 or later (git merge-tree --write-tree).")
+    if returncode not in (0, 1) or not stdout:
+        return None
+    # Output: the merged tree OID, then each conflicted path, all NUL-terminated
+    tree, *paths = stdout.split("\0")
+    conflicts = []
+    for path in paths:
+        if not path:
+            break
+        if path not in conflicts:
+            conflicts.append(path)
+    return MergePrediction(branch, target, returncode == 0, conflicts, tree)
+
+
+def predict_merges(branches, target=DEFAULT_TARGET, cwd=None, workers=DEFAULT_SCAN_WORKERS):
+    """Predict the merge of every branch into target concurrently; returns {branch: MergePrediction or None}."""
+    if not branches:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(branches))) as executor:
+        predictions = executor.map(lambda branch: predict_merge(branch, target, cwd), branches)
+        return dict(zip(branches, predictions))
+
+
+def conflict_matrix(branches, cwd=None, workers=DEFAULT_SCAN_WORKERS):
+    """
+    Predict the merge of every pair of branches concurrently. Returns {(a, b): conflicted paths}
+    for each pair, with the entry stored under both orders; None marks a pair that cannot be merged.
+    """
+    pairs = [(a, b) for index, a in enumerate(branches) for b in branches[index + 1:]]
+    matrix = {}
+    if not pairs:
+        return matrix
+    with ThreadPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+        predictions = executor.map(lambda pair: predict_merge(pair[1], pair[0], cwd), pairs)
+        for (a, b), prediction in zip(pairs, predictions):
+            matrix[a, b] = matrix[b, a] = None if prediction is None else prediction.conflicts
+    return matrix
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The scripts import git_backend by plain name, as when they are run from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def git_env(monkeypatch, tmp_path):
+    """Give git a fixed identity and keep the user's configuration out of the tests."""
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(tmp_path / "gitconfig"))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@example.com")
+
+
+def run_git(path, *args):
+    return subprocess.run(["git", *args], cwd=path, check=True, text=True, capture_output=True).stdout
+
+
+def commit_all(path, message):
+    run_git(path, "add", "-A")
+    run_git(path, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def git(git_env):
+    """Run git in a directory and return its stdout: git(path, *args)."""
+    return run_git
+
+
+@pytest.fixture
+def commit(git_env):
+    """Commit every change in a repository: commit(path, message)."""
+    return commit_all
+
+
+@pytest.fixture
+def repo(tmp_path, git, commit):
+    """A repository on branch main with one commit holding a.txt and b.txt."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    (path / "a.txt").write_text("one\ntwo\nthree\n")
+    (path / "b.txt").write_text("b\n")
+    commit(path, "initial")
+    return path
+
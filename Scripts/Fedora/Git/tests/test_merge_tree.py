@@ -0,0 +1,74 @@
+import pytest
+
+import git_backend
+from git_backend import MergeTreeUnsupportedError, conflict_matrix, predict_merge, predict_merges
+
+
+@pytest.fixture
+def branches(repo, git, commit):
+    """
+    Branches off main: "left" and "right" change the same line of a.txt, "other" only adds a file,
+    and "rewrite" edits a.txt and b.txt in ways that conflict with "right".
+    """
+    def branch(name, files):
+        git(repo, "checkout", "-q", "-b", name, "main")
+        for file_name, text in files.items():
+            (repo / file_name).write_text(text)
+        commit(repo, name)
+
+    branch("left", {"a.txt": "one\nLEFT\nthree\n"})
+    branch("right", {"a.txt": "one\nRIGHT\nthree\n", "b.txt": "right\n"})
+    branch("other", {"c.txt": "c\n"})
+    branch("rewrite", {"a.txt": "one\nREWRITE\nthree\n", "b.txt": "rewrite\n"})
+    git(repo, "checkout", "-q", "main")
+    return repo
+
+
+def test_clean_merge(branches):
+    prediction = predict_merge("other", "left", cwd=str(branches))
+    assert prediction.clean
+    assert prediction.conflicts == []
+    assert (prediction.branch, prediction.target) == ("other", "left")
+    assert len(prediction.tree) == 40
+
+
+def test_conflicting_merge_lists_each_path_once(branches):
+    prediction = predict_merge("right", "rewrite", cwd=str(branches))
+    assert not prediction.clean
+    assert prediction.conflicts == ["a.txt", "b.txt"]
+
+
+def test_prediction_leaves_the_repository_alone(branches, git):
+    head = git(branches, "rev-parse", "HEAD")
+    (branches / "b.txt").write_text("uncommitted\n")
+    status = git(branches, "status", "--porcelain")
+    predict_merge("right", "left", cwd=str(branches))
+    assert git(branches, "rev-parse", "HEAD") == head
+    assert git(branches, "status", "--porcelain") == status
+    assert (branches / "b.txt").read_text() == "uncommitted\n"
+
+
+def test_unknown_branch_cannot_be_merged(branches):
+    assert predict_merge("missing", "main", cwd=str(branches)) is None
+
+
+def test_predict_merges(branches):
+    predictions = predict_merges(["left", "other", "missing"], target="right", cwd=str(branches), workers=2)
+    assert list(predictions) == ["left", "other", "missing"]
+    assert predictions["left"].conflicts == ["a.txt"]
+    assert predictions["other"].clean
+    assert predictions["missing"] is None
+    assert predict_merges([], cwd=str(branches)) == {}
+
+
+def test_conflict_matrix_is_symmetric(branches):
+    matrix = conflict_matrix(["left", "right", "other"], cwd=str(branches), workers=3)
+    assert matrix["left", "right"] == matrix["right", "left"] == ["a.txt"]
+    assert matrix["left", "other"] == matrix["other", "right"] == []
+    assert len(matrix) == 6
+
+
+def test_old_git_is_reported(monkeypatch):
+    monkeypatch.setattr(git_backend, "run_git", lambda args, cwd=None: ("usage: git merge-tree", 129))
+    with pytest.raises(MergeTreeUnsupportedError):
+        predict_merge("left", "main")
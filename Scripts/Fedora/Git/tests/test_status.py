@@ -0,0 +1,79 @@
+from git_backend import parse_porcelain_v2, read_status
+
+
+def test_parse_headers_and_every_record_type():
+    output = "\0".join([
+        "# branch.oid 1234abcd",
+        "# branch.head feature/x",
+        "# branch.upstream origin/feature/x",
+        "# branch.ab +2 -1",
+        "1 .M N... 100644 100644 100644 aaaa bbbb src/file with spaces.py",
+        "1 A. N... 000000 100644 100644 0000 cccc new.txt",
+        "2 R. N... 100644 100644 100644 dddd dddd R100 new name.txt",
+        "old name.txt",
+        "u UU N... 100644 100644 100644 100644 eeee ffff 0000 conflict.txt",
+        "? untracked dir/file.txt",
+        "! ignored.log",
+    ]) + "\0"
+    headers, changes = parse_porcelain_v2(output)
+    assert headers == {
+        "branch.oid": "1234abcd",
+        "branch.head": "feature/x",
+        "branch.upstream": "origin/feature/x",
+        "branch.ab": "+2 -1",
+    }
+    assert changes == [
+        " M src/file with spaces.py",
+        "A  new.txt",
+        "R  old name.txt -> new name.txt",
+        "UU conflict.txt",
+        "?? untracked dir/file.txt",
+    ]
+
+
+def test_parse_empty_output():
+    assert parse_porcelain_v2("") == ({}, [])
+
+
+def test_read_status_of_a_repository(repo, git):
+    (repo / "a.txt").write_text("changed\n")
+    git(repo, "mv", "b.txt", "c.txt")
+    (repo / "new file.txt").write_text("x\n")
+    status = read_status(str(repo), target="main")
+    assert status.branch == "main"
+    assert status.head == git(repo, "rev-parse", "HEAD").strip()
+    assert status.upstream is None
+    assert sorted(status.changes) == [" M a.txt", "?? new file.txt", "R  b.txt -> c.txt"]
+    assert (status.ahead, status.behind) == (0, 0)
+
+
+def test_read_status_counts_commits_against_the_target(repo, git, commit):
+    git(repo, "branch", "base")
+    git(repo, "checkout", "-q", "-b", "topic")
+    for number in range(3):
+        (repo / f"topic{number}.txt").write_text("x\n")
+        commit(repo, f"topic {number}")
+    git(repo, "checkout", "-q", "base")
+    (repo / "base.txt").write_text("x\n")
+    commit(repo, "base")
+    git(repo, "checkout", "-q", "topic")
+    status = read_status(str(repo), target="base")
+    assert (status.branch, status.ahead, status.behind) == ("topic", 3, 1)
+
+
+def test_read_status_of_detached_and_unborn_heads(repo, git, tmp_path):
+    git(repo, "checkout", "-q", "--detach")
+    assert read_status(str(repo), target="main").branch is None
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    git(empty, "init", "-q", "-b", "main")
+    status = read_status(str(empty))
+    assert (status.branch, status.head, status.ahead, status.behind) == ("main", "(initial)", None, None)
+
+
+def test_read_status_outside_a_repository(tmp_path, git_env, monkeypatch):
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path))
+    outside = tmp_path / "plain"
+    outside.mkdir()
+    assert read_status(str(outside)) is None
@@ -0,0 +1,376 @@
+import argparse
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from data_io import DEFAULT_READ_CHUNK_SIZE, SCHEMAS, detect_format, read_csv_tail, read_dataset_chunks
+
+# Title: Group-by Aggregate Index
+# Purpose: Build a sidecar index next to a dataset file holding, for each group of the columns
+#          we keep grouping by, the row count and the per-column sums and sums of squares, plus
+#          the row numbers of each group sorted by group. Group means and standard deviations
+#          are then answered from the index in O(groups) and filters on the keys in O(matches),
+#          without scanning the file. Rows appended to a CSV file are folded in incrementally,
+#          in time proportional to the appended rows.
+
+# Group keys and summed measure columns indexed for each dataset
+INDEX_SPECS = {
+    "employee": {
+        "keys": ["Department"],
+        "measures": ["Salary", "Age", "Performance_Score", "Years_in_Company"],
+    },
+    "ocean_conditions": {
+        "keys": ["Weather_Condition"],
+        "measures": ["Temperature_C", "Salinity_PPT", "Wave_Height_M", "Current_Speed_KPH", "Depth_M"],
+    },
+    "retail_sales": {
+        "keys": ["Product_Category", "Order_Month"],
+        "measures": ["Quantity_Sold", "Sale_Price", "Total_Sales", "Shipping_Cost", "Customer_Age"],
+    },
+}
+
+# Month keys computed from a date column: key name -> date column
+DERIVED_KEYS = {"Order_Month": "Order_Date"}
+
+# Sidecar file name suffix, and the version stored in it; bump it when the layout changes.
+# The sidecar is an .npz archive of plain arrays plus a JSON header, so it can be read back
+# by any module and never unpickles code.
+INDEX_SUFFIX = ".aggidx"
+INDEX_VERSION = 3
+
+# GroupIndex arrays stored in the sidecar for every key, besides its runs of row numbers
+# (stored as "<key>.run<r>", so saving an update does not copy the runs before it)
+GROUP_ARRAYS = ["counts", "valid", "sums", "squares", "run_counts"]
+
+# Bytes at the end of the indexed part of a CSV file that are re-hashed to check that the
+# file has only been appended to since it was indexed
+CHECK_BLOCK_SIZE = 64 * 1024
+
+
+def index_path_for(file_path):
+    """Return the path of the sidecar index of file_path."""
+    return f"{file_path}{INDEX_SUFFIX}"
+
+
+def _tail_hash(file_path, end):
+    """Return a hash of the CHECK_BLOCK_SIZE bytes of file_path before byte end."""
+    with open(file_path, "rb") as file:
+        file.seek(max(end - CHECK_BLOCK_SIZE, 0))
+        return hashlib.blake2b(file.read(min(end, CHECK_BLOCK_SIZE)), digest_size=20).hexdigest()
+
+
+def _ends_with_newline(file_path, end):
+    if end == 0:
+        return False
+    with open(file_path, "rb") as file:
+        file.seek(end - 1)
+        return file.read(1) == b"\n"
+
+
+def _key_codes(df, key):
+    """
+    Return the group code of every row of df for key (-1 where the key is missing) and the
+    group labels the codes refer to.
+    """
+    if key in DERIVED_KEYS:
+        # Months since 1970, shifted so the earliest month present is group 0
+        months = df[DERIVED_KEYS[key]].to_numpy().astype("datetime64[M]")
+        missing = np.isnat(months)
+        months = months.view(np.int64)
+        if missing.all():
+            return np.full(len(df), -1, dtype=np.int64), []
+        low, high = months[~missing].min(), months[~missing].max()
+        codes = np.where(missing, -1, months - low)
+        labels = np.arange(low, high + 1).astype("datetime64[M]").astype(str).tolist()
+        return codes, labels
+    column = df[key]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy().astype(np.int64), [str(label) for label in column.cat.categories]
+    codes, labels = pd.factorize(column, sort=True)
+    return codes.astype(np.int64), [str(label) for label in labels]
+
+
+class GroupIndex:
+    """
+    Aggregates of the measure columns for every group of one key: row counts, non-missing
+    counts, sums and sums of squares, and the row numbers of each group in ascending order.
+    The row numbers are kept in runs, one per update: runs[r] holds the row numbers of that
+    update sorted by group, run_counts[r, i] of them in group i, so an update appends a run
+    instead of rewriting the rows already indexed. compact merges the runs into one.
+    Sums are taken of each value minus a fixed per-measure shift close to its mean, so the
+    sums of squares do not lose the variance to cancellation.
+    """
+
+    def __init__(self, num_measures):
+        self.labels = []
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.valid = np.zeros((0, num_measures), dtype=np.int64)
+        self.sums = np.zeros((0, num_measures))
+        self.squares = np.zeros((0, num_measures))
+        self.runs = []
+        self.run_counts = np.zeros((0, 0), dtype=np.int64)
+
+    def _merge_labels(self, labels):
+        """Add new labels (keeping them sorted) and return the position of each of labels."""
+        merged = sorted(set(self.labels).union(labels))
+        if merged != self.labels:
+            # Both lists are sorted, so existing groups keep their relative order (and their rows)
+            position = {label: index for index, label in enumerate(merged)}
+            old = np.array([position[label] for label in self.labels], dtype=np.int64)
+
+            def grow(array):
+                grown = np.zeros((len(merged),) + array.shape[1:], dtype=array.dtype)
+                grown[old] = array
+                return grown
+
+            self.counts, self.valid = grow(self.counts), grow(self.valid)
+            self.sums, self.squares = grow(self.sums), grow(self.squares)
+            self.run_counts = grow(self.run_counts.T).T
+            self.labels = merged
+        position = {label: index for index, label in enumerate(self.labels)}
+        return np.array([position[label] for label in labels], dtype=np.int64)
+
+    def update(self, codes, labels, values, first_row):
+        """
+        Fold in a block of rows numbered from first_row: their group codes into labels
+        (-1 for a missing key) and their shifted measure values (NaN where missing).
+        """
+        present = codes >= 0
+        groups = self._merge_labels(labels)[codes[present]]
+        values = values[present]
+        num_groups = len(self.labels)
+
+        self.counts += np.bincount(groups, minlength=num_groups)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        for column in range(values.shape[1]):
+            self.valid[:, column] += np.bincount(groups, weights=valid[:, column],
+                                                 minlength=num_groups).astype(np.int64)
+            self.sums[:, column] += np.bincount(groups, weights=filled[:, column], minlength=num_groups)
+            self.squares[:, column] += np.bincount(groups, weights=filled[:, column] ** 2, minlength=num_groups)
+
+        # Row numbers of the new rows grouped by key, kept as a new run after the existing ones
+        if len(groups):
+            order = np.argsort(groups, kind="stable")
+            self.runs.append((np.flatnonzero(present) + first_row)[order])
+            self.run_counts = np.vstack([self.run_counts, np.bincount(groups, minlength=num_groups)])
+
+    def group_rows(self, label):
+        """Return the ascending row numbers of the rows in group label."""
+        if label not in self.labels:
+            return np.zeros(0, dtype=np.int64)
+        group = self.labels.index(label)
+        # Each run holds later rows than the runs before it, so the pieces are already in order
+        starts = self.run_counts[:, :group].sum(axis=1)
+        pieces = [rows[start:start + count]
+                  for rows, start, count in zip(self.runs, starts, self.run_counts[:, group])]
+        return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int64)
+
+    def compact(self):
+        """Merge the runs of row numbers into a single run."""
+        if len(self.runs) > 1:
+            self.runs = [np.concatenate([self.group_rows(label) for label in self.labels])]
+            self.run_counts = self.counts[np.newaxis, :].copy()
+
+
+
+class AggregateIndex:
+    """
+    Group-by aggregates of one dataset file (see INDEX_SPECS), with a GroupIndex per key.
+    Use open_index to get an index that is up to date with its file.
+    """
+
+    def __init__(self, name):
+        spec = INDEX_SPECS[name]
+        self.name = name
+        self.keys = spec["keys"]
+        self.measures = spec["measures"]
+        self.version = INDEX_VERSION
+        self.num_rows = 0
+        self.shift = None
+        self.groups = {key: GroupIndex(len(self.measures)) for key in self.keys}
+        # Size, mtime and tail hash of the file when it was last indexed
+        self.source = None
+
+    def columns(self):
+        """Return the file columns needed to build the index."""
+        sources = [DERIVED_KEYS.get(key, key) for key in self.keys]
+        return list(dict.fromkeys(sources + self.measures))
+
+    def update(self, df):
+        """Fold the rows of df, which follow the rows already indexed in the file, into the index."""
+        values = df[self.measures].to_numpy(dtype=np.float64)
+        if self.shift is None:
+            # Shift every measure by the mean of the first block so sums of squares stay accurate
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.measures))
+        values = values - self.shift
+        for key in self.keys:
+            codes, labels = _key_codes(df, key)
+            self.groups[key].update(codes, labels, values, self.num_rows)
+        self.num_rows += len(df)
+
+    def group_stats(self, key, measure=None):
+        """
+        Return a frame with one row per group of key: its row count and, for measure, the
+        number of non-missing values, their sum, mean and standard deviation (ddof=1).
+        """
+        group = self.groups[key]
+        stats = pd.DataFrame({"count": group.counts}, index=pd.Index(group.labels, name=key))
+        if measure is not None:
+            column = self.measures.index(measure)
+            valid = group.valid[:, column]
+            sums = group.sums[:, column]
+            shift = self.shift[column] if self.shift is not None else 0.0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = sums / valid
+                variance = (group.squares[:, column] - sums * mean) / (valid - 1)
+            stats[f"{measure}_count"] = valid
+            stats[f"{measure}_sum"] = sums + shift * valid
+            stats[f"{measure}_mean"] = np.where(valid > 0, mean + shift, np.nan)
+            stats[f"{measure}_std"] = np.where(valid > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+        return stats[stats["count"] > 0]
+
+    def rows(self, **conditions):
+        """
+        Return the ascending row numbers (0-based, in file order) of the rows matching every
+        key=label condition, e.g. rows(Product_Category="Books", Order_Month="2024-03").
+        """
+        matches = None
+        for key, label in conditions.items():
+            if key not in self.groups:
+                raise ValueError(f"'{key}' is not indexed; indexed keys are {', '.join(self.keys)}.")
+            group_rows = self.groups[key].group_rows(str(label))
+            matches = group_rows if matches is None else np.intersect1d(matches, group_rows, assume_unique=True)
+        return matches if matches is not None else np.arange(self.num_rows)
+
+    def select(self, df, **conditions):
+        """Return the rows of df (the whole indexed file, loaded in order) matching conditions."""
+        return df.iloc[self.rows(**conditions)]
+
+    def to_arrays(self):
+        """Return the index as named plain arrays (with a JSON header), the form it is stored in."""
+        header = {
+            "version": self.version, "name": self.name, "num_rows": self.num_rows,
+            "shift": None if self.shift is None else self.shift.tolist(), "source": self.source,
+            "labels": {key: group.labels for key, group in self.groups.items()},
+        }
+        arrays = {"header": np.array(json.dumps(header))}
+        for key, group in self.groups.items():
+            for field in GROUP_ARRAYS:
+                arrays[f"{key}.{field}"] = getattr(group, field)
+            for run, rows in enumerate(group.runs):
+                arrays[f"{key}.run{run}"] = rows
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild an index from the arrays returned by to_arrays."""
+        header = json.loads(str(arrays["header"]))
+        index = cls(header["name"])
+        index.version = header["version"]
+        index.num_rows = header["num_rows"]
+        index.shift = None if header["shift"] is None else np.array(header["shift"])
+        index.source = header["source"]
+        for key, group in index.groups.items():
+            group.labels = header["labels"][key]
+            for field in GROUP_ARRAYS:
+                setattr(group, field, arrays[f"{key}.{field}"])
+            group.runs = [arrays[f"{key}.run{run}"] for run in range(len(group.run_counts))]
+        return index
+
+
+def _file_state(file_path, end=None):
+    stat = os.stat(file_path)
+    end = stat.st_size if end is None else end
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "tail_hash": _tail_hash(file_path, end),
+            "ends_with_newline": _ends_with_newline(file_path, end)}
+
+
+def build_index(name, file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """Build the aggregate index of a dataset file by reading it once in chunks of chunk_size rows."""
+    index = AggregateIndex(name)
+    source = _file_state(file_path)
+    for chunk in read_dataset_chunks(file_path, index.columns(), SCHEMAS[name], chunk_size):
+        index.update(chunk)
+    for group in index.groups.values():
+        group.compact()
+    index.source = source
+    return index
+
+
+def load_index(index_path):
+    """Return the index stored at index_path, or None if there is none (or it is outdated)."""
+    try:
+        with np.load(index_path, allow_pickle=False) as arrays:
+            if json.loads(str(arrays["header"])).get("version") != INDEX_VERSION:
+                return None
+            return AggregateIndex.from_arrays(arrays)
+    except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+        # Missing, truncated, older (pickled) or otherwise unreadable sidecars are rebuilt
+        return None
+
+
+def save_index(index, index_path):
+    """Write index to index_path atomically."""
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, **index.to_arrays())
+    os.replace(tmp_path, index_path)
+
+
+def _appended_only(index, file_path):
+    """Return whether file_path is the indexed CSV file with only rows added at its end."""
+    source = index.source
+    if detect_format(file_path) != "csv" or not source["ends_with_newline"]:
+        return False
+    size = os.path.getsize(file_path)
+    return size > source["size"] and _tail_hash(file_path, source["size"]) == source["tail_hash"]
+
+
+def open_index(name, file_path, index_path=None, rebuild=False):
+    """
+    Return the aggregate index of a dataset file and how it was obtained: "loaded" from its
+    sidecar file when the file is unchanged, "updated" by reading only the rows appended to
+    a CSV file since it was indexed, or "built" from scratch. The sidecar is rewritten when
+    the index changes. Every update adds a run of row numbers; with rebuild the index is
+    built from scratch, which merges them again.
+    """
+    index_path = index_path or index_path_for(file_path)
+    index = None if rebuild else load_index(index_path)
+    stat = os.stat(file_path)
+    if index is not None and index.name == name:
+        if (index.source["size"], index.source["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            return index, "loaded"
+        if _appended_only(index, file_path):
+            index.update(read_csv_tail(file_path, index.source["size"], index.columns(), SCHEMAS[name]))
+            index.source = _file_state(file_path)
+            save_index(index, index_path)
+            return index, "updated"
+    index = build_index(name, file_path)
+    save_index(index, index_path)
+    return index, "built"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query group-by aggregates of a dataset through its sidecar index.")
+    parser.add_argument("dataset", choices=list(INDEX_SPECS), help="Dataset the file holds.")
+    parser.add_argument("file_path", help="CSV, Parquet or Feather file to index.")
+    parser.add_argument("--key", help="Key to report group statistics for (default: the dataset's first key).")
+    parser.add_argument("--measure", help="Measure column to report the sum, mean and standard deviation of.")
+    parser.add_argument("--where", nargs="+", default=[], metavar="KEY=LABEL",
+                        help="Count the rows matching these key conditions.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Build the index from scratch, merging the rows of earlier updates.")
+    args = parser.parse_args()
+
+    index, how = open_index(args.dataset, args.file_path, rebuild=args.rebuild)
+    print(f"Index {how}: {index.num_rows} rows, keys {', '.join(index.keys)}.")
+    print(index.group_stats(args.key or index.keys[0], args.measure))
+    if args.where:
+        conditions = dict(condition.split("=", 1) for condition in args.where)
+        print(f"\n{len(index.rows(**conditions))} row(s) match {', '.join(args.where)}.")
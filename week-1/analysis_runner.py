@@ -0,0 +1,146 @@
+import argparse
+import os
+import time
+
+# Title: Analysis Runner
+# Purpose: The part of the week-1 analysis scripts that is the same for every dataset: choosing
+#          between the in-memory, streaming and partitioned computations, caching their results,
+#          printing the selected report sections and parsing the command line. The dataset
+#          modules (see analyze.DATASET_PLUGINS) only compute and draw their own aggregates.
+#
+# A dataset module provides:
+#   DATASET, LABEL                  its name in data_io.SCHEMAS and its name in messages
+#   DEFAULT_FILE_PATH               file analyzed when no path is given
+#   ANALYSIS_COLUMNS                columns loaded for compute_aggregates
+#   SECTIONS                        report parts in report order, "charts" last
+#   SECTION_TITLES                  heading printed above each printed section, or
+#   SECTION_FORMATS                 a format string printing a section on one line
+#   CACHE_NAMESPACE                 name and version of its cached results
+#   compute_aggregates(df)          every result, from the loaded dataset
+#   compute_aggregates_streaming(file_path, chunk_size)
+#                                   the results that can be folded from chunks
+#   figure_specs(aggregates)        the charts of the results it was given
+# and, with PARTITIONED = True, compute_aggregates_partitioned(source, workers, start_date,
+# end_date) for directories and globs of partition files (see partitions.py).
+
+# Chart formats accepted by --format (plot_renderer.OUTPUT_FORMATS, listed here so that parsing
+# the command line does not import numpy)
+CHART_FORMATS = ["png", "svg"]
+
+
+def reads_partitions(plugin, file_path, start_date=None, end_date=None):
+    """Return whether plugin reads file_path as partition files (always when a date range is given)."""
+    if not getattr(plugin, "PARTITIONED", False):
+        return False
+    from partitions import is_partitioned
+    return is_partitioned(file_path) or start_date is not None or end_date is not None
+
+
+def compute_file_aggregates(plugin, file_path, chunk_size=None, use_cache=True, partition_workers=1,
+                            start_date=None, end_date=None):
+    """
+    Compute the aggregates of plugin's dataset in file_path: from partition files read in a pool of
+    partition_workers processes when reads_partitions says so, streamed in chunks of chunk_size
+    rows when chunk_size is given, or from the whole file loaded at once. With use_cache the
+    results of a single file are stored on disk, and a rerun on the unchanged file returns them
+    without reading or parsing it at all. Partitioned results are not cached.
+    Returns None (after printing the reason) if the file cannot be read.
+    """
+    from data_io import load_dataset
+    from result_cache import cached_result
+
+    partitioned = reads_partitions(plugin, file_path, start_date, end_date)
+
+    def compute():
+        if partitioned:
+            return plugin.compute_aggregates_partitioned(file_path, partition_workers, start_date, end_date)
+        if chunk_size:
+            return plugin.compute_aggregates_streaming(file_path, chunk_size)
+        df = load_dataset(plugin.DATASET, file_path, plugin.ANALYSIS_COLUMNS,
+                          f"{plugin.LABEL} data loaded successfully.")
+        return plugin.compute_aggregates(df) if df is not None else None
+
+    if not use_cache or partitioned or not os.path.isfile(file_path):
+        return compute()
+    namespace = f"{plugin.CACHE_NAMESPACE}:{'streaming' if chunk_size else 'full'}"
+    aggregates, from_cache = cached_result(file_path, namespace, compute)
+    if from_cache:
+        print(f"Using cached results for {file_path}.")
+    return aggregates
+
+
+def report_aggregates(plugin, aggregates, output_dir=None, fmt="png", workers=1, sections=None):
+    """
+    Print the results computed by plugin and plot them, either interactively or, when output_dir
+    is given, rendered headless to files. Only the given sections (names from plugin.SECTIONS)
+    are reported when sections is not None; sections the results lack (the streaming results
+    leave out what needs every row) are skipped.
+    """
+    sections = plugin.SECTIONS if sections is None else sections
+    formats = getattr(plugin, "SECTION_FORMATS", {})
+    for section in plugin.SECTIONS:
+        if section not in sections:
+            continue
+        if section == "charts":
+            from plot_renderer import output_figures
+            output_figures(plugin.figure_specs(aggregates), output_dir, fmt, workers)
+        elif section in aggregates:
+            if section in formats:
+                print("\n" + formats[section].format(aggregates[section]))
+            else:
+                print(f"\n--- {plugin.SECTION_TITLES[section]} ---")
+                print(aggregates[section])
+
+
+def analyze_file(plugin, file_path, chunk_size=None, use_cache=True, output_dir=None, fmt="png", workers=1,
+                 sections=None, partition_workers=1, start_date=None, end_date=None):
+    """
+    Analyze plugin's dataset in file_path (see compute_file_aggregates) and report the results.
+    When output_dir is given the charts are rendered there as fmt files (in a pool of workers
+    processes) instead of shown. sections selects which parts of the report to print (all of
+    plugin.SECTIONS by default). start_date and end_date (inclusive) limit a partitioned dataset
+    to the partitions dated in that range.
+    """
+    start = time.perf_counter()
+    aggregates = compute_file_aggregates(plugin, file_path, chunk_size, use_cache, partition_workers,
+                                         start_date, end_date)
+    if aggregates is not None:
+        report_aggregates(plugin, aggregates, output_dir, fmt, workers, sections)
+    print(f"\n{plugin.LABEL} analysis finished in {time.perf_counter() - start:.2f} s.")
+
+
+def add_analysis_arguments(parser, partitioned=True):
+    """Add the options shared by every analysis command line (the partition options if partitioned)."""
+    parser.add_argument("--chunk-size", type=int,
+                        help="Read the files in chunks of this many rows instead of loading them whole.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute results even if they are cached.")
+    parser.add_argument("--output-dir",
+                        help="Render the charts under this directory (e.g. charts, ignored by git) instead of showing them.")
+    parser.add_argument("--format", choices=CHART_FORMATS, default="png", help="File format for --output-dir.")
+    parser.add_argument("--render-workers", type=int, default=1, help="Processes used to render the charts.")
+    if partitioned:
+        parser.add_argument("--partition-workers", type=int, default=1,
+                            help="Processes used to read partition files.")
+        parser.add_argument("--start-date", help="Only read partitions dated on or after this date (YYYY-MM-DD).")
+        parser.add_argument("--end-date", help="Only read partitions dated on or before this date (YYYY-MM-DD).")
+
+
+def parse_partition_options(args):
+    """Return the analyze_file keyword arguments set by the partition options of add_analysis_arguments."""
+    return {"partition_workers": args.partition_workers, "start_date": args.start_date, "end_date": args.end_date}
+
+
+def main(plugin):
+    """Run the command line of a single dataset module: python <module>.py [file_path] [options]."""
+    partitioned = getattr(plugin, "PARTITIONED", False)
+    parser = argparse.ArgumentParser(description=f"Analyze the {plugin.LABEL.lower()} dataset.")
+    parser.add_argument("file_path", nargs="?", default=plugin.DEFAULT_FILE_PATH,
+                        help="CSV, Parquet or Feather file, or a directory or glob pattern of partition files."
+                        if partitioned else "CSV, Parquet or Feather file to analyze.")
+    parser.add_argument("--sections", nargs="+", choices=plugin.SECTIONS, help="Report only these sections.")
+    add_analysis_arguments(parser, partitioned)
+    args = parser.parse_args()
+
+    options = parse_partition_options(args) if partitioned else {}
+    analyze_file(plugin, args.file_path, args.chunk_size, not args.no_cache, args.output_dir, args.format,
+                 args.render_workers, args.sections, **options)
@@ -0,0 +1,103 @@
+import argparse
+import importlib
+import os
+import time
+
+from analysis_runner import add_analysis_arguments, analyze_file, parse_partition_options
+
+# Title: Dataset Analysis CLI
+# Purpose: One entry point for the week-1 analysis scripts. Each dataset is a plugin module
+#          that is only imported when that dataset is analyzed (pandas on first use, matplotlib
+#          only when charts are requested), and several datasets can be analyzed in one run so
+#          the interpreter and library start-up cost is paid once.
+
+# Dataset name -> module implementing it (the contents of a dataset module are listed in
+# analysis_runner.py)
+DATASET_PLUGINS = {
+    "employee": "employee_analysis",
+    "ocean_conditions": "ocean_conditions_analysis",
+    "retail_sales": "retail_sales_analysis",
+}
+
+
+def load_plugin(name):
+    """Import and return the plugin module of dataset name."""
+    if name not in DATASET_PLUGINS:
+        raise ValueError(f"Unknown dataset '{name}'; choose one of {', '.join(DATASET_PLUGINS)}.")
+    return importlib.import_module(DATASET_PLUGINS[name])
+
+
+def parse_target(target):
+    """Split a NAME or NAME=PATH command line argument into the dataset name and file path (or None)."""
+    name, _, file_path = target.partition("=")
+    return name, file_path or None
+
+
+def list_plugins():
+    """Print every registered dataset with its default file and report sections."""
+    for name in DATASET_PLUGINS:
+        plugin = load_plugin(name)
+        print(f"{name}: {plugin.DEFAULT_FILE_PATH}")
+        print(f"    sections: {', '.join(plugin.SECTIONS)}")
+
+
+def load_targets(targets, sections=None):
+    """
+    Import the plugin of each (dataset name, file path) pair in targets and return
+    (name, plugin, file path) triples, with the plugin's default file where the path is None.
+    Raises ValueError for an unknown dataset or a section none of the datasets provides.
+    """
+    loaded = [(name, load_plugin(name)) for name, _ in targets]
+    if sections is not None:
+        known = {section for _, plugin in loaded for section in plugin.SECTIONS}
+        unknown = [section for section in sections if section not in known]
+        if unknown:
+            raise ValueError(f"Unknown section(s) {', '.join(unknown)}; "
+                             f"the datasets provide {', '.join(sorted(known))}.")
+    return [(name, plugin, file_path or plugin.DEFAULT_FILE_PATH)
+            for (name, plugin), (_, file_path) in zip(loaded, targets)]
+
+
+def run_analyses(plugins, sections=None, chunk_size=None, use_cache=True, output_dir=None,
+                 fmt="png", workers=1, partition_options=None):
+    """
+    Analyze every (name, plugin, file path) triple from load_targets in this process.
+    Only the given sections are reported when sections is not None; each dataset reports
+    those of them it provides. When output_dir is given the charts of each dataset are
+    rendered to output_dir/<dataset name>. partition_options (partition_workers, start_date,
+    end_date) are passed to the plugins that read partitioned datasets.
+    """
+    start = time.perf_counter()
+    for name, plugin, file_path in plugins:
+        print(f"\n=== {name} ===")
+        plugin_sections = None if sections is None else [s for s in sections if s in plugin.SECTIONS]
+        dataset_output_dir = os.path.join(output_dir, name) if output_dir else None
+        options = (partition_options or {}) if getattr(plugin, "PARTITIONED", False) else {}
+        analyze_file(plugin, file_path, chunk_size, use_cache, dataset_output_dir, fmt, workers, plugin_sections,
+                     **options)
+    if len(plugins) > 1:
+        print(f"\nAnalyzed {len(plugins)} datasets in {time.perf_counter() - start:.2f} s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze one or more of the week-1 datasets.")
+    parser.add_argument("targets", nargs="*", metavar="NAME[=PATH]",
+                        help=f"Datasets to analyze ({', '.join(DATASET_PLUGINS)}), optionally with the file "
+                             "(or directory or glob of partition files) to read. Defaults to every dataset.")
+    parser.add_argument("--sections", nargs="+",
+                        help="Report only these sections (see --list); leave out 'charts' to skip plotting.")
+    parser.add_argument("--list", action="store_true", help="List the datasets and their sections, then exit.")
+    add_analysis_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        list_plugins()
+        parser.exit()
+
+    targets = [parse_target(target) for target in args.targets] or [(name, None) for name in DATASET_PLUGINS]
+    try:
+        plugins = load_targets(targets, args.sections)
+    except ValueError as error:
+        parser.error(str(error))
+    run_analyses(plugins, args.sections, args.chunk_size, not args.no_cache, args.output_dir,
+                 args.format, args.render_workers, parse_partition_options(args))
@@ -0,0 +1,64 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from data_io import SCHEMAS, ChunkWriter, read_dataset
+import employee_analysis
+import ocean_conditions_analysis
+import retail_sales_analysis
+
+# Title: File Format Load Benchmark
+# Purpose: Compare how long it takes to load the Data/ files as CSV, Parquet and Feather,
+#          after scaling each file up by repeating its rows, and how much the typed,
+#          column-pruned loads save in time and memory over plain untyped loads.
+
+# Data files to benchmark and the columns their analysis reads (None means every column)
+DATASETS = {
+    "employee": ("Data/employee_data.csv", employee_analysis.ANALYSIS_COLUMNS),
+    "ocean_conditions": ("Data/ocean_conditions_data.csv", ocean_conditions_analysis.ANALYSIS_COLUMNS),
+    "retail_sales": ("Data/retail_sales_data.csv", retail_sales_analysis.ANALYSIS_COLUMNS),
+    "iris": ("Data/iris.csv", None),
+}
+
+FORMATS = ["csv", "parquet", "feather"]
+
+def scale_up(df, factor):
+    """Return df with its rows repeated factor times."""
+    return pd.concat([df] * factor, ignore_index=True)
+
+def time_load(file_path, columns, schema, repeats):
+    """Return the best load time in seconds over the given number of repeats and the frame's memory in MB."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = read_dataset(file_path, columns, schema)
+        best = min(best, time.perf_counter() - start)
+    return best, df.memory_usage(deep=True).sum() / 1e6
+
+def run_benchmarks(factor, repeats):
+    """Scale every data file, write it in each format and print the load times."""
+    print(f"{'Dataset':<18}{'Format':<10}{'Rows':>12}{'Size (MB)':>12}"
+          f"{'Untyped (s)':>13}{'Typed (s)':>11}{'Untyped MB':>12}{'Typed MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, (file_path, columns) in DATASETS.items():
+            df = scale_up(pd.read_csv(file_path), factor)
+            for file_format in FORMATS:
+                scaled_path = os.path.join(tmp_dir, f"{name}.{file_format}")
+                with ChunkWriter(scaled_path) as writer:
+                    writer.write(df)
+                size_mb = os.path.getsize(scaled_path) / 1e6
+                # Untyped: every column with inferred types; typed: schema types and used columns only
+                untyped_time, untyped_mb = time_load(scaled_path, None, None, repeats)
+                typed_time, typed_mb = time_load(scaled_path, columns, SCHEMAS[name], repeats)
+                print(f"{name:<18}{file_format:<10}{len(df):>12,}{size_mb:>12.1f}"
+                      f"{untyped_time:>13.3f}{typed_time:>11.3f}{untyped_mb:>12.1f}{typed_mb:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CSV, Parquet and Feather load times.")
+    parser.add_argument("--factor", type=int, default=1000, help="How many times to repeat each file's rows.")
+    parser.add_argument("--repeats", type=int, default=3, help="Loads per measurement (the best time is kept).")
+    args = parser.parse_args()
+    run_benchmarks(args.factor, args.repeats)
@@ -0,0 +1,82 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from dataset_engine import generate_employee_data, shard_rng
+from employee_analysis import draw_salary_distribution, draw_salary_vs_age
+from plot_renderer import OUTPUT_FORMATS, FigureSpec, bin_points, render_figures
+
+# Title: Chart Rendering Benchmark
+# Purpose: Measure how long the employee salary charts take to render headless as the number
+#          of rows grows, drawing every point (raw) against pre-binning the data with
+#          numpy.histogram/histogram2d (binned), and how large the output files get.
+
+# Rows generated per chunk, so large row counts do not need every column in memory at once
+GENERATION_CHUNK_SIZE = 1_000_000
+
+def employee_ages_and_salaries(num_rows, seed=0):
+    """Generate num_rows employee rows in chunks and return their Age and Salary columns."""
+    ages, salaries = [], []
+    for index, start in enumerate(range(0, num_rows, GENERATION_CHUNK_SIZE)):
+        df = generate_employee_data(min(GENERATION_CHUNK_SIZE, num_rows - start), shard_rng(seed, index), start)
+        ages.append(df['Age'].to_numpy())
+        salaries.append(df['Salary'].to_numpy())
+    return np.concatenate(ages), np.concatenate(salaries)
+
+def draw_raw_salary_distribution(fig, salaries):
+    """Draw the salary histogram by passing every value to matplotlib, as the scripts used to."""
+    ax = fig.add_subplot()
+    ax.hist(salaries, bins=20, color='lightgreen', alpha=0.7)
+
+def draw_raw_salary_vs_age(fig, age_salary):
+    """Draw every point of the salary vs age scatter plot, as the scripts used to."""
+    ages, salaries = age_salary
+    ax = fig.add_subplot()
+    ax.scatter(ages, salaries, color='purple', alpha=0.6)
+
+def chart_specs(ages, salaries, mode):
+    """Return the two salary charts, drawn from the raw columns or from binned data."""
+    if mode == "raw":
+        return [FigureSpec('salary_distribution', draw_raw_salary_distribution, salaries, (10, 5)),
+                FigureSpec('salary_vs_age', draw_raw_salary_vs_age, (ages, salaries), (10, 5))]
+    return [FigureSpec('salary_distribution', draw_salary_distribution, np.histogram(salaries, bins=20), (10, 5)),
+            FigureSpec('salary_vs_age', draw_salary_vs_age, bin_points(ages, salaries), (10, 5))]
+
+def time_render(ages, salaries, mode, fmt, output_dir):
+    """Bin (if needed) and render the charts; return the seconds taken and the output size in MB."""
+    start = time.perf_counter()
+    rendered, _ = render_figures(chart_specs(ages, salaries, mode), os.path.join(output_dir, mode), fmt)
+    elapsed = time.perf_counter() - start
+    size_mb = sum(os.path.getsize(path) for path in rendered) / 1e6
+    for path in rendered:
+        os.remove(path)  # Force a fresh render next time
+    return elapsed, size_mb
+
+def run_benchmarks(row_counts, formats, raw_max_rows, seed=0):
+    """Render the charts for each row count and format and print the times and file sizes."""
+    print(f"{'Rows':>12}{'Format':>8}{'Mode':>8}{'Seconds':>10}{'Size (MB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in row_counts:
+            ages, salaries = employee_ages_and_salaries(num_rows, seed)
+            for fmt in formats:
+                for mode in ["raw", "binned"]:
+                    if mode == "raw" and num_rows > raw_max_rows:
+                        print(f"{num_rows:>12,}{fmt:>8}{mode:>8}{'skipped':>10}")
+                        continue
+                    elapsed, size_mb = time_render(ages, salaries, mode, fmt, tmp_dir)
+                    print(f"{num_rows:>12,}{fmt:>8}{mode:>8}{elapsed:>10.2f}{size_mb:>11.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rendering the employee charts at growing row counts.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000],
+                        help="Row counts to render charts for.")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, nargs="+", default=OUTPUT_FORMATS,
+                        help="Output formats to render.")
+    parser.add_argument("--raw-max-rows", type=int, default=1_000_000,
+                        help="Largest row count to also render with every point drawn (slow and huge as SVG).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random generator.")
+    args = parser.parse_args()
+    run_benchmarks(args.rows, args.format, args.raw_max_rows, args.seed)
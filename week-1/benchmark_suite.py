@@ -0,0 +1,259 @@
+import argparse
+import cProfile
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_io import SCHEMAS, read_dataset
+from dataset_engine import (
+    generate_employee_data,
+    generate_ocean_conditions_data,
+    generate_retail_sales_data,
+    write_dataset,
+)
+from plot_renderer import render_figures
+import employee_analysis
+import ocean_conditions_analysis
+import retail_sales_analysis
+
+# Title: Pipeline Benchmark Suite
+# Purpose: Time every stage of the week-1 pipeline (generate a dataset file, load it typed,
+#          compute the analysis aggregates and optionally render the charts) for each dataset
+#          over a range of row counts, recording wall time, peak RSS and rows per second.
+#          Stages can also be profiled with cProfile and tracemalloc. Results are written as
+#          JSON and can be compared against a stored baseline to flag regressions.
+
+# Generator and analysis module of each dataset
+DATASETS = {
+    "employee": (generate_employee_data, employee_analysis),
+    "ocean_conditions": (generate_ocean_conditions_data, ocean_conditions_analysis),
+    "retail_sales": (generate_retail_sales_data, retail_sales_analysis),
+}
+
+DEFAULT_ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# A stage is a regression when it is this much slower than the baseline (and slower by at
+# least MIN_REGRESSION_SECONDS, so timer noise on tiny inputs is not reported)
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+MIN_REGRESSION_SECONDS = 0.05
+
+# Functions listed per stage in the JSON results when profiling
+PROFILE_TOP_FUNCTIONS = 10
+
+# Directory the JSON results are written to when --output is not given (ignored by git)
+RESULTS_DIR = "benchmark_results"
+
+
+def reset_peak_rss():
+    """Reset the peak resident set size of this process, where Linux allows it."""
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _proc_status_mb(field):
+    """Return a memory field of /proc/self/status (e.g. VmRSS) in MB, or None where unavailable."""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb():
+    """Return the resident set size of this process in MB, or None where unavailable."""
+    return _proc_status_mb("VmRSS")
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB (since the last reset, on Linux)."""
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS, and is never reset
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def profile_summary(profiler):
+    """Return the functions with the highest cumulative time recorded by profiler."""
+    stats = profiler.getstats()
+    top = sorted(stats, key=lambda entry: entry.totaltime, reverse=True)[:PROFILE_TOP_FUNCTIONS]
+    summary = []
+    for entry in top:
+        code = entry.code
+        name = code if isinstance(code, str) else f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+        summary.append({"function": name, "calls": entry.callcount,
+                        "cumulative_s": round(entry.totaltime, 4), "own_s": round(entry.inlinetime, 4)})
+    return summary
+
+
+def measure(function, num_rows, profile_path=None, trace_memory=False):
+    """
+    Run function() once and return its result and a dict of measurements: wall time, rows
+    per second, peak RSS and how far it rose above the RSS at the start of the stage, plus
+    the tracemalloc peak and the top profiled functions when requested. With profile_path
+    the full cProfile data is also saved there.
+    """
+    exact_rss = reset_peak_rss()
+    start_rss = current_rss_mb()
+    if trace_memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if profile_path else None
+
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    result = function()
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    peak_rss = peak_rss_mb()
+    measurement = {
+        "wall_s": round(elapsed, 4),
+        "rows_per_s": round(num_rows / elapsed) if elapsed > 0 else None,
+        "peak_rss_mb": round(peak_rss, 1),
+        # Without a reset the peak covers the whole run so far, not just this stage
+        "peak_rss_is_per_stage": exact_rss,
+    }
+    if exact_rss and start_rss is not None:
+        measurement["rss_growth_mb"] = round(peak_rss - start_rss, 1)
+    if trace_memory:
+        measurement["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    if profiler:
+        profiler.dump_stats(profile_path)
+        measurement["profile_file"] = profile_path
+        measurement["profile_top"] = profile_summary(profiler)
+    return result, measurement
+
+
+def run_pipeline(name, num_rows, tmp_dir, file_format="csv", render=False, profile_dir=None,
+                 trace_memory=False, seed=0):
+    """Run and measure every stage for one dataset and row count; returns one result dict per stage."""
+    generator, module = DATASETS[name]
+    file_path = os.path.join(tmp_dir, f"{name}.{file_format}")
+    kwargs = {"end_date": "2024-12-31"} if name == "retail_sales" else {}
+
+    stages = [
+        ("generate", lambda _: write_dataset(generator, num_rows, file_path, seed, **kwargs)),
+        ("load", lambda _: read_dataset(file_path, module.ANALYSIS_COLUMNS, SCHEMAS[name])),
+        ("analyze", lambda df: module.compute_aggregates(df)),
+    ]
+    if render:
+        chart_dir = os.path.join(tmp_dir, f"{name}_charts")
+        stages.append(("render", lambda aggregates: render_figures(module.figure_specs(aggregates), chart_dir)))
+
+    results, previous = [], None
+    for stage, function in stages:
+        profile_path = None
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            profile_path = os.path.join(profile_dir, f"{name}-{num_rows}-{stage}.prof")
+        previous, measurement = measure(lambda: function(previous), num_rows, profile_path, trace_memory)
+        results.append({"dataset": name, "rows": num_rows, "stage": stage, **measurement})
+        print(f"{name:<18}{num_rows:>12,}  {stage:<9}{measurement['wall_s']:>10.3f}"
+              f"{measurement['rows_per_s'] or 0:>14,}{measurement['peak_rss_mb']:>12.1f}"
+              f"{measurement.get('rss_growth_mb', float('nan')):>10.1f}")
+    if os.path.isdir(file_path):
+        shutil.rmtree(file_path)  # .npcol stores are directories
+    else:
+        os.remove(file_path)
+    return results
+
+
+def environment():
+    """Describe the machine and library versions the results were measured with."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(datasets, row_counts, file_format="csv", render=False, profile_dir=None, trace_memory=False):
+    """Run the pipeline for every dataset and row count and return the results document."""
+    print(f"{'Dataset':<18}{'Rows':>12}  {'Stage':<9}{'Seconds':>10}{'Rows/sec':>14}{'Peak RSS MB':>12}{'Growth MB':>10}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in row_counts:
+            for name in datasets:
+                results += run_pipeline(name, num_rows, tmp_dir, file_format, render, profile_dir, trace_memory)
+    return {"environment": environment(), "format": file_format, "results": results}
+
+
+def compare_to_baseline(document, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compare the wall times in document with those in baseline for the same dataset, row
+    count and stage. Prints the changes and returns the list of regressions found.
+    """
+    def key(result):
+        return result["dataset"], result["rows"], result["stage"]
+
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\n{'Dataset':<18}{'Rows':>12}  {'Stage':<9}{'Baseline s':>11}{'Current s':>11}{'Change':>9}")
+    for result in document["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        change = result["wall_s"] / old["wall_s"] - 1 if old["wall_s"] > 0 else 0.0
+        regressed = change > threshold and result["wall_s"] - old["wall_s"] > MIN_REGRESSION_SECONDS
+        if regressed:
+            regressions.append({**result, "baseline_wall_s": old["wall_s"], "change": round(change, 3)})
+        print(f"{result['dataset']:<18}{result['rows']:>12,}  {result['stage']:<9}{old['wall_s']:>11.3f}"
+              f"{result['wall_s']:>11.3f}{change:>+9.0%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark generation, loading, analysis and rendering.")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS),
+                        help="Datasets to benchmark.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS, help="Row counts to run.")
+    parser.add_argument("--format", choices=["csv", "parquet", "feather", "npcol"], default="csv",
+                        help="File format generated and loaded.")
+    parser.add_argument("--render", action="store_true", help="Also time rendering the charts to PNG.")
+    parser.add_argument("--profile-dir", help="Profile every stage with cProfile and save the .prof files here.")
+    parser.add_argument("--tracemalloc", action="store_true", help="Record the peak Python allocation of each stage.")
+    parser.add_argument("--output", help=f"File to write the JSON results to "
+                                         f"(default: {RESULTS_DIR}/<format>-<timestamp>.json).")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown over the baseline reported as a regression.")
+    args = parser.parse_args()
+
+    document = run_suite(args.datasets, args.rows, args.format, args.render, args.profile_dir, args.tracemalloc)
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.format}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(document, file, indent=2)
+    print(f"\nResults written to '{output}'.")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_to_baseline(document, json.load(file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}.")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Title: Memory-mapped Columnar Store
+# Purpose: Keep a dataset as a directory of fixed-width column files (a .npcol store) that are
+#          opened with numpy.memmap instead of being parsed. Numbers, booleans and dates are
+#          stored as raw NumPy arrays, categorical strings as dictionary-encoded integer codes
+#          and other strings (identifiers) as fixed-width UTF-8 bytes. Opening a store costs
+#          the same at any size, and every process reading it shares the operating system's
+#          page cache instead of holding a private copy of the data.
+#
+# Layout of <name>.npcol/:
+#     manifest.json    row count, and for each column its kind, NumPy dtype, file and dictionary
+#     col<i>.bin       the values of column i, back to back with no header
+#     col<i>.mask      for "masked" columns, one byte per row that is 1 where the value is missing
+# Column kinds: "values" (numbers and booleans), "masked" (pandas' nullable Int*, Float* and
+# boolean columns: their values, 0 where missing, plus the mask), "datetime", "dictionary"
+# (codes into the manifest's sorted dictionary, -1 for missing) and "string" (missing strings
+# are stored empty). Other extension dtypes, such as Arrow-backed numbers, are rejected.
+
+STORE_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+# Versions ColumnStore can read (version 1 stores have no masked columns)
+READABLE_VERSIONS = {1, 2}
+
+# Nullable pandas arrays stored as values plus a missing-value mask
+MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+# Rows converted at a time when a column is rewritten while closing a store
+FINISH_BLOCK_ROWS = 4 * 1024 * 1024
+
+
+def code_dtype(num_categories):
+    """Return the smallest integer dtype pandas uses for the codes of num_categories categories."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if num_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _column_kind(column):
+    """Return the store kind used for a DataFrame column (a TypeError for numbers it cannot hold)."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return "dictionary"
+    if pd.api.types.is_datetime64_dtype(column.dtype):
+        return "datetime"
+    if isinstance(column.array, MASKED_ARRAYS):
+        return "masked"
+    if pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+        if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+            raise TypeError(f"Column '{column.name}' has dtype {column.dtype}, which a .npcol store cannot hold; "
+                            "convert it to a NumPy or nullable (Int64, Float64, boolean) dtype first.")
+        return "values"
+    return "string"
+
+
+def _encode_strings(values):
+    """Return a str array as fixed-width UTF-8 bytes, converting plain ASCII (the usual case) quickly."""
+    try:
+        return values.astype("S")
+    except UnicodeEncodeError:
+        return np.char.encode(values, "utf-8")
+
+
+class ColumnStoreWriter:
+    """
+    Write DataFrame chunks one after another to a .npcol store, with the same interface as
+    data_io.ChunkWriter. The store is assembled in a temporary directory and moved into place
+    by close(), so readers never see a half-written store.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.tmp_path = f"{self.path}.tmp"
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+        self.columns = None
+        self.num_rows = 0
+
+    def _file(self, column, suffix="bin"):
+        """Return the path of column's file with the given suffix in the temporary directory."""
+        return os.path.join(self.tmp_path, f"{column['stem']}.{suffix}")
+
+    def write(self, df):
+        """Append the rows of df (which must have the columns and types of the first chunk)."""
+        if self.columns is None:
+            self.columns = [
+                {"name": str(name), "kind": _column_kind(df[name]), "stem": f"col{index}",
+                 "dtype": df[name].dtype, "dictionary": {}, "pieces": []}
+                for index, name in enumerate(df.columns)
+            ]
+            for column in self.columns:
+                if column["kind"] == "masked":
+                    # Stored as the NumPy dtype of the values; the pandas dtype is restored on read
+                    column["pandas_dtype"] = str(column["dtype"])
+                    column["dtype"] = column["dtype"].numpy_dtype
+        for column, name in zip(self.columns, df.columns):
+            values = df[name]
+            kind = column["kind"]
+            if kind == "dictionary":
+                # Chunk codes -> codes into the store dictionary (in first-seen order until close)
+                dictionary = column["dictionary"]
+                lookup = [dictionary.setdefault(str(category), len(dictionary)) for category in values.cat.categories]
+                lookup = np.array(lookup + [-1], dtype=np.int32)
+                self._append(self._file(column, "codes"), lookup[values.cat.codes.to_numpy()])
+            elif kind == "string":
+                encoded = _encode_strings(values.fillna("").to_numpy(dtype=str))
+                piece = self._file(column, f"{len(column['pieces'])}.part")
+                self._append(piece, encoded)
+                column["pieces"].append((piece, encoded.dtype.str))
+            elif kind == "masked":
+                dtype = column["dtype"]
+                self._append(self._file(column), values.to_numpy(dtype=dtype, na_value=dtype.type(0)))
+                self._append(self._file(column, "mask"), values.isna().to_numpy())
+            else:
+                self._append(self._file(column), values.to_numpy(dtype=column["dtype"]))
+        self.num_rows += len(df)
+
+    @staticmethod
+    def _append(path, array):
+        with open(path, "ab") as file:
+            np.ascontiguousarray(array).tofile(file)
+
+    def _finish_dictionary(self, column):
+        """Sort the dictionary and rewrite the codes with the narrowest integer type."""
+        first_seen = list(column["dictionary"])
+        labels = sorted(first_seen)
+        position = {label: index for index, label in enumerate(labels)}
+        # First-seen code -> code into the sorted dictionary, with -1 staying -1
+        lookup = np.array([position[label] for label in first_seen] + [-1], dtype=np.int64)
+        dtype = code_dtype(len(labels))
+        codes_path = self._file(column, "codes")
+        if self.num_rows:
+            codes = np.memmap(codes_path, dtype=np.int32, mode="r", shape=(self.num_rows,))
+            with open(self._file(column), "wb") as file:
+                for start in range(0, self.num_rows, FINISH_BLOCK_ROWS):
+                    lookup[codes[start:start + FINISH_BLOCK_ROWS]].astype(dtype).tofile(file)
+            del codes
+            os.remove(codes_path)
+        else:
+            open(self._file(column), "wb").close()
+        column["dtype"] = dtype
+        column["dictionary"] = labels
+
+    def _finish_string(self, column):
+        """Join the pieces of a string column into one array as wide as its longest value."""
+        width = max([np.dtype(dtype).itemsize for _, dtype in column["pieces"]] + [1])
+        dtype = np.dtype(f"S{width}")
+        with open(self._file(column), "wb") as file:
+            for piece, piece_dtype in column["pieces"]:
+                np.fromfile(piece, dtype=piece_dtype).astype(dtype).tofile(file)
+                os.remove(piece)
+        column["dtype"] = dtype
+
+    def close(self):
+        """Finish every column, write the manifest and move the store into place."""
+        if self.columns is None:
+            self.columns = []
+        for column in self.columns:
+            if column["kind"] == "dictionary":
+                self._finish_dictionary(column)
+            elif column["kind"] == "string":
+                self._finish_string(column)
+            elif not os.path.exists(self._file(column)):
+                open(self._file(column), "wb").close()
+                if column["kind"] == "masked":
+                    open(self._file(column, "mask"), "wb").close()
+        manifest = {
+            "version": STORE_VERSION,
+            "num_rows": self.num_rows,
+            "columns": [
+                {"name": column["name"], "kind": column["kind"], "file": f"{column['stem']}.bin",
+                 "dtype": np.dtype(column["dtype"]).str,
+                 **({"dictionary": column["dictionary"]} if column["kind"] == "dictionary" else {}),
+                 **({"mask_file": f"{column['stem']}.mask", "pandas_dtype": column["pandas_dtype"]}
+                    if column["kind"] == "masked" else {})}
+                for column in self.columns
+            ],
+        }
+        with open(os.path.join(self.tmp_path, MANIFEST_NAME), "w") as file:
+            json.dump(manifest, file, indent=2)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+
+class ColumnStore:
+    """
+    A .npcol store opened for reading. array() returns a column as a read-only memmap (the
+    codes for dictionary columns, the values without their mask for masked columns); to_frame()
+    wraps the memmaps in a DataFrame without copying.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(os.path.join(self.path, MANIFEST_NAME)) as file:
+            manifest = json.load(file)
+        if manifest.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"{self.path} was written by an unsupported store version.")
+        self.num_rows = manifest["num_rows"]
+        self.manifest = {column["name"]: column for column in manifest["columns"]}
+        self._arrays = {}
+        self._masks = {}
+
+    @property
+    def columns(self):
+        return list(self.manifest)
+
+    def _entry(self, name):
+        if name not in self.manifest:
+            raise ValueError(f"Column '{name}' is not in the store {self.path}.")
+        return self.manifest[name]
+
+    def _map(self, file, dtype):
+        """Return a column file as a read-only memmap (an empty array when the store has no rows)."""
+        if self.num_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, file), dtype=dtype, mode="r", shape=(self.num_rows,))
+
+    def array(self, name):
+        """Return column name as a read-only memmap (an empty array when the store has no rows)."""
+        if name not in self._arrays:
+            entry = self._entry(name)
+            self._arrays[name] = self._map(entry["file"], np.dtype(entry["dtype"]))
+        return self._arrays[name]
+
+    def mask(self, name):
+        """Return the missing-value mask of masked column name as a read-only memmap."""
+        if name not in self._masks:
+            entry = self._entry(name)
+            if entry["kind"] != "masked":
+                raise ValueError(f"Column '{name}' of the store {self.path} has no mask.")
+            self._masks[name] = self._map(entry["mask_file"], np.dtype(bool))
+        return self._masks[name]
+
+    def dictionary(self, name):
+        """Return the sorted labels that the codes of dictionary column name refer to."""
+        return self._entry(name)["dictionary"]
+
+    def series(self, name, start=0, stop=None):
+        """Return rows start:stop of column name as a Series backed by the memmap where possible."""
+        entry = self._entry(name)
+        values = np.asarray(self.array(name)[start:stop])
+        if entry["kind"] == "dictionary":
+            dtype = pd.CategoricalDtype(entry["dictionary"])
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        elif entry["kind"] == "masked":
+            array_type = pd.api.types.pandas_dtype(entry["pandas_dtype"]).construct_array_type()
+            values = array_type(values, np.asarray(self.mask(name)[start:stop]))
+        elif entry["kind"] == "string":
+            # Strings have to be decoded, so identifier columns are copied; plain ASCII (the
+            # usual case) converts much faster than a general UTF-8 decode
+            ascii_only = values.size == 0 or values.view(np.uint8).max() < 128
+            values = pd.array(values.astype("U") if ascii_only else np.char.decode(values, "utf-8"), dtype="str")
+        return pd.Series(values, name=name, copy=False)
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        """Return rows start:stop of the given columns (all by default) as a DataFrame."""
+        columns = self.columns if columns is None else columns
+        series = {name: self.series(name, start, stop) for name in columns}
+        return pd.DataFrame(series, columns=columns, copy=False)
+
+    def chunks(self, columns=None, chunk_size=1_000_000):
+        """Yield the store as DataFrames of at most chunk_size rows."""
+        for start in range(0, max(self.num_rows, 1), chunk_size):
+            yield self.to_frame(columns, start, start + chunk_size)
+
+
+def read_store(path, columns=None):
+    """Open the .npcol store at path and return the given columns (all by default) as a DataFrame."""
+    return ColumnStore(path).to_frame(columns)
@@ -0,0 +1,31 @@
+import argparse
+import os
+import time
+
+from data_io import FILE_FORMATS, SCHEMAS, convert_dataset
+
+# Title: Dataset Format Converter
+# Purpose: Convert one of the Data/ files to another format, typed from its schema. Converting
+#          to a .npcol columnar store lets the analysis scripts memory-map the data instead of
+#          parsing it, and lets several processes share one copy of it in the page cache.
+
+def convert_file(name, source_path, target_path=None):
+    """
+    Convert the dataset file source_path (holding dataset name) to target_path, which defaults
+    to source_path with a .npcol extension. Returns the path written.
+    """
+    target_path = target_path or f"{os.path.splitext(source_path)[0]}.npcol"
+    start = time.perf_counter()
+    num_rows = convert_dataset(source_path, target_path, SCHEMAS[name])
+    print(f"Converted {num_rows} rows from '{source_path}' to '{target_path}' "
+          f"in {time.perf_counter() - start:.2f} s.")
+    return target_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a dataset file to another format.")
+    parser.add_argument("dataset", choices=list(SCHEMAS), help="Dataset the file holds.")
+    parser.add_argument("source_path", help="File to convert.")
+    parser.add_argument("target_path", nargs="?",
+                        help=f"File to write ({', '.join(sorted(FILE_FORMATS))}); defaults to a .npcol store.")
+    args = parser.parse_args()
+    convert_file(args.dataset, args.source_path, args.target_path)
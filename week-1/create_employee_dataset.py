@@ -1,46 +1,34 @@
-import pandas as pd
-import random
+from dataset_engine import DEFAULT_CHUNK_SIZE, generate_employee_data, write_dataset
+from spec_generator import spec_generator
 
 # Title: Employee Dataset Generator
 # Purpose: Create a custom employee dataset for data science exploration and save it as a CSV.
 
-def create_custom_dataset():
+def create_custom_dataset(num_rows=40, seed=None, file_name="employee_data.csv",
+                          chunk_size=DEFAULT_CHUNK_SIZE, workers=1, sharded=False,
+                          compression=None, row_group_size=None, realistic=False):
     """
     Generate a custom dataset of employee information for analysis and save to CSV.
-    The dataset includes 40 rows and 9 relevant columns.
+    The dataset includes 40 rows by default and 9 relevant columns.
+    Pass a seed to make the generated data reproducible.
+    Rows are generated and appended to the CSV in chunks of chunk_size rows, so memory
+    use stays flat as num_rows grows. With workers > 1 the chunks are generated in a
+    process pool; the output for a given seed is identical whatever the worker count.
+    Pass sharded=True to keep one file per chunk instead of a single merged file.
+    A .parquet or .feather file_name writes a columnar file instead of CSV, using the
+    given compression codec and row_group_size (rows per Parquet row group / Feather batch).
+    With realistic=True the rows come from spec_generator.SPECS["employee"].
     """
-    
-    # Define the number of rows in the dataset
-    num_rows = 40
-    
-    # Generate employee data
-    employee_data = {
-        "Employee_ID": [f"E{1000 + i}" for i in range(num_rows)],
-        "Name": [f"Employee_{i}" for i in range(num_rows)],
-        "Age": [random.randint(22, 60) for _ in range(num_rows)],  # Random age between 22 and 60
-        "Department": random.choices(
-            ["HR", "Engineering", "Sales", "Marketing", "Finance"], k=num_rows
-        ),  # Randomly assigned department
-        "Salary": [random.randint(40000, 120000) for _ in range(num_rows)],  # Salary range
-        "Joining_Year": [random.randint(2010, 2023) for _ in range(num_rows)],  # Random joining year
-        "Performance_Score": [round(random.uniform(1.0, 5.0), 2) for _ in range(num_rows)],  # Performance rating
-        "Years_in_Company": [random.randint(1, 12) for _ in range(num_rows)],  # Years at the company
-        "Remote_Work": random.choices([True, False], k=num_rows)  # Boolean for remote work status
-    }
 
-    # Create a DataFrame from the generated data
-    df = pd.DataFrame(employee_data)
-
-    # Define the CSV file name
-    csv_file_name = "employee_data.csv"
-
-    # Save the DataFrame to a CSV file
-    df.to_csv(csv_file_name, index=False)
+    # Generate employee data chunk by chunk (one shard per chunk) and write it to file_name
+    generator = spec_generator("employee") if realistic else generate_employee_data
+    columns, output_files = write_dataset(generator, num_rows, file_name, seed,
+                                          chunk_size, workers, sharded, compression, row_group_size)
 
     # Output a confirmation message
-    print(f"Custom dataset created successfully and saved as '{csv_file_name}'.")
+    print(f"Custom dataset created successfully and saved as '{', '.join(output_files)}'.")
     print("Dataset includes the following columns:")
-    print(", ".join(df.columns))
+    print(", ".join(columns))
 
 # Execute the dataset creation function
 if __name__ == "__main__":
@@ -1,13 +1,23 @@
-import pandas as pd
-import random
+from dataset_engine import DEFAULT_CHUNK_SIZE, generate_ocean_conditions_data, write_dataset
+from spec_generator import spec_generator
 
-def create_ocean_conditions_dataset():
+def create_ocean_conditions_dataset(num_rows=150, seed=None, file_name="ocean_conditions_data.csv",
+                                    chunk_size=DEFAULT_CHUNK_SIZE, workers=1, sharded=False,
+                                    compression=None, row_group_size=None, realistic=False):
     """
     Create a dataset of ocean conditions and save it as 'ocean_conditions_data.csv'.
-    The dataset includes 100 samples with 7 features.
+    The dataset includes 150 samples by default with 7 features.
+    Pass a seed to make the generated data reproducible.
+    Rows are generated and appended to the CSV in chunks of chunk_size rows, so memory
+    use stays flat as num_rows grows. With workers > 1 the chunks are generated in a
+    process pool; the output for a given seed is identical whatever the worker count.
+    Pass sharded=True to keep one file per chunk instead of a single merged file.
+    A .parquet or .feather file_name writes a columnar file instead of CSV, using the
+    given compression codec and row_group_size (rows per Parquet row group / Feather batch).
+    With realistic=True the rows come from spec_generator.SPECS["ocean_conditions"].
 
     Explanation of the Dataset:
-    Sample_ID: Unique identifiers for each sample (S1, S2, ..., S100).
+    Sample_ID: Unique identifiers for each sample (S1, S2, ..., S150).
     Temperature_C: Random ocean temperature between 5°C and 30°C.
     Salinity_PPT: Random salinity in parts per thousand (PPT), simulating various oceanic conditions.
     Wave_Height_M: Random wave height ranging from 0.1 meters to 5.0 meters.
@@ -15,36 +25,16 @@ def create_ocean_conditions_dataset():
     Depth_M: Random depth of the ocean measured in meters, between 1 and 100 meters.
     Weather_Condition: Randomly assigned weather conditions, including options like Sunny, Cloudy, Rainy, Stormy, and Foggy.
     """
-    
-    # Define the number of rows in the dataset
-    num_rows = 150
-    
-    # Generate ocean condition data
-    ocean_data = {
-        "Sample_ID": [f"S{i + 1}" for i in range(num_rows)],
-        "Temperature_C": [round(random.uniform(5.0, 30.0), 2) for _ in range(num_rows)],  # Random temperature between 5°C and 30°C
-        "Salinity_PPT": [round(random.uniform(30.0, 40.0), 2) for _ in range(num_rows)],  # Random salinity in PPT
-        "Wave_Height_M": [round(random.uniform(0.1, 5.0), 2) for _ in range(num_rows)],  # Random wave height between 0.1m and 5.0m
-        "Current_Speed_KPH": [round(random.uniform(0.5, 10.0), 2) for _ in range(num_rows)],  # Random current speed between 0.5 and 10 KPH
-        "Depth_M": [random.randint(1, 100) for _ in range(num_rows)],  # Random depth between 1m and 100m
-        "Weather_Condition": random.choices(
-            ["Sunny", "Cloudy", "Rainy", "Stormy", "Foggy"], k=num_rows
-        ),  # Randomly assigned weather conditions
-    }
 
-    # Create a DataFrame from the generated data
-    df = pd.DataFrame(ocean_data)
-
-    # Define the CSV file name
-    csv_file_name = "ocean_conditions_data.csv"
-
-    # Save the DataFrame to a CSV file
-    df.to_csv(csv_file_name, index=False)
+    # Generate ocean condition data chunk by chunk (one shard per chunk) and write it to file_name
+    generator = spec_generator("ocean_conditions") if realistic else generate_ocean_conditions_data
+    columns, output_files = write_dataset(generator, num_rows, file_name, seed,
+                                          chunk_size, workers, sharded, compression, row_group_size)
 
     # Output a confirmation message
-    print(f"Custom dataset created successfully and saved as '{csv_file_name}'.")
+    print(f"Custom dataset created successfully and saved as '{', '.join(output_files)}'.")
     print("Dataset includes the following columns:")
-    print(", ".join(df.columns))
+    print(", ".join(columns))
 
 # Execute the dataset creation function
 if __name__ == "__main__":
@@ -1,12 +1,23 @@
-import pandas as pd
-import random
-from datetime import datetime, timedelta
+from datetime import date
 
-def create_retail_sales_dataset():
+from dataset_engine import DEFAULT_CHUNK_SIZE, generate_retail_sales_data, write_dataset
+from spec_generator import spec_generator
+
+def create_retail_sales_dataset(num_rows=100, seed=None, file_name="retail_sales_data.csv",
+                                chunk_size=DEFAULT_CHUNK_SIZE, workers=1, sharded=False,
+                                compression=None, row_group_size=None, realistic=False):
     """
     Create a dataset of retail sales and save it as 'retail_sales_data.csv'.
-    The dataset includes 100 samples with 12 features.
-    
+    The dataset includes 100 samples by default with 12 features.
+    Pass a seed to make the generated data reproducible.
+    Rows are generated and appended to the CSV in chunks of chunk_size rows, so memory
+    use stays flat as num_rows grows. With workers > 1 the chunks are generated in a
+    process pool; the output for a given seed is identical whatever the worker count.
+    Pass sharded=True to keep one file per chunk instead of a single merged file.
+    A .parquet or .feather file_name writes a columnar file instead of CSV, using the
+    given compression codec and row_group_size (rows per Parquet row group / Feather batch).
+    With realistic=True the rows come from spec_generator.SPECS["retail_sales"].
+
     Explanation of the Dataset:
     Order_ID: Unique identifiers for each order (O1, O2, ..., O100).
     Product_Name: Randomly assigned product names.
@@ -21,46 +32,18 @@ def create_retail_sales_dataset():
     Order_Status: Current status of the order (Shipped/Processing/Cancelled).
     Product_Category: Category of the product sold.
     """
-    
-    # Define the number of rows in the dataset
-    num_rows = 100
-    
-    # Generate retail sales data
-    product_names = [f"Product_{i+1}" for i in range(20)]  # 20 different products
-    order_data = {
-        "Order_ID": [f"O{i + 1}" for i in range(num_rows)],
-        "Product_Name": random.choices(product_names, k=num_rows),  # Randomly assigned product names
-        "Quantity_Sold": [random.randint(1, 10) for _ in range(num_rows)],  # Random quantity sold
-        "Sale_Price": [round(random.uniform(10.0, 100.0), 2) for _ in range(num_rows)],  # Sale price per item
-        "Total_Sales": [],  # Will calculate later
-        "Order_Date": [(datetime.now() - timedelta(days=random.randint(0, 30))).date() for _ in range(num_rows)],  # Random order date within the last 30 days
-        "Customer_Age": [random.randint(18, 65) for _ in range(num_rows)],  # Random customer age
-        "Customer_Gender": random.choices(["Male", "Female", "Other"], k=num_rows),  # Randomly assigned customer gender
-        "Payment_Method": random.choices(["Credit Card", "PayPal", "Bank Transfer"], k=num_rows),  # Random payment methods
-        "Shipping_Cost": [round(random.uniform(5.0, 25.0), 2) for _ in range(num_rows)],  # Random shipping cost
-        "Order_Status": random.choices(["Shipped", "Processing", "Cancelled"], k=num_rows),  # Random order statuses
-        "Product_Category": random.choices(["Electronics", "Clothing", "Home & Garden", "Toys", "Sports"], k=num_rows)  # Random product categories
-    }
-
-    # Calculate Total Sales
-    order_data["Total_Sales"] = [
-        round(order_data["Quantity_Sold"][i] * order_data["Sale_Price"][i], 2)
-        for i in range(num_rows)
-    ]
-
-    # Create a DataFrame from the generated data
-    df = pd.DataFrame(order_data)
-
-    # Define the CSV file name
-    csv_file_name = "retail_sales_data.csv"
 
-    # Save the DataFrame to a CSV file
-    df.to_csv(csv_file_name, index=False)
+    # Generate retail sales data chunk by chunk (one shard per chunk) and write it to file_name
+    # (the end date is fixed once so every chunk draws from the same 30-day window)
+    generator = spec_generator("retail_sales") if realistic else generate_retail_sales_data
+    columns, output_files = write_dataset(generator, num_rows, file_name, seed,
+                                          chunk_size, workers, sharded, compression, row_group_size,
+                                          end_date=date.today())
 
     # Output a confirmation message
-    print(f"Custom dataset created successfully and saved as '{csv_file_name}'.")
+    print(f"Custom dataset created successfully and saved as '{', '.join(output_files)}'.")
     print("Dataset includes the following columns:")
-    print(", ".join(df.columns))
+    print(", ".join(columns))
 
 # Execute the dataset creation function
 if __name__ == "__main__":
@@ -0,0 +1,351 @@
+import os
+
+import pandas as pd
+
+from columnar_store import ColumnStore, ColumnStoreWriter, read_store
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Columnar formats are optional; CSV works without pyarrow
+    pa = None
+
+# Title: Dataset File Input/Output
+# Purpose: Read and write the week-1 datasets as CSV, Parquet, Feather or a memory-mapped
+#          columnar store (see columnar_store), choosing the format from the file extension,
+#          so generators and analysis scripts share one code path. Loads are typed from
+#          per-dataset schemas (categorical strings, 32-bit numbers, parsed dates) and read only
+#          the requested columns.
+
+# File extensions recognised for each supported format
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".npcol": "npcol",
+}
+
+# Compression used for columnar formats when none is requested
+DEFAULT_COMPRESSION = {"parquet": "snappy", "feather": "lz4"}
+
+# Rows per chunk for read_dataset_chunks
+DEFAULT_READ_CHUNK_SIZE = 1_000_000
+
+# CSV parser used for loads: the multithreaded pyarrow engine when it is installed
+CSV_ENGINE = "pyarrow" if pa is not None else "c"
+
+# Bytes of CSV text parsed per block by pyarrow's streaming reader in read_dataset_chunks
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Type of the "datetime" schema columns, whatever format and reader they come from
+DATE_DTYPE = "datetime64[s]"
+
+# Column types for each dataset. Repeated strings are categorical, measurements are
+# downcast to 32 bits, and "datetime" columns are parsed as dates. Money columns stay
+# float64 so totals over millions of rows keep their cents.
+SCHEMAS = {
+    "employee": {
+        "Employee_ID": "str",
+        "Name": "str",
+        "Age": "int32",
+        "Department": "category",
+        "Salary": "int32",
+        "Joining_Year": "int32",
+        "Performance_Score": "float32",
+        "Years_in_Company": "int32",
+        "Remote_Work": "bool",
+    },
+    "ocean_conditions": {
+        "Sample_ID": "str",
+        "Temperature_C": "float32",
+        "Salinity_PPT": "float32",
+        "Wave_Height_M": "float32",
+        "Current_Speed_KPH": "float32",
+        "Depth_M": "int32",
+        "Weather_Condition": "category",
+    },
+    "retail_sales": {
+        "Order_ID": "str",
+        "Product_Name": "category",
+        "Quantity_Sold": "int32",
+        "Sale_Price": "float64",
+        "Total_Sales": "float64",
+        "Order_Date": "datetime",
+        "Customer_Age": "int32",
+        "Customer_Gender": "category",
+        "Payment_Method": "category",
+        "Shipping_Cost": "float64",
+        "Order_Status": "category",
+        "Product_Category": "category",
+    },
+    "iris": {
+        "sepal.length": "float32",
+        "sepal.width": "float32",
+        "petal.length": "float32",
+        "petal.width": "float32",
+        "variety": "category",
+    },
+}
+
+
+def detect_format(file_path):
+    """Return 'csv', 'parquet', 'feather' or 'npcol' based on the extension of file_path."""
+    # Stores are directories, which may be given with a trailing separator
+    extension = os.path.splitext(str(file_path).rstrip("/\\"))[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file extension '{extension}' for {file_path}.")
+    return FILE_FORMATS[extension]
+
+
+def read_column_names(file_path):
+    """Return the column names of a dataset file without reading its rows."""
+    file_format = detect_format(file_path)
+    if file_format == "csv":
+        return list(pd.read_csv(file_path, nrows=0).columns)
+    if file_format == "npcol":
+        return ColumnStore(file_path).columns
+    _require_pyarrow(file_format)
+    if file_format == "parquet":
+        return pq.read_schema(file_path).names
+    return ipc.open_file(pa.memory_map(str(file_path))).schema.names
+
+
+def _require_pyarrow(file_format):
+    """Raise a helpful error when a columnar format is used without pyarrow installed."""
+    if pa is None:
+        raise ImportError(f"Reading or writing {file_format} files requires pyarrow (pip install pyarrow).")
+
+
+def _split_schema(schema, columns):
+    """Return the dtypes and the date columns of schema, limited to columns when given."""
+    names = columns if columns is not None else list(schema)
+    dtypes = {name: schema[name] for name in names if name in schema and schema[name] != "datetime"}
+    date_columns = [name for name in names if schema.get(name) == "datetime"]
+    return dtypes, date_columns
+
+
+def read_dataset(file_path, columns=None, schema=None):
+    """
+    Read a dataset file into a DataFrame, detecting the format from its extension.
+    Only the given columns are read when columns is not None. When a schema (one of
+    SCHEMAS) is given the columns are typed from it and its date columns are parsed.
+    """
+    file_format = detect_format(file_path)
+    if schema is None:
+        dtypes, date_columns = {}, []
+    else:
+        dtypes, date_columns = _split_schema(schema, columns)
+        columns = columns if columns is not None else list(schema)
+
+    if file_format == "csv":
+        if CSV_ENGINE == "pyarrow":
+            # pyarrow parses ISO dates natively when asked for a datetime dtype, which is
+            # much faster than parse_dates converting the strings afterwards
+            dtypes = {**dtypes, **{name: DATE_DTYPE for name in date_columns}}
+            date_columns = []
+        return pd.read_csv(file_path, usecols=columns, dtype=dtypes or None,
+                           parse_dates=date_columns or None, engine=CSV_ENGINE)
+
+    if file_format == "npcol":
+        # Memory-mapped columns: nothing is parsed, and no data is copied unless the schema differs
+        return _apply_schema(read_store(file_path, columns), dtypes, date_columns)
+
+    _require_pyarrow(file_format)
+    if file_format == "parquet":
+        df = pd.read_parquet(file_path, columns=columns)
+    else:
+        df = pd.read_feather(file_path, columns=columns)
+    return _apply_schema(df, dtypes, date_columns)
+
+
+def _apply_schema(df, dtypes, date_columns):
+    """Convert the columns of a frame read from a columnar file (or the C parser) to the schema types."""
+    # Columnar files keep their own types; bring them in line with the schema
+    changed = {name: dtype for name, dtype in dtypes.items() if str(df[name].dtype) != dtype}
+    if changed:
+        df = df.astype(changed)
+    for name in date_columns:
+        # Parquet, Feather, stores and parse_dates give microseconds; use the schema's unit everywhere
+        if df[name].dtype != DATE_DTYPE:
+            df[name] = pd.to_datetime(df[name]).astype(DATE_DTYPE)
+    return df
+
+
+def read_dataset_chunks(file_path, columns=None, schema=None, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Yield a dataset file as DataFrames of at most chunk_size rows, so files larger than
+    memory can be processed one piece at a time. Columns and schema work as in read_dataset.
+    """
+    file_format = detect_format(file_path)
+    if schema is None:
+        dtypes, date_columns = {}, []
+    else:
+        dtypes, date_columns = _split_schema(schema, columns)
+        columns = columns if columns is not None else list(schema)
+
+    if file_format == "csv" and CSV_ENGINE != "pyarrow":
+        for df in pd.read_csv(file_path, usecols=columns, dtype=dtypes or None,
+                              parse_dates=date_columns or None, chunksize=chunk_size):
+            yield _apply_schema(df, {}, date_columns)
+        return
+    if file_format == "npcol":
+        for df in ColumnStore(file_path).chunks(columns, chunk_size):
+            yield _apply_schema(df, dtypes, date_columns)
+        return
+
+    _require_pyarrow(file_format)
+    if file_format == "csv":
+        # pd.read_csv cannot read in chunks with the pyarrow engine, so the CSV is streamed with
+        # pyarrow's own reader: dates are parsed and categorical columns dictionary-encoded while
+        # parsing, and empty fields are missing values as with pandas
+        column_types = {name: pa.timestamp("s") for name in date_columns}
+        column_types.update({name: pa.dictionary(pa.int32(), pa.string())
+                             for name, dtype in dtypes.items() if dtype == "category"})
+        batches = pa_csv.open_csv(
+            file_path, read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(include_columns=columns or [], column_types=column_types,
+                                                  strings_can_be_null=True))
+    elif file_format == "parquet":
+        batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns)
+    else:
+        # Feather files are memory-mapped and read one record batch at a time
+        reader = ipc.open_file(pa.memory_map(str(file_path)))
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    num_batches = 0
+    for batch in batches:
+        num_batches += 1
+        if columns is not None:
+            batch = batch.select(columns)
+        for start in range(0, max(batch.num_rows, 1), chunk_size):
+            df = batch.slice(start, chunk_size).to_pandas()
+            if file_format == "csv":
+                # A slice keeps its block's whole dictionary, in first-seen order; keep only the
+                # values it holds, sorted, as the C parser does
+                for name in df.columns[df.dtypes == "category"]:
+                    values = df[name].cat.remove_unused_categories()
+                    df[name] = values.cat.reorder_categories(sorted(values.cat.categories))
+            yield _apply_schema(df, dtypes, date_columns)
+    if num_batches == 0 and file_format == "csv":
+        # A CSV file with only a header has no batches; yield it as one empty frame like pandas
+        yield _apply_schema(batches.schema.empty_table().to_pandas(), dtypes, date_columns)
+
+
+def read_csv_tail(file_path, offset, columns=None, schema=None):
+    """
+    Read the rows of a CSV file that start at byte offset (the start of a line, e.g. the old
+    end of a file that has since been appended to), naming the columns from the header line.
+    Columns and schema work as in read_dataset.
+    """
+    with open(file_path, "rb") as file:
+        header = file.readline().decode().rstrip("\r\n").split(",")
+        file.seek(max(offset, file.tell()))
+        if schema is None:
+            dtypes, date_columns = {}, []
+        else:
+            dtypes, date_columns = _split_schema(schema, columns)
+            columns = columns if columns is not None else list(schema)
+        # The pyarrow engine cannot combine names with usecols, so tails use the C parser
+        df = pd.read_csv(file, header=None, names=header, usecols=columns, dtype=dtypes or None,
+                         parse_dates=date_columns or None)
+    return _apply_schema(df, {}, date_columns)
+
+
+def convert_dataset(source_path, target_path, schema=None, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Copy a dataset file into another format (both detected from the extensions), chunk by chunk.
+    With a schema the values are typed from it first, so e.g. a .npcol store then holds 32-bit
+    numbers and categorical codes and later typed loads of it need no conversion.
+    Returns the number of rows copied.
+    """
+    num_rows = 0
+    with ChunkWriter(target_path) as writer:
+        for chunk in read_dataset_chunks(source_path, None, schema, chunk_size):
+            writer.write(chunk)
+            num_rows += len(chunk)
+    return num_rows
+
+
+def load_dataset(name, file_path, columns=None, message="Data loaded successfully."):
+    """
+    Load one of the week-1 datasets with its schema from SCHEMAS, printing message on success.
+    Returns None (after printing the reason) when the file is missing, empty or unreadable.
+    """
+    try:
+        df = read_dataset(file_path, columns, SCHEMAS[name])
+        print(message)
+        return df
+    except FileNotFoundError:
+        print(f"Error: The file {file_path} does not exist.")
+        return None
+    except pd.errors.EmptyDataError:
+        print("Error: The file is empty.")
+        return None
+    except pd.errors.ParserError:
+        print("Error: The file could not be parsed.")
+        return None
+    except (ValueError, TypeError, ImportError) as error:
+        print(f"Error: {error}")
+        return None
+
+
+class ChunkWriter:
+    """
+    Write DataFrame chunks one after another to a CSV, Parquet or Feather file or a .npcol store.
+    compression and row_group_size only apply to Parquet and Feather.
+    """
+
+    def __init__(self, file_name, compression=None, row_group_size=None):
+        self.file_name = file_name
+        self.file_format = detect_format(file_name)
+        self.compression = compression or DEFAULT_COMPRESSION.get(self.file_format)
+        self.row_group_size = row_group_size
+        self._started = False
+        self._writer = None
+        if self.file_format == "npcol":
+            self._writer = ColumnStoreWriter(file_name)
+        elif self.file_format != "csv":
+            _require_pyarrow(self.file_format)
+
+    def write(self, df):
+        """Append one chunk to the file (the first chunk also writes the header or schema)."""
+        if self.file_format == "csv":
+            df.to_csv(self.file_name, mode="a" if self._started else "w", header=not self._started, index=False)
+        elif self.file_format == "npcol":
+            self._writer.write(df)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = self._open_writer(table.schema)
+            if self.file_format == "parquet":
+                self._writer.write_table(table, row_group_size=self.row_group_size)
+            else:
+                self._writer.write_table(table, max_chunksize=self.row_group_size)
+        self._started = True
+
+    def _open_writer(self, schema):
+        """Open the pyarrow writer for a columnar file with the schema of the first chunk."""
+        if self.file_format == "parquet":
+            return pq.ParquetWriter(self.file_name, schema, compression=self.compression)
+        options = ipc.IpcWriteOptions(compression=None if self.compression == "uncompressed" else self.compression)
+        return ipc.new_file(self.file_name, schema, options=options)
+
+    def close(self):
+        """Finish the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self.file_format == "npcol":
+            # Discard the half-written store, leaving any previous store at file_name untouched
+            self._writer.__exit__(exc_type, exc_value, traceback)
+            self._writer = None
+            return
+        self.close()
@@ -0,0 +1,267 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_io import DEFAULT_READ_CHUNK_SIZE, SCHEMAS, read_dataset_chunks
+from dataset_engine import (
+    CUSTOMER_GENDERS,
+    DEPARTMENTS,
+    ORDER_STATUSES,
+    PAYMENT_METHODS,
+    PRODUCT_CATEGORIES,
+    PRODUCT_NAMES,
+    WEATHER_CONDITIONS,
+)
+
+# Title: Data Quality Validator
+# Purpose: Check a dataset file against the domain rules its generators promise (value ranges,
+#          allowed categories, identifier patterns, derived columns) before it is analysed. The
+#          rules are declarative specs evaluated as NumPy boolean masks over streamed chunks, so
+#          files larger than memory are checked in one pass, and every rule on a categorical
+#          column is evaluated once per category rather than once per row.
+#
+# A rule is a dict with a "kind", the "column" it checks and the kind's parameters:
+#   required   -                       the value is present
+#   range      min, max (either)       min <= value <= max; date bounds are date strings or "today"
+#   allowed    values                  the value is one of values
+#   pattern    pattern                 the value fully matches the regular expression pattern
+#   product    columns, decimals       the value is the product of columns, rounded to decimals
+# Missing values only break "required" rules, so every rule reports one kind of problem.
+
+# Rules for each dataset, by the same names as data_io.SCHEMAS. Ranges cover the bounds of
+# both the uniform generators in dataset_engine and the realistic specs in spec_generator.
+RULE_SPECS = {
+    "employee": [
+        *[{"kind": "required", "column": name} for name in
+          ["Employee_ID", "Name", "Age", "Department", "Salary", "Joining_Year", "Years_in_Company",
+           "Remote_Work"]],
+        {"kind": "pattern", "column": "Employee_ID", "pattern": r"E\d+"},
+        {"kind": "pattern", "column": "Name", "pattern": r"Employee_\d+"},
+        {"kind": "range", "column": "Age", "min": 22, "max": 60},
+        {"kind": "allowed", "column": "Department", "values": DEPARTMENTS},
+        {"kind": "range", "column": "Salary", "min": 30000, "max": 200000},
+        {"kind": "range", "column": "Joining_Year", "min": 2010, "max": 2023},
+        {"kind": "range", "column": "Performance_Score", "min": 1.0, "max": 5.0},
+        {"kind": "range", "column": "Years_in_Company", "min": 1, "max": 12},
+    ],
+    "ocean_conditions": [
+        *[{"kind": "required", "column": name} for name in SCHEMAS["ocean_conditions"]],
+        {"kind": "pattern", "column": "Sample_ID", "pattern": r"S\d+"},
+        {"kind": "range", "column": "Temperature_C", "min": 5.0, "max": 30.0},
+        {"kind": "range", "column": "Salinity_PPT", "min": 30.0, "max": 40.0},
+        {"kind": "range", "column": "Wave_Height_M", "min": 0.1, "max": 5.0},
+        {"kind": "range", "column": "Current_Speed_KPH", "min": 0.5, "max": 10.0},
+        {"kind": "range", "column": "Depth_M", "min": 1, "max": 100},
+        {"kind": "allowed", "column": "Weather_Condition", "values": WEATHER_CONDITIONS},
+    ],
+    "retail_sales": [
+        *[{"kind": "required", "column": name} for name in SCHEMAS["retail_sales"]],
+        {"kind": "pattern", "column": "Order_ID", "pattern": r"O\d+"},
+        {"kind": "allowed", "column": "Product_Name", "values": PRODUCT_NAMES},
+        {"kind": "range", "column": "Quantity_Sold", "min": 1, "max": 10},
+        {"kind": "range", "column": "Sale_Price", "min": 5.0, "max": 500.0},
+        {"kind": "product", "column": "Total_Sales", "columns": ["Quantity_Sold", "Sale_Price"], "decimals": 2},
+        {"kind": "range", "column": "Order_Date", "max": "today"},
+        {"kind": "range", "column": "Customer_Age", "min": 18, "max": 65},
+        {"kind": "allowed", "column": "Customer_Gender", "values": CUSTOMER_GENDERS},
+        {"kind": "allowed", "column": "Payment_Method", "values": PAYMENT_METHODS},
+        {"kind": "range", "column": "Shipping_Cost", "min": 5.0, "max": 25.0},
+        {"kind": "allowed", "column": "Order_Status", "values": ORDER_STATUSES},
+        {"kind": "allowed", "column": "Product_Category", "values": PRODUCT_CATEGORIES},
+    ],
+    "iris": [
+        *[{"kind": "required", "column": name} for name in SCHEMAS["iris"]],
+        # Measurements in centimetres; the real flowers span 0.1 to 7.9
+        *[{"kind": "range", "column": name, "min": 0.1, "max": 10.0}
+          for name in ["sepal.length", "sepal.width", "petal.length", "petal.width"]],
+        {"kind": "allowed", "column": "variety", "values": ["Setosa", "Versicolor", "Virginica"]},
+    ],
+}
+
+# Row offsets kept per rule as examples of where it is broken
+DEFAULT_MAX_SAMPLES = 5
+
+
+def validation_schema(schema):
+    """
+    Return schema with its integer and boolean columns made nullable (integers as float64),
+    so a missing value is counted by a "required" rule instead of failing the whole read.
+    """
+    relaxed = {"bool": "boolean"}
+    return {name: "float64" if dtype.startswith("int") else relaxed.get(dtype, dtype)
+            for name, dtype in schema.items()}
+
+
+def describe_rule(rule):
+    """Return a short readable description of a rule."""
+    kind, column = rule["kind"], rule["column"]
+    if kind == "required":
+        return f"{column} is present"
+    if kind == "range":
+        if "min" in rule and "max" in rule:
+            return f"{column} in [{rule['min']}, {rule['max']}]"
+        return f"{column} >= {rule['min']}" if "min" in rule else f"{column} <= {rule['max']}"
+    if kind == "allowed":
+        return f"{column} is one of {len(rule['values'])} values"
+    if kind == "pattern":
+        return f"{column} matches {rule['pattern']}"
+    if kind == "product":
+        return f"{column} = {' * '.join(rule['columns'])}"
+    raise ValueError(f"Unknown rule kind '{kind}' for column '{column}'.")
+
+
+def rule_columns(rules):
+    """Return the columns the rules read, in first-use order."""
+    names = [name for rule in rules for name in [rule["column"], *rule.get("columns", [])]]
+    return list(dict.fromkeys(names))
+
+
+def _bound(value, array):
+    """Return a range bound comparable with array (dates are parsed for datetime columns)."""
+    if array.dtype.kind == "M":
+        return pd.Timestamp(value).to_datetime64()
+    return value
+
+
+def _value_violations(values, rule):
+    """Return which of values (a Series) break a range, allowed or pattern rule; missing values pass."""
+    kind = rule["kind"]
+    if kind == "range":
+        array = values.to_numpy()
+        # Comparisons with NaN and NaT are False, so missing values pass without a mask
+        broken = np.zeros(len(array), dtype=bool)
+        if "min" in rule:
+            broken |= array < _bound(rule["min"], array)
+        if "max" in rule:
+            broken |= array > _bound(rule["max"], array)
+        return broken
+    if kind == "allowed":
+        return ~values.isin(rule["values"]).to_numpy() & values.notna().to_numpy()
+    if kind == "pattern":
+        # Arrow-backed strings are matched by pyarrow's regex engine in one call; other columns
+        # are converted to them first, which is faster than matching Python strings row by row
+        strings = values if isinstance(values.array, pd.arrays.ArrowStringArray) else values.astype("str")
+        matches = strings.str.fullmatch(rule["pattern"]).to_numpy(dtype=bool, na_value=False)
+        return ~matches & values.notna().to_numpy()
+    raise ValueError(f"Unknown rule kind '{kind}' for column '{rule['column']}'.")
+
+
+def rule_violations(df, rule):
+    """Return a boolean array marking the rows of df that break rule."""
+    kind, values = rule["kind"], df[rule["column"]]
+    if kind == "required":
+        return values.isna().to_numpy()
+    if kind == "product":
+        expected = np.prod([df[name].to_numpy(dtype=np.float64) for name in rule["columns"]], axis=0)
+        # A value rounded to decimals lies within half a unit of its last place of the product
+        # (the slack covers the float error of the comparison itself)
+        tolerance = 0.5 * 10.0 ** -rule.get("decimals", 6) * (1 + 1e-6)
+        return np.abs(values.to_numpy(dtype=np.float64) - expected) > tolerance
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Check each category once and look the rows up by their codes; code -1 (missing) passes
+        categories = pd.Series(values.cat.categories)
+        broken = np.append(_value_violations(categories, rule), False)
+        return broken[values.cat.codes.to_numpy()]
+    return _value_violations(values, rule)
+
+
+class DataValidator:
+    """
+    Count the rows of a stream of DataFrame chunks that break each of a list of rules, and keep
+    the offsets (0-based data row numbers, not counting a header) of the first few of them.
+    """
+
+    def __init__(self, rules, max_samples=DEFAULT_MAX_SAMPLES):
+        for rule in rules:
+            describe_rule(rule)  # Rejects unknown rule kinds before any data is read
+        self.rules = rules
+        self.max_samples = max_samples
+        self.num_rows = 0
+        self.counts = np.zeros(len(rules), dtype=np.int64)
+        self.samples = [[] for _ in rules]
+
+    def update(self, df):
+        """Check one chunk (the rows following the ones already checked)."""
+        for index, rule in enumerate(self.rules):
+            broken = rule_violations(df, rule)
+            count = np.count_nonzero(broken)
+            if count == 0:
+                continue
+            self.counts[index] += count
+            needed = self.max_samples - len(self.samples[index])
+            if needed > 0:
+                self.samples[index] += (self.num_rows + np.flatnonzero(broken)[:needed]).tolist()
+        self.num_rows += len(df)
+        return self
+
+    @property
+    def num_violations(self):
+        return int(self.counts.sum())
+
+    def report(self):
+        """Return a DataFrame with the violations, their share of the rows and sample offsets per rule."""
+        return pd.DataFrame({
+            "Rule": [describe_rule(rule) for rule in self.rules],
+            "Violations": self.counts,
+            "Percent": 100 * self.counts / max(self.num_rows, 1),
+            "Sample_Rows": [", ".join(map(str, samples)) for samples in self.samples],
+        })
+
+
+def validate_file(name, file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE, max_samples=DEFAULT_MAX_SAMPLES, rules=None):
+    """
+    Check the dataset file file_path (holding dataset name) chunk by chunk against rules (the
+    dataset's RULE_SPECS by default), reading only the columns the rules use.
+    Returns the DataValidator, or None (after printing the reason) if the file cannot be read.
+    """
+    rules = RULE_SPECS[name] if rules is None else rules
+    validator = DataValidator(rules, max_samples)
+    try:
+        chunks = read_dataset_chunks(file_path, rule_columns(rules), validation_schema(SCHEMAS[name]), chunk_size)
+        for chunk in chunks:
+            validator.update(chunk)
+    except FileNotFoundError:
+        print(f"Error: The file {file_path} does not exist.")
+        return None
+    except pd.errors.EmptyDataError:
+        print("Error: The file is empty.")
+        return None
+    except pd.errors.ParserError:
+        print("Error: The file could not be parsed.")
+        return None
+    except (ValueError, TypeError, ImportError) as error:
+        print(f"Error: {error}")
+        return None
+    return validator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a dataset file against the domain rules of its dataset.")
+    parser.add_argument("dataset", choices=list(RULE_SPECS), help="Dataset the file holds.")
+    parser.add_argument("file_path", help="CSV, Parquet or Feather file or .npcol store to check.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_READ_CHUNK_SIZE, help="Rows read per chunk.")
+    parser.add_argument("--samples", type=int, default=DEFAULT_MAX_SAMPLES,
+                        help="Offsets of violating rows to show per rule.")
+    parser.add_argument("--all", action="store_true", help="Also list the rules that pass.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validator = validate_file(args.dataset, args.file_path, args.chunk_size, args.samples)
+    if validator is None:
+        sys.exit(2)
+    elapsed = time.perf_counter() - start
+    report = validator.report()
+    if not args.all:
+        report = report[report["Violations"] > 0]
+    print(f"Checked {validator.num_rows} rows against {len(validator.rules)} rules in {elapsed:.2f} s "
+          f"({validator.num_rows / max(elapsed, 1e-9) / 1e6:.1f}M rows/s).")
+    if len(report):
+        print(report.to_string(index=False))
+    # A non-zero exit status lets ingest scripts stop on bad files
+    if validator.num_violations:
+        print(f"\n{validator.num_violations} violation(s) found.")
+        sys.exit(1)
+    print("All rules pass.")
@@ -0,0 +1,286 @@
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_io import ChunkWriter, detect_format, pa
+
+# Title: Dataset Generation Engine
+# Purpose: Build the week-1 datasets (employee, ocean conditions, retail sales) column by column
+#          as NumPy arrays, so that millions of rows can be generated in one batched call
+#          from a seeded numpy.random.Generator, and stream them to CSV, Parquet or Feather in
+#          fixed-size chunks so memory use stays flat however many rows are written. Chunks can
+#          also be generated in parallel as shards, each seeded independently from one master seed.
+
+# Number of rows generated and written per chunk by write_dataset
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Below this many rows write_dataset generates in one process: starting workers and moving
+# the shards between processes costs more than generating the rows in parallel saves
+PARALLEL_MIN_ROWS = 2_000_000
+
+# Category values shared by the generators
+DEPARTMENTS = ["HR", "Engineering", "Sales", "Marketing", "Finance"]
+WEATHER_CONDITIONS = ["Sunny", "Cloudy", "Rainy", "Stormy", "Foggy"]
+PRODUCT_NAMES = [f"Product_{i + 1}" for i in range(20)]  # 20 different products
+CUSTOMER_GENDERS = ["Male", "Female", "Other"]
+PAYMENT_METHODS = ["Credit Card", "PayPal", "Bank Transfer"]
+ORDER_STATUSES = ["Shipped", "Processing", "Cancelled"]
+PRODUCT_CATEGORIES = ["Electronics", "Clothing", "Home & Garden", "Toys", "Sports"]
+
+
+def make_rng(seed=None):
+    """Return a numpy.random.Generator seeded with the given seed (random if None)."""
+    return np.random.default_rng(seed)
+
+
+def resolve_seed(seed=None):
+    """Return seed unchanged, or a fresh random master seed if seed is None."""
+    return seed if seed is not None else np.random.SeedSequence().entropy
+
+
+def shard_rng(seed, shard_index):
+    """
+    Return the generator for one shard. Shard seeds are spawned from the master seed,
+    so every shard gets an independent stream that does not depend on which process runs it.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index,)))
+
+
+# ASCII bytes of the two-digit numbers 00 to 99, used to format identifiers two digits at a time
+_DIGIT_PAIRS = np.array([[ord("0") + tens, ord("0") + ones] for tens in range(10) for ones in range(10)],
+                        dtype=np.uint8)
+
+
+def sequential_ids(prefix, start, num_rows):
+    """Return the identifiers prefix+start, prefix+(start+1), ... as an array of strings."""
+    if pa is None:
+        return np.char.add(prefix, np.arange(start, start + num_rows).astype(str))
+    # Build the UTF-8 bytes of all identifiers in one Arrow string buffer. Sequential numbers
+    # with the same number of digits form a contiguous block of fixed-width strings, which is
+    # filled as a 2D byte matrix, two digit columns at a time from the right.
+    prefix_bytes = np.frombuffer(prefix.encode(), dtype=np.uint8)
+    width = len(prefix_bytes)
+    blocks, lengths = [], []
+    block_start, end = start, start + num_rows
+    number_type = np.uint32 if end <= 2 ** 32 else np.uint64
+    while block_start < end:
+        num_digits = len(str(block_start))
+        block_end = min(end, 10 ** num_digits)
+        remaining = np.arange(block_start, block_end, dtype=number_type)
+        block = np.empty((len(remaining), width + num_digits), dtype=np.uint8)
+        block[:, :width] = prefix_bytes
+        position = width + num_digits
+        while position - 2 >= width:
+            block[:, position - 2:position] = np.take(_DIGIT_PAIRS, remaining % 100, axis=0)
+            remaining //= 100
+            position -= 2
+        if position > width:
+            block[:, width] = ord("0") + remaining
+        blocks.append(block.ravel())
+        lengths.append(np.full(len(block), block.shape[1], dtype=np.int64))
+        block_start = block_end
+    data = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.uint8)
+    offsets = np.zeros(num_rows + 1, dtype=np.int64)
+    if lengths:
+        np.cumsum(np.concatenate(lengths), out=offsets[1:])
+
+    string_type = pa.large_string() if offsets[-1] >= 2 ** 31 else pa.string()
+    offsets = offsets if string_type == pa.large_string() else offsets.astype(np.int32)
+    array = pa.Array.from_buffers(string_type, num_rows, [None, pa.py_buffer(offsets), pa.py_buffer(data)])
+    return pd.array(array, dtype="str")
+
+
+def random_choice(rng, options, num_rows):
+    """Pick num_rows values uniformly from options, stored as a categorical column."""
+    codes = rng.integers(0, len(options), size=num_rows)
+    return pd.Categorical.from_codes(codes, categories=options)
+
+
+def random_uniform(rng, low, high, num_rows, decimals=2):
+    """Draw num_rows floats between low and high, rounded like the original generators."""
+    return np.round(rng.uniform(low, high, size=num_rows), decimals)
+
+
+def random_integers(rng, low, high, num_rows):
+    """Draw num_rows integers between low and high (both inclusive, like random.randint)."""
+    return rng.integers(low, high + 1, size=num_rows)
+
+
+def generate_employee_data(num_rows, rng=None, start=0):
+    """
+    Generate the employee dataset as a DataFrame with the same 9 columns as employee_data.csv.
+    start is the row offset of the first row, so IDs stay contiguous across chunks.
+    """
+    rng = rng if rng is not None else make_rng()
+    return pd.DataFrame({
+        "Employee_ID": sequential_ids("E", 1000 + start, num_rows),
+        "Name": sequential_ids("Employee_", start, num_rows),
+        "Age": random_integers(rng, 22, 60, num_rows),  # Random age between 22 and 60
+        "Department": random_choice(rng, DEPARTMENTS, num_rows),  # Randomly assigned department
+        "Salary": random_integers(rng, 40000, 120000, num_rows),  # Salary range
+        "Joining_Year": random_integers(rng, 2010, 2023, num_rows),  # Random joining year
+        "Performance_Score": random_uniform(rng, 1.0, 5.0, num_rows),  # Performance rating
+        "Years_in_Company": random_integers(rng, 1, 12, num_rows),  # Years at the company
+        "Remote_Work": rng.integers(0, 2, size=num_rows).astype(bool),  # Boolean for remote work status
+    })
+
+
+def generate_ocean_conditions_data(num_rows, rng=None, start=0):
+    """
+    Generate the ocean conditions dataset as a DataFrame with the same 7 columns as ocean_conditions_data.csv.
+    start is the row offset of the first row, so IDs stay contiguous across chunks.
+    """
+    rng = rng if rng is not None else make_rng()
+    return pd.DataFrame({
+        "Sample_ID": sequential_ids("S", 1 + start, num_rows),
+        "Temperature_C": random_uniform(rng, 5.0, 30.0, num_rows),  # Random temperature between 5°C and 30°C
+        "Salinity_PPT": random_uniform(rng, 30.0, 40.0, num_rows),  # Random salinity in PPT
+        "Wave_Height_M": random_uniform(rng, 0.1, 5.0, num_rows),  # Random wave height between 0.1m and 5.0m
+        "Current_Speed_KPH": random_uniform(rng, 0.5, 10.0, num_rows),  # Random current speed between 0.5 and 10 KPH
+        "Depth_M": random_integers(rng, 1, 100, num_rows),  # Random depth between 1m and 100m
+        "Weather_Condition": random_choice(rng, WEATHER_CONDITIONS, num_rows),  # Randomly assigned weather conditions
+    })
+
+
+def generate_retail_sales_data(num_rows, rng=None, start=0, end_date=None):
+    """
+    Generate the retail sales dataset as a DataFrame with the same 12 columns as retail_sales_data.csv.
+    start is the row offset of the first row, so IDs stay contiguous across chunks.
+    Order dates fall within the 30 days before end_date (today if not given).
+    """
+    rng = rng if rng is not None else make_rng()
+    end_date = np.datetime64(end_date if end_date is not None else "today", "D")
+
+    quantity_sold = random_integers(rng, 1, 10, num_rows)  # Random quantity sold
+    sale_price = random_uniform(rng, 10.0, 100.0, num_rows)  # Sale price per item
+    days_ago = random_integers(rng, 0, 30, num_rows).astype("timedelta64[D]")
+
+    return pd.DataFrame({
+        "Order_ID": sequential_ids("O", 1 + start, num_rows),
+        "Product_Name": random_choice(rng, PRODUCT_NAMES, num_rows),  # Randomly assigned product names
+        "Quantity_Sold": quantity_sold,
+        "Sale_Price": sale_price,
+        "Total_Sales": np.round(quantity_sold * sale_price, 2),  # Total sales for the transaction
+        "Order_Date": (end_date - days_ago).astype("datetime64[s]"),  # Random order date within the last 30 days
+        "Customer_Age": random_integers(rng, 18, 65, num_rows),  # Random customer age
+        "Customer_Gender": random_choice(rng, CUSTOMER_GENDERS, num_rows),  # Randomly assigned customer gender
+        "Payment_Method": random_choice(rng, PAYMENT_METHODS, num_rows),  # Random payment methods
+        "Shipping_Cost": random_uniform(rng, 5.0, 25.0, num_rows),  # Random shipping cost
+        "Order_Status": random_choice(rng, ORDER_STATUSES, num_rows),  # Random order statuses
+        "Product_Category": random_choice(rng, PRODUCT_CATEGORIES, num_rows),  # Random product categories
+    })
+
+
+def parallel_workers(workers, num_chunks, num_rows):
+    """
+    Return the number of worker processes worth using: 1 below PARALLEL_MIN_ROWS rows, and
+    never more than there are chunks or CPU cores (extra processes only add overhead).
+    """
+    if num_rows < PARALLEL_MIN_ROWS:
+        return 1
+    return max(1, min(workers, num_chunks, os.cpu_count() or 1))
+
+
+def chunk_bounds(num_rows, chunk_size):
+    """Return the (start, rows) pairs that split num_rows into chunks of at most chunk_size rows."""
+    if chunk_size is None or chunk_size <= 0:
+        chunk_size = max(num_rows, 1)
+    # Always yield at least one (possibly empty) chunk so the output gets its header
+    return [(start, min(chunk_size, num_rows - start)) for start in range(0, max(num_rows, 1), chunk_size)]
+
+
+def shard_file_name(file_name, shard_index):
+    """Return the file name used for one shard, e.g. data.csv -> data.part-00003.csv."""
+    root, ext = os.path.splitext(file_name)
+    return f"{root}.part-{shard_index:05d}{ext}"
+
+
+def _generate_shard(generator, seed, shard_index, start, rows, generator_kwargs):
+    """Generate one shard from its own derived seed (worker entry point)."""
+    return generator(rows, shard_rng(seed, shard_index), start=start, **generator_kwargs)
+
+
+def _write_shard(generator, seed, shard_index, start, rows, file_name, generator_kwargs, compression, row_group_size):
+    """Generate one shard and write it to its own file (worker entry point)."""
+    df = _generate_shard(generator, seed, shard_index, start, rows, generator_kwargs)
+    with ChunkWriter(file_name, compression, row_group_size) as writer:
+        writer.write(df)
+    return list(df.columns)
+
+
+def _merge_csv_shards(shard_files, file_name):
+    """Concatenate the CSV shard files in order into file_name, keeping only the first header."""
+    with open(file_name, "wb") as merged:
+        for index, shard_file in enumerate(shard_files):
+            with open(shard_file, "rb") as shard:
+                if index > 0:
+                    shard.readline()  # Skip the repeated header line
+                shutil.copyfileobj(shard, merged)
+            os.remove(shard_file)
+
+
+def _ordered_results(executor, function, tasks, window):
+    """Run tasks in the executor and yield their results in order, keeping at most window in flight."""
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(function, *task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_dataset(generator, num_rows, file_name, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                  workers=1, sharded=False, compression=None, row_group_size=None, **generator_kwargs):
+    """
+    Generate num_rows rows with generator and write them to file_name chunk by chunk.
+
+    The output format (CSV, Parquet or Feather) follows the extension of file_name;
+    compression and row_group_size apply to the columnar formats.
+    Each chunk of at most chunk_size rows is a shard with its own seed derived from seed and
+    the shard's index, so the output depends only on seed and chunk_size, never on the number
+    of workers. The same seed with a different chunk_size gives a different dataset.
+    With workers=1 chunks are generated and appended one after another, so peak memory
+    depends on chunk_size rather than num_rows. With workers > 1 (capped by parallel_workers)
+    shards are generated in a process pool. sharded=True keeps one file per shard instead of
+    a single merged file.
+    Returns the list of column names and the list of files written.
+    """
+    seed = resolve_seed(seed)
+    bounds = chunk_bounds(num_rows, chunk_size)
+    workers = parallel_workers(workers, len(bounds), num_rows)
+
+    if sharded or (workers > 1 and detect_format(file_name) == "csv"):
+        # Every shard is written to its own file by the worker that generated it
+        shard_files = [shard_file_name(file_name, index) for index in range(len(bounds))]
+        tasks = [
+            (generator, seed, index, start, rows, shard_files[index], generator_kwargs, compression, row_group_size)
+            for index, (start, rows) in enumerate(bounds)
+        ]
+        if workers <= 1:
+            results = [_write_shard(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_write_shard, *zip(*tasks)))
+        if sharded:
+            return results[0], shard_files
+        # CSV shards can be merged by concatenating their bytes
+        _merge_csv_shards(shard_files, file_name)
+        return results[0], [file_name]
+
+    # Chunks are written in order by this process; workers only generate them
+    tasks = [(generator, seed, index, start, rows, generator_kwargs) for index, (start, rows) in enumerate(bounds)]
+    with ChunkWriter(file_name, compression, row_group_size) as writer:
+        if workers <= 1:
+            for task in tasks:
+                df = _generate_shard(*task)
+                writer.write(df)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for df in _ordered_results(executor, _generate_shard, tasks, 2 * workers):
+                    writer.write(df)
+    return list(df.columns), [file_name]
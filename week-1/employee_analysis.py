@@ -1,85 +1,155 @@
+import io
+import sys
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def load_employee_data(file_path):
-    """Load the dataset from the specified CSV file."""
+from analysis_runner import main, report_aggregates
+from data_io import DEFAULT_READ_CHUNK_SIZE, SCHEMAS, load_dataset, read_dataset_chunks
+from plot_renderer import FigureSpec, bin_points, draw_points
+from streaming_stats import StreamingStats
+
+# Columns used by analyze_data (identifier columns are not needed for the analysis)
+ANALYSIS_COLUMNS = [
+    "Age", "Department", "Salary", "Joining_Year", "Performance_Score", "Years_in_Company", "Remote_Work",
+]
+
+# Dataset name in data_io.SCHEMAS and in messages
+DATASET = "employee"
+LABEL = "Employee"
+
+# File analyzed when no path is given
+DEFAULT_FILE_PATH = "Data/employee_data.csv"
+
+# Parts of the report that can be selected, in report order ("charts" plots the results)
+SECTIONS = ["info", "summary", "missing", "avg_salary", "charts"]
+
+# Heading printed above each printed section
+SECTION_TITLES = {
+    "info": "Dataset Information",
+    "summary": "Summary Statistics",
+    "missing": "Missing Values",
+    "avg_salary": "Average Salary by Department",
+}
+
+# Name and version of the cached results; bump the version when compute_aggregates changes
+CACHE_NAMESPACE = "employee_analysis:2"
+
+def load_employee_data(file_path, columns=None):
+    """
+    Load the dataset from the specified CSV, Parquet or Feather file (detected from the extension),
+    typed from its schema in data_io.SCHEMAS.
+    Only the given columns are read when columns is not None.
+    """
+    return load_dataset("employee", file_path, columns, "Data loaded successfully.")
+
+def compute_aggregates(df):
+    """Compute every table and chart input reported by analyze_data from the loaded dataset."""
+    info = io.StringIO()
+    df.info(buf=info)
+    salaries = df['Salary'].dropna()
+    return {
+        "info": info.getvalue(),
+        "summary": df.describe(include='all'),  # Include all columns in summary statistics
+        "missing": df.isnull().sum(),
+        # Group by department and calculate average salary
+        "avg_salary": df.groupby('Department', observed=True)['Salary'].mean().reset_index(),
+        "salary_histogram": np.histogram(salaries, bins=20),
+        # Large datasets are binned so the scatter plot costs the same at any size
+        "age_salary": bin_points(df['Age'].to_numpy(), df['Salary'].to_numpy()),
+        "employee_count": df['Department'].value_counts(),
+    }
+
+def compute_aggregates_streaming(file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Compute the aggregates of an employee file too large for memory in one pass over chunks
+    of chunk_size rows. Summary statistics and missing values come from StreamingStats; the
+    department averages and counts are folded from per-chunk sums. The salary histogram and
+    the salary vs age scatter plot need the individual rows and are left out.
+    Returns None (after printing the reason) if the file cannot be read.
+    """
+    stats = StreamingStats()
+    salary_totals = pd.DataFrame(columns=['sum', 'count'], dtype='float64')
     try:
-        df = pd.read_csv(file_path)
-        print("Data loaded successfully.")
-        return df
+        for chunk in read_dataset_chunks(file_path, ANALYSIS_COLUMNS, SCHEMAS["employee"], chunk_size):
+            stats.update(chunk)
+            chunk_totals = chunk.groupby(chunk['Department'].astype(str))['Salary'].agg(['sum', 'count'])
+            salary_totals = salary_totals.add(chunk_totals, fill_value=0)
     except FileNotFoundError:
         print(f"Error: The file {file_path} does not exist.")
         return None
-    except pd.errors.EmptyDataError:
-        print("Error: The file is empty.")
-        return None
-    except pd.errors.ParserError:
-        print("Error: The file could not be parsed.")
+    except (ValueError, ImportError) as error:
+        print(f"Error: {error}")
         return None
+    print(f"Employee data processed in chunks ({stats.num_rows} rows).")
+
+    salary_totals = salary_totals.sort_index()
+    avg_salary = salary_totals['sum'] / salary_totals['count']
+    return {
+        "summary": stats.describe(),
+        "missing": stats.missing_values(),
+        "avg_salary": avg_salary.rename('Salary').rename_axis('Department').reset_index(),
+        "employee_count": salary_totals['count'].astype('int64').sort_values(ascending=False),
+    }
+
+def draw_average_salary(fig, avg_salary):
+    """Draw a bar plot for average salary by department."""
+    ax = fig.add_subplot()
+    ax.bar(avg_salary['Department'], avg_salary['Salary'], color='skyblue')
+    ax.set_title('Average Salary by Department')
+    ax.set_xlabel('Department')
+    ax.set_ylabel('Average Salary')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+def draw_salary_distribution(fig, salary_histogram):
+    """Draw the salary distribution from precomputed histogram counts and bin edges."""
+    counts, edges = salary_histogram
+    ax = fig.add_subplot()
+    ax.hist(edges[:-1], bins=edges, weights=counts, color='lightgreen', alpha=0.7)
+    ax.set_title('Salary Distribution of Employees')
+    ax.set_xlabel('Salary')
+    ax.set_ylabel('Frequency')
+    ax.grid(axis='y')
+
+def draw_salary_vs_age(fig, age_salary):
+    """Draw the relationship between Age and Salary as a scatter plot (a density image for large datasets)."""
+    ax = fig.add_subplot()
+    draw_points(fig, ax, age_salary, color='purple', alpha=0.6)
+    ax.set_title('Salary vs Age of Employees')
+    ax.set_xlabel('Age')
+    ax.set_ylabel('Salary')
+    ax.grid()
+    fig.tight_layout()
+
+def draw_employee_count(fig, employee_count):
+    """Draw a bar plot for the number of employees in each department."""
+    ax = fig.add_subplot()
+    ax.bar(employee_count.index, employee_count.values, color='orange', alpha=0.7)
+    ax.set_title('Number of Employees by Department')
+    ax.set_xlabel('Department')
+    ax.set_ylabel('Number of Employees')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+def figure_specs(aggregates):
+    """Return the charts for the given aggregates, in report order."""
+    specs = [FigureSpec('average_salary_by_department', draw_average_salary, aggregates["avg_salary"], (10, 5))]
+    # Additional Analysis: Salary Distribution and the relationship between Age and Salary
+    if "salary_histogram" in aggregates:
+        specs.append(FigureSpec('salary_distribution', draw_salary_distribution,
+                                aggregates["salary_histogram"], (10, 5)))
+    if "age_salary" in aggregates:
+        specs.append(FigureSpec('salary_vs_age', draw_salary_vs_age, aggregates["age_salary"], (10, 5)))
+    # Analyze employee count by department
+    specs.append(FigureSpec('employees_by_department', draw_employee_count, aggregates["employee_count"], (10, 5)))
+    return specs
 
 def analyze_data(df):
     """Analyze the employee dataset to provide insights."""
     if df is None:
         return
-    
-    # Display basic information about the dataset
-    print("\n--- Dataset Information ---")
-    print(df.info())
-    
-    print("\n--- Summary Statistics ---")
-    print(df.describe(include='all'))  # Include all columns in summary statistics
-
-    # Check for missing values
-    print("\n--- Missing Values ---")
-    print(df.isnull().sum())
-
-    # Group by department and calculate average salary
-    avg_salary = df.groupby('Department')['Salary'].mean().reset_index()
-    print("\n--- Average Salary by Department ---")
-    print(avg_salary)
-
-    # Create a bar plot for average salary by department
-    plt.figure(figsize=(10, 5))
-    plt.bar(avg_salary['Department'], avg_salary['Salary'], color='skyblue')
-    plt.title('Average Salary by Department')
-    plt.xlabel('Department')
-    plt.ylabel('Average Salary')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
-
-    # Additional Analysis: Salary Distribution
-    plt.figure(figsize=(10, 5))
-    plt.hist(df['Salary'], bins=20, color='lightgreen', alpha=0.7)
-    plt.title('Salary Distribution of Employees')
-    plt.xlabel('Salary')
-    plt.ylabel('Frequency')
-    plt.grid(axis='y')
-    plt.show()
-
-    # Analyze the relationship between Age and Salary
-    plt.figure(figsize=(10, 5))
-    plt.scatter(df['Age'], df['Salary'], color='purple', alpha=0.6)
-    plt.title('Salary vs Age of Employees')
-    plt.xlabel('Age')
-    plt.ylabel('Salary')
-    plt.grid()
-    plt.tight_layout()
-    plt.show()
-
-    # Analyze employee count by department
-    employee_count = df['Department'].value_counts()
-    plt.figure(figsize=(10, 5))
-    plt.bar(employee_count.index, employee_count.values, color='orange', alpha=0.7)
-    plt.title('Number of Employees by Department')
-    plt.xlabel('Department')
-    plt.ylabel('Number of Employees')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+    report_aggregates(sys.modules[__name__], compute_aggregates(df))
 
 if __name__ == "__main__":
-    # Load the employee data from the CSV file
-    FILE_PATH = 'Data/employee_data.csv'
-    employee_data = load_employee_data(FILE_PATH)
-    analyze_data(employee_data)
+    main(sys.modules[__name__])
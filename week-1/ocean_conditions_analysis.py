@@ -1,75 +1,193 @@
+import io
+import sys
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def load_ocean_conditions_data(file_path):
-    """Load the ocean conditions dataset from the specified CSV file."""
+from analysis_runner import main, report_aggregates
+from data_io import DEFAULT_READ_CHUNK_SIZE, SCHEMAS, load_dataset, read_dataset_chunks
+from partitions import map_partitions, select_partitions
+from plot_renderer import FigureSpec
+from streaming_stats import StreamingStats
+
+# Columns used by analyze_data (identifier columns are not needed for the analysis)
+ANALYSIS_COLUMNS = [
+    "Temperature_C", "Salinity_PPT", "Wave_Height_M", "Current_Speed_KPH", "Depth_M", "Weather_Condition",
+]
+
+# Dataset name in data_io.SCHEMAS and in messages
+DATASET = "ocean_conditions"
+LABEL = "Ocean conditions"
+
+# File analyzed when no path is given
+DEFAULT_FILE_PATH = "Data/ocean_conditions_data.csv"
+
+# Parts of the report that can be selected, in report order ("charts" plots the results)
+SECTIONS = ["info", "summary", "correlation", "avg_temp", "charts"]
+
+# Heading printed above each printed section
+SECTION_TITLES = {
+    "info": "Dataset Information",
+    "summary": "Summary Statistics",
+    "correlation": "Correlation Matrix",
+    "avg_temp": "Average Temperature by Weather Condition",
+}
+
+# Directories and globs of partition files are read by compute_aggregates_partitioned
+PARTITIONED = True
+
+# Name and version of the cached results; bump the version when compute_aggregates changes
+CACHE_NAMESPACE = "ocean_conditions_analysis:1"
+
+def load_ocean_conditions_data(file_path, columns=None):
+    """
+    Load the ocean conditions dataset from the specified CSV, Parquet or Feather file
+    (detected from the extension), typed from its schema in data_io.SCHEMAS.
+    Only the given columns are read when columns is not None.
+    """
+    return load_dataset("ocean_conditions", file_path, columns, "Ocean conditions data loaded successfully.")
+
+def compute_aggregates(df):
+    """Compute every table and chart input reported by analyze_data from the loaded dataset."""
+    info = io.StringIO()
+    df.info(buf=info)
+    return {
+        "info": info.getvalue(),
+        "summary": df.describe(),
+        "temperature_histogram": np.histogram(df['Temperature_C'].dropna(), bins=10),
+        # Correlations between the numeric columns (Weather_Condition is not numeric)
+        "correlation": df.corr(numeric_only=True),
+        # Additional Analysis: Average temperature by weather condition
+        "avg_temp": df.groupby('Weather_Condition', observed=True)['Temperature_C'].mean().reset_index(),
+    }
+
+def fold_temperatures(chunk, totals):
+    """Fold one chunk into running Temperature_C sums and counts per weather condition."""
+    chunk_totals = (chunk.groupby(chunk['Weather_Condition'].astype(str))['Temperature_C']
+                    .agg(['sum', 'count']).astype('float64'))
+    return totals.add(chunk_totals, fill_value=0)
+
+def new_temperature_totals():
+    """Return empty running totals for fold_temperatures."""
+    return pd.DataFrame(columns=['sum', 'count'], dtype='float64')
+
+def streaming_results(stats, temperature_totals):
+    """Turn StreamingStats and running temperature totals into the aggregates reported by analyze_data."""
+    temperature_totals = temperature_totals.sort_index()
+    avg_temp = temperature_totals['sum'] / temperature_totals['count']
+    return {
+        "summary": stats.describe()[stats.numeric_columns or []].dropna(how='all'),
+        "correlation": stats.corr(),
+        "avg_temp": avg_temp.rename('Temperature_C').rename_axis('Weather_Condition').reset_index(),
+    }
+
+def compute_aggregates_streaming(file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Compute the aggregates of an ocean conditions file too large for memory in one pass over
+    chunks of chunk_size rows. Summary statistics and the correlation matrix come from
+    StreamingStats; the average temperature by weather condition is folded from per-chunk
+    sums. The temperature histogram needs the individual rows and is left out.
+    Returns None (after printing the reason) if the file cannot be read.
+    """
+    stats = StreamingStats()
+    temperature_totals = new_temperature_totals()
     try:
-        df = pd.read_csv(file_path)
-        print("Ocean conditions data loaded successfully.")
-        return df
+        for chunk in read_dataset_chunks(file_path, ANALYSIS_COLUMNS, SCHEMAS["ocean_conditions"], chunk_size):
+            stats.update(chunk)
+            temperature_totals = fold_temperatures(chunk, temperature_totals)
     except FileNotFoundError:
         print(f"Error: The file {file_path} does not exist.")
         return None
-    except pd.errors.EmptyDataError:
-        print("Error: The file is empty.")
+    except (ValueError, ImportError) as error:
+        print(f"Error: {error}")
         return None
-    except pd.errors.ParserError:
-        print("Error: The file could not be parsed.")
+    print(f"Ocean conditions data processed in chunks ({stats.num_rows} rows).")
+    return streaming_results(stats, temperature_totals)
+
+def partition_aggregates(file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """Return the StreamingStats and temperature totals of one partition file."""
+    stats, temperature_totals = StreamingStats(), new_temperature_totals()
+    for chunk in read_dataset_chunks(file_path, ANALYSIS_COLUMNS, SCHEMAS["ocean_conditions"], chunk_size):
+        stats.update(chunk)
+        temperature_totals = fold_temperatures(chunk, temperature_totals)
+    return stats, temperature_totals
+
+def compute_aggregates_partitioned(source, workers=1, start_date=None, end_date=None):
+    """
+    Compute the aggregates of an ocean conditions dataset split into partition files: a
+    directory, a glob pattern or a single file. The samples carry no date, so start_date and
+    end_date (inclusive) select whole partitions by the date in their paths, and every row of
+    a selected partition is counted: the partitions must be date-aligned (one date per file,
+    e.g. ocean_conditions_2024-03-01.csv) for the range to be exact, and undated partitions
+    are always read. The other partitions, and files without the ocean conditions columns,
+    are skipped unread. Partitions are read in a pool of workers processes and their partial
+    statistics merged in partition order.
+    Returns None (after printing the reason) if the partitions cannot be read.
+    """
+    try:
+        selected, num_files = select_partitions(source, ANALYSIS_COLUMNS, start_date, end_date)
+        partials = map_partitions(partition_aggregates, selected, workers)
+    except (FileNotFoundError, ValueError, ImportError) as error:
+        print(f"Error: {error}")
         return None
 
+    stats, temperature_totals = StreamingStats(), new_temperature_totals()
+    for partition_stats, partition_totals in partials:
+        stats.merge(partition_stats)
+        temperature_totals = temperature_totals.add(partition_totals, fill_value=0)
+    print(f"Ocean conditions data processed in {len(selected)} of {num_files} file(s) "
+          f"({stats.num_rows} rows).")
+    return streaming_results(stats, temperature_totals)
+
+def draw_temperature_distribution(fig, temperature_histogram):
+    """Draw the temperature distribution from precomputed histogram counts and bin edges."""
+    counts, edges = temperature_histogram
+    ax = fig.add_subplot()
+    ax.hist(edges[:-1], bins=edges, weights=counts, color='lightgreen', alpha=0.7)
+    ax.set_title('Temperature Distribution in Ocean Conditions')
+    ax.set_xlabel('Temperature (°C)')
+    ax.set_ylabel('Frequency')
+    ax.grid(axis='y')
+
+def draw_correlation_heatmap(fig, correlation_matrix):
+    """Draw the correlation matrix as a heatmap."""
+    ax = fig.add_subplot()
+    image = ax.imshow(correlation_matrix, cmap='coolwarm', interpolation='nearest')
+    ax.set_title('Correlation Heatmap')
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(correlation_matrix)))
+    ax.set_xticklabels(correlation_matrix.columns, rotation=45)
+    ax.set_yticks(range(len(correlation_matrix)))
+    ax.set_yticklabels(correlation_matrix.columns)
+    fig.tight_layout()
+
+def draw_average_temperature(fig, avg_temp_by_weather):
+    """Draw a bar plot for average temperature by weather condition."""
+    ax = fig.add_subplot()
+    ax.bar(avg_temp_by_weather['Weather_Condition'], avg_temp_by_weather['Temperature_C'], color='skyblue')
+    ax.set_title('Average Temperature by Weather Condition')
+    ax.set_xlabel('Weather Condition')
+    ax.set_ylabel('Average Temperature (°C)')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+def figure_specs(aggregates):
+    """Return the charts for the given aggregates, in report order."""
+    specs = []
+    # Visualize temperature distribution
+    if "temperature_histogram" in aggregates:
+        specs.append(FigureSpec('temperature_distribution', draw_temperature_distribution,
+                                aggregates["temperature_histogram"], (10, 5)))
+    specs.append(FigureSpec('correlation_heatmap', draw_correlation_heatmap, aggregates["correlation"], (8, 6)))
+    specs.append(FigureSpec('average_temperature_by_weather', draw_average_temperature,
+                            aggregates["avg_temp"], (10, 5)))
+    return specs
+
 def analyze_data(df):
     """Analyze the ocean conditions dataset to provide insights."""
     if df is None:
         return
-    
-    # Display basic information about the dataset
-    print("\n--- Dataset Information ---")
-    print(df.info())
-    
-    print("\n--- Summary Statistics ---")
-    print(df.describe())
-
-    # Visualize temperature distribution
-    plt.figure(figsize=(10, 5))
-    plt.hist(df['Temperature_C'], bins=10, color='lightgreen', alpha=0.7)
-    plt.title('Temperature Distribution in Ocean Conditions')
-    plt.xlabel('Temperature (°C)')
-    plt.ylabel('Frequency')
-    plt.grid(axis='y')
-    plt.show()
-
-    # Analyze and visualize correlations
-    correlation_matrix = df.corr()
-    print("\n--- Correlation Matrix ---")
-    print(correlation_matrix)
-
-    # Visualize correlation heatmap
-    plt.figure(figsize=(8, 6))
-    plt.imshow(correlation_matrix, cmap='coolwarm', interpolation='nearest')
-    plt.title('Correlation Heatmap')
-    plt.colorbar()
-    plt.xticks(range(len(correlation_matrix)), correlation_matrix.columns, rotation=45)
-    plt.yticks(range(len(correlation_matrix)), correlation_matrix.columns)
-    plt.tight_layout()
-    plt.show()
-
-    # Additional Analysis: Average temperature by weather condition
-    avg_temp_by_weather = df.groupby('Weather_Condition')['Temperature_C'].mean().reset_index()
-    print("\n--- Average Temperature by Weather Condition ---")
-    print(avg_temp_by_weather)
-
-    # Create a bar plot for average temperature by weather condition
-    plt.figure(figsize=(10, 5))
-    plt.bar(avg_temp_by_weather['Weather_Condition'], avg_temp_by_weather['Temperature_C'], color='skyblue')
-    plt.title('Average Temperature by Weather Condition')
-    plt.xlabel('Weather Condition')
-    plt.ylabel('Average Temperature (°C)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
+    report_aggregates(sys.modules[__name__], compute_aggregates(df))
 
 if __name__ == "__main__":
-    # Load the ocean conditions data from the CSV file
-    FILE_PATH = 'Data/ocean_conditions_data.csv'
-    ocean_conditions_data = load_ocean_conditions_data(FILE_PATH)
-    analyze_data(ocean_conditions_data)
+    main(sys.modules[__name__])
@@ -0,0 +1,121 @@
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+from data_io import FILE_FORMATS, read_column_names
+
+# Title: Partitioned Datasets
+# Purpose: Find the files of a dataset that arrives split into partitions (a directory of files
+#          or a glob pattern, e.g. one retail file per order date), prune the partitions whose
+#          date falls outside a requested range from their paths alone, so those files are never
+#          opened, and compute per-partition partial results in a process pool. Pruning works on
+#          whole files, so a date range only selects rows exactly when every partition holds
+#          one date (or the range follows the partition boundaries); datasets whose rows carry
+#          a date can filter the rows of the kept partitions with rows_in_date_range.
+
+# A date in a partition's path, e.g. retail_sales_2024-03-01.csv or Order_Date=2024-03-01/part-0.csv
+PARTITION_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+def _is_dataset_file(path):
+    return os.path.splitext(path.rstrip("/\\"))[1].lower() in FILE_FORMATS
+
+
+def is_partitioned(source):
+    """Return whether source names several partitions: a glob pattern or a directory of data files."""
+    if glob.has_magic(source):
+        return True
+    # A .npcol store is a directory too, but it holds a single dataset
+    return os.path.isdir(source) and not _is_dataset_file(source)
+
+
+def find_partitions(source):
+    """
+    Return the sorted paths of the data files matched by the glob pattern source, or found
+    anywhere under the directory source. Raises FileNotFoundError when there are none.
+    """
+    if glob.has_magic(source):
+        paths = [path for path in glob.glob(source, recursive=True) if _is_dataset_file(path)]
+    else:
+        paths = []
+        for directory, subdirectories, files in os.walk(source):
+            # .npcol stores are partitions themselves; do not descend into them
+            stores = [name for name in subdirectories if _is_dataset_file(name)]
+            subdirectories[:] = [name for name in subdirectories if name not in stores]
+            paths += [os.path.join(directory, name) for name in files + stores if _is_dataset_file(name)]
+    if not paths:
+        raise FileNotFoundError(f"No data files match {source}.")
+    return sorted(paths)
+
+
+def partition_date(path):
+    """Return the date in a partition's path (the last one, if several), or None if it has none."""
+    for match in reversed(PARTITION_DATE.findall(path)):
+        try:
+            return date(*map(int, match))
+        except ValueError:
+            continue
+    return None
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def prune_partitions(paths, start_date=None, end_date=None):
+    """
+    Return the paths whose partition date lies between start_date and end_date (inclusive,
+    dates or ISO strings; None leaves that side open). Paths without a date are kept, since
+    their rows may fall in the range.
+    """
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    kept = []
+    for path in paths:
+        day = partition_date(path)
+        if day is None or ((start_date is None or day >= start_date) and (end_date is None or day <= end_date)):
+            kept.append(path)
+    return kept
+
+
+def select_partitions(source, columns, start_date=None, end_date=None):
+    """
+    Return the partitions of source (see find_partitions; any other source is a single
+    partition) dated between start_date and end_date that have all of columns, and the number
+    of data files found. Files of other datasets in the same directory are left out, unread.
+    Raises FileNotFoundError when no partition is dated in the range and ValueError when none
+    of those has the columns.
+    """
+    paths = find_partitions(source) if is_partitioned(source) else [source]
+    selected = prune_partitions(paths, start_date, end_date)
+    if not selected:
+        raise FileNotFoundError(f"No partitions of {source} fall in the requested date range.")
+    selected = [path for path in selected if set(columns) <= set(read_column_names(path))]
+    if not selected:
+        raise ValueError(f"No data files in {source} have the columns {', '.join(columns)}.")
+    return selected, len(paths)
+
+
+def rows_in_date_range(df, column, start_date=None, end_date=None):
+    """Return the rows of df whose date column falls between start_date and end_date (inclusive)."""
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    keep = pd.Series(True, index=df.index)
+    if start_date is not None:
+        keep &= df[column] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        keep &= df[column] < pd.Timestamp(end_date + timedelta(days=1))
+    return df[keep]
+
+
+def map_partitions(function, paths, workers=1):
+    """
+    Return [function(path) for path in paths], computed in a pool of workers processes when
+    workers > 1. function must be picklable (a module-level function or a partial of one).
+    """
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            return list(executor.map(function, paths))
+    return [function(path) for path in paths]
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Title: Batch Plot Renderer
+# Purpose: Render the analysis charts either interactively (plt.show) or headless with the Agg
+#          backend straight to PNG/SVG files, reusing figure objects, skipping charts whose
+#          inputs have not changed since the last render, and optionally drawing them in a
+#          process pool. Large point clouds are binned before plotting so the cost of drawing
+#          a chart does not grow with the number of rows.
+
+# One chart: its file name (without extension), a function draw(fig, data) that draws it on a
+# matplotlib Figure, the data passed to that function and the figure size in inches.
+FigureSpec = namedtuple("FigureSpec", ["name", "draw", "data", "figsize"])
+
+# Point counts per cell of a 2D histogram, with the bin edges along each axis
+PointDensity = namedtuple("PointDensity", ["counts", "x_edges", "y_edges"])
+
+# Up to this many points are drawn individually; larger clouds are drawn as a density image
+SCATTER_MAX_POINTS = 10_000
+
+# Bins along each axis of a density image
+DENSITY_BINS = 100
+
+# Formats the renderer writes and the file recording what each output was rendered from
+OUTPUT_FORMATS = ["png", "svg"]
+MANIFEST_NAME = "render_manifest.json"
+
+# Figures kept per size in each process, so repeated renders reuse them instead of creating new ones
+_figures = {}
+
+
+def _reusable_figure(figsize):
+    """Return a cleared Agg figure of the given size, created on first use."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = _figures.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _figures[figsize] = fig
+    else:
+        fig.clf()
+    return fig
+
+
+def bin_edges(values, bins=DENSITY_BINS):
+    """
+    Return histogram bin edges spanning values. Integer data with fewer distinct values
+    than bins gets one bin per integer, so no bin is left empty by rounding.
+    """
+    low, high = (values.min(), values.max()) if len(values) else (0, 1)
+    if np.issubdtype(values.dtype, np.integer) and high - low + 1 <= bins:
+        return np.arange(low, high + 2) - 0.5
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def bin_points(x, y, bins=DENSITY_BINS, max_points=SCATTER_MAX_POINTS):
+    """
+    Prepare the points (x, y) for a scatter plot. Pairs with a missing value are dropped;
+    up to max_points points are returned as they are, larger clouds are counted into a
+    PointDensity grid of at most bins x bins cells, like numpy.histogram2d.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    present = ~(np.isnan(x.astype(np.float64)) | np.isnan(y.astype(np.float64)))
+    x, y = x[present], y[present]
+    if len(x) <= max_points:
+        return x, y
+    x_edges, y_edges = bin_edges(x, bins), bin_edges(y, bins)
+    # The edges are evenly spaced, so bin numbers are computed directly and counted with
+    # bincount, which gives the same grid as numpy.histogram2d several times faster
+    cells = _bin_indices(x, x_edges) * (len(y_edges) - 1) + _bin_indices(y, y_edges)
+    counts = np.bincount(cells, minlength=(len(x_edges) - 1) * (len(y_edges) - 1))
+    return PointDensity(counts.reshape(len(x_edges) - 1, len(y_edges) - 1).astype(np.float64), x_edges, y_edges)
+
+
+def _bin_indices(values, edges):
+    """Return the bin number of each value for evenly spaced edges (the last bin includes its right edge)."""
+    width = edges[1] - edges[0]
+    indices = ((values - edges[0]) / width).astype(np.intp)
+    return np.clip(indices, 0, len(edges) - 2)
+
+
+def draw_points(fig, ax, points, **scatter_kwargs):
+    """Draw points from bin_points: a scatter plot, or a density image with a colour bar."""
+    if not isinstance(points, PointDensity):
+        x, y = points
+        ax.scatter(x, y, **scatter_kwargs)
+        return
+    # Empty cells are masked so they show the background instead of the lowest colour
+    counts = np.ma.masked_equal(points.counts.T, 0)
+    mesh = ax.pcolormesh(points.x_edges, points.y_edges, counts, cmap="viridis", rasterized=True)
+    fig.colorbar(mesh, ax=ax, label="Points per bin")
+
+
+def figure_fingerprint(spec, fmt):
+    """Return a hash of everything that determines the rendered output of spec."""
+    inputs = (spec.name, spec.draw.__module__, spec.draw.__qualname__, spec.data, spec.figsize, fmt)
+    return hashlib.blake2b(pickle.dumps(inputs, protocol=4), digest_size=20).hexdigest()
+
+
+def _render_figure(spec, path, fmt):
+    """Draw spec on a reused figure and save it to path (worker entry point)."""
+    fig = _reusable_figure(spec.figsize)
+    spec.draw(fig, spec.data)
+    fig.savefig(path, format=fmt)
+    fig.clf()
+    return path
+
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def render_figures(specs, output_dir, fmt="png", workers=1):
+    """
+    Render every chart in specs to output_dir/<name>.<fmt> without a GUI.
+    Charts whose inputs are unchanged since the last render to the same file are skipped.
+    With workers > 1 the remaining charts are rendered in a process pool.
+    Returns the lists of rendered and skipped file paths.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}'; choose one of {', '.join(OUTPUT_FORMATS)}.")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _read_manifest(output_dir)
+
+    pending, skipped, fingerprints = [], [], {}
+    for spec in specs:
+        file_name = f"{spec.name}.{fmt}"
+        path = os.path.join(output_dir, file_name)
+        fingerprints[file_name] = figure_fingerprint(spec, fmt)
+        if manifest.get(file_name) == fingerprints[file_name] and os.path.exists(path):
+            skipped.append(path)
+        else:
+            pending.append((spec, path, fmt))
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            rendered = list(executor.map(_render_figure, *zip(*pending)))
+    else:
+        rendered = [_render_figure(*task) for task in pending]
+
+    manifest.update(fingerprints)
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return rendered, skipped
+
+
+def show_figures(specs):
+    """Draw each chart in a pyplot window and show it, one after another."""
+    import matplotlib.pyplot as plt
+
+    for spec in specs:
+        fig = plt.figure(figsize=spec.figsize)
+        spec.draw(fig, spec.data)
+        plt.show()
+
+
+def output_figures(specs, output_dir=None, fmt="png", workers=1):
+    """Show the charts interactively, or render them to output_dir when it is given."""
+    if output_dir is None:
+        show_figures(specs)
+        return
+    rendered, skipped = render_figures(specs, output_dir, fmt, workers)
+    print(f"\nRendered {len(rendered)} chart(s) to '{output_dir}' ({len(skipped)} unchanged, skipped).")
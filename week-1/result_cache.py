@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pickle
+
+# Title: Analysis Result Cache
+# Purpose: Keep the aggregate results of the analysis scripts on disk, keyed by a fingerprint of
+#          the input file (path, size, modification time and content hash), so reruns on an
+#          unchanged file can skip parsing and recomputing entirely.
+
+# Where cache entries are stored and how large the cache may grow before old entries are evicted
+DEFAULT_CACHE_DIR = ".analysis_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bytes read at a time when hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# File remembering the content hash of each input for its last seen size and mtime
+FINGERPRINT_INDEX = "fingerprints.pkl"
+
+
+def hash_file(file_path):
+    """Return the BLAKE2b hex digest of the file's contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of pickled results with a total size limit. Reading an entry marks it as
+    recently used; when the limit is exceeded the least recently used entries are removed.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(self, file_path):
+        """
+        Return (path, size, mtime, content hash) for file_path. The hash is only recomputed
+        when the size or modification time differs from the last time the file was seen.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        index_path = os.path.join(self.cache_dir, FINGERPRINT_INDEX)
+        index = self._read_pickle(index_path) or {}
+
+        size, mtime, content_hash = index.get(path, (None, None, None))
+        if (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+            content_hash = hash_file(path)
+            index[path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+            self._write_pickle(index_path, index)
+        return path, stat.st_size, stat.st_mtime_ns, content_hash
+
+    def key(self, file_path, namespace):
+        """Return the cache key for results named namespace computed from file_path."""
+        fingerprint = self.fingerprint(file_path)
+        return hashlib.blake2b(repr((namespace,) + fingerprint).encode(), digest_size=20).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """Return the cached value for key, or None if there is none."""
+        entry_path = self._entry_path(key)
+        value = self._read_pickle(entry_path)
+        if value is not None:
+            os.utime(entry_path)  # Mark as recently used
+        return value
+
+    def put(self, key, value):
+        """Store value under key, then evict least recently used entries beyond the size limit."""
+        self._write_pickle(self._entry_path(key), value)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl") and name != FINGERPRINT_INDEX:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    @staticmethod
+    def _read_pickle(path):
+        try:
+            with open(path, "rb") as file:
+                return pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    @staticmethod
+    def _write_pickle(path, value):
+        # Write to a temporary file first so a crash never leaves a truncated entry behind
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def cached_result(file_path, namespace, compute, cache=None):
+    """
+    Return the result of compute() for file_path, reusing the cached copy when the file has
+    not changed since it was stored. namespace names the kind of result (and its version).
+    Returns the result and whether it came from the cache.
+    """
+    cache = cache if cache is not None else ResultCache()
+    key = cache.key(file_path, namespace)
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+    result = compute()
+    if result is not None:
+        cache.put(key, result)
+    return result, False
@@ -1,70 +1,228 @@
+import io
+import sys
+from functools import partial
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-def load_retail_sales_data(file_path):
-    """Load the retail sales dataset from the specified CSV file."""
+from analysis_runner import main, report_aggregates
+from data_io import DEFAULT_READ_CHUNK_SIZE, SCHEMAS, load_dataset, read_dataset_chunks
+from partitions import map_partitions, rows_in_date_range, select_partitions
+from plot_renderer import FigureSpec
+from streaming_stats import StreamingStats
+
+# Columns used by analyze_data (identifier columns are not needed for the analysis)
+ANALYSIS_COLUMNS = [
+    "Product_Name", "Quantity_Sold", "Sale_Price", "Total_Sales", "Order_Date", "Customer_Age",
+    "Customer_Gender", "Payment_Method", "Shipping_Cost", "Order_Status", "Product_Category",
+]
+
+# Columns needed for the sales totals computed by aggregate_sales
+SALES_COLUMNS = ["Quantity_Sold", "Sale_Price", "Order_Date", "Product_Category"]
+
+# Dataset name in data_io.SCHEMAS and in messages
+DATASET = "retail_sales"
+LABEL = "Retail sales"
+
+# File analyzed when no path is given
+DEFAULT_FILE_PATH = "Data/retail_sales_data.csv"
+
+# Parts of the report that can be selected, in report order ("charts" plots the results)
+SECTIONS = ["info", "summary", "missing", "total_sales", "charts"]
+
+# Heading printed above each printed section, or the format of a section printed on one line
+SECTION_TITLES = {
+    "info": "Dataset Information",
+    "summary": "Summary Statistics",
+    "missing": "Missing Values",
+}
+SECTION_FORMATS = {"total_sales": "Total Sales: ${:.2f}"}
+
+# Directories and globs of partition files are read by compute_aggregates_partitioned
+PARTITIONED = True
+
+# Name and version of the cached results; bump the version when compute_aggregates changes
+CACHE_NAMESPACE = "retail_sales_analysis:1"
+
+def load_retail_sales_data(file_path, columns=None):
+    """
+    Load the retail sales dataset from the specified CSV, Parquet or Feather file
+    (detected from the extension), typed from its schema in data_io.SCHEMAS.
+    Only the given columns are read when columns is not None.
+    """
+    return load_dataset("retail_sales", file_path, columns, "Retail sales data loaded successfully.")
+
+def sales_in_cents(df):
+    """
+    Return Quantity_Sold * Sale_Price for each row as integer cents, so sums are exact in any order.
+    Sale_Price is rounded to whole cents first; the generated prices have two decimals, so this
+    only drops the float error the old float sum of the products accumulated.
+    """
+    quantity = df['Quantity_Sold'].to_numpy(dtype=np.int64)
+    price_cents = np.round(df['Sale_Price'].to_numpy(dtype=np.float64) * 100).astype(np.int64)
+    return pd.Series(quantity * price_cents, index=df.index)
+
+def new_sales_totals():
+    """Return empty running totals for aggregate_sales."""
+    return {
+        "total": 0,
+        "category": pd.Series(dtype="int64"),
+        "month": pd.Series(dtype="int64", index=pd.PeriodIndex([], freq="M")),
+    }
+
+def aggregate_sales(df, totals=None):
+    """
+    Fold one frame (or one chunk of a file) into running sales totals in integer cents:
+    the overall total, the total per product category and the total per order month.
+    """
+    totals = totals if totals is not None else new_sales_totals()
+    cents = sales_in_cents(df)
+    by_category = cents.groupby(df['Product_Category'].astype(str)).sum()
+    by_month = cents.groupby(pd.to_datetime(df['Order_Date']).dt.to_period("M")).sum()
+
+    totals["total"] += int(cents.sum())
+    totals["category"] = totals["category"].add(by_category, fill_value=0).astype("int64")
+    totals["month"] = totals["month"].add(by_month, fill_value=0).astype("int64")
+    return totals
+
+def merge_sales_totals(totals, other):
+    """Fold the running totals other (e.g. of another partition) into totals."""
+    totals["total"] += other["total"]
+    totals["category"] = totals["category"].add(other["category"], fill_value=0).astype("int64")
+    totals["month"] = totals["month"].add(other["month"], fill_value=0).astype("int64")
+    return totals
+
+def sales_results(totals):
+    """Convert running totals into the total sales, sales by category and monthly trend in dollars."""
+    total_sales = totals["total"] / 100
+    category_sales = (totals["category"].sort_index() / 100).rename_axis('Product_Category')
+    sales_trend = (totals["month"].sort_index() / 100).rename_axis('Order_Date')
+    return (
+        total_sales,
+        category_sales.rename('Total_Sales').reset_index(),
+        sales_trend.rename('Total_Sales').reset_index(),
+    )
+
+def draw_category_sales(fig, category_sales):
+    """Draw total sales by product category."""
+    ax = fig.add_subplot()
+    ax.bar(category_sales['Product_Category'], category_sales['Total_Sales'], color='coral')
+    ax.set_title('Total Sales by Product Category')
+    ax.set_xlabel('Product Category')
+    ax.set_ylabel('Total Sales ($)')
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+def draw_sales_trend(fig, sales_trend):
+    """Draw the monthly sales trend."""
+    ax = fig.add_subplot()
+    ax.plot(sales_trend['Order_Date'].dt.to_timestamp(), sales_trend['Total_Sales'], marker='o', color='blue')
+    ax.set_title('Monthly Sales Trend')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Total Sales ($)')
+    ax.grid()
+    fig.tight_layout()
+
+def figure_specs(aggregates):
+    """Return the charts for the given aggregates, in report order."""
+    return [
+        # Visualize total sales by product category
+        FigureSpec('sales_by_category', draw_category_sales, aggregates["category_sales"], (10, 5)),
+        # Additional Analysis: Sales Trends Over Time
+        FigureSpec('monthly_sales_trend', draw_sales_trend, aggregates["sales_trend"], (10, 5)),
+    ]
+
+def compute_aggregates(df):
+    """Compute every table and chart input reported by analyze_data from the loaded dataset."""
+    info = io.StringIO()
+    df.info(buf=info)
+    # Calculate total sales, sales by product category and the monthly trend
+    total_sales, category_sales, sales_trend = sales_results(aggregate_sales(df))
+    return {
+        "info": info.getvalue(),
+        # Include all columns in summary statistics (Total_Sales as stored in the file, as before;
+        # the sales totals below are recomputed from Quantity_Sold * Sale_Price)
+        "summary": df.describe(include='all'),
+        "missing": df.isnull().sum(),
+        "total_sales": total_sales,
+        "category_sales": category_sales,
+        "sales_trend": sales_trend,
+    }
+
+def compute_aggregates_streaming(file_path, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Compute the sales totals of a retail sales file too large for memory by reading it in
+    chunks of chunk_size rows and folding each chunk into running totals. Memory use depends
+    on chunk_size, not on the file size, and the totals match analyze_data exactly.
+    Returns None (after printing the reason) if the file cannot be read.
+    """
+    totals = new_sales_totals()
+    num_rows = 0
     try:
-        df = pd.read_csv(file_path)
-        print("Retail sales data loaded successfully.")
-        return df
+        for chunk in read_dataset_chunks(file_path, SALES_COLUMNS, SCHEMAS["retail_sales"], chunk_size):
+            totals = aggregate_sales(chunk, totals)
+            num_rows += len(chunk)
     except FileNotFoundError:
         print(f"Error: The file {file_path} does not exist.")
         return None
-    except pd.errors.EmptyDataError:
-        print("Error: The file is empty.")
+    except (ValueError, ImportError) as error:
+        print(f"Error: {error}")
         return None
-    except pd.errors.ParserError:
-        print("Error: The file could not be parsed.")
+    print(f"Retail sales data processed in chunks ({num_rows} rows).")
+
+    total_sales, category_sales, sales_trend = sales_results(totals)
+    return {"total_sales": total_sales, "category_sales": category_sales, "sales_trend": sales_trend}
+
+def partition_aggregates(file_path, start_date=None, end_date=None, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Return the StreamingStats and sales totals of one partition file, counting only the rows
+    ordered between start_date and end_date (inclusive) when they are given.
+    """
+    stats, totals = StreamingStats(), new_sales_totals()
+    for chunk in read_dataset_chunks(file_path, ANALYSIS_COLUMNS, SCHEMAS["retail_sales"], chunk_size):
+        chunk = rows_in_date_range(chunk, 'Order_Date', start_date, end_date)
+        stats.update(chunk)
+        totals = aggregate_sales(chunk, totals)
+    return stats, totals
+
+def compute_aggregates_partitioned(source, workers=1, start_date=None, end_date=None):
+    """
+    Compute the aggregates of a retail dataset split into partition files: a directory, a glob
+    pattern or a single file. Partitions whose path dates them outside start_date..end_date,
+    and files without the retail sales columns, are skipped unread; the others are read in a
+    pool of workers processes (keeping only the rows ordered in that range), each returning
+    partial statistics and sales totals that are merged in partition order. The sales totals
+    are integer cents, so they match analyze_data on the same rows exactly.
+    Returns None (after printing the reason) if the partitions cannot be read.
+    """
+    try:
+        selected, num_files = select_partitions(source, ANALYSIS_COLUMNS, start_date, end_date)
+        partials = map_partitions(partial(partition_aggregates, start_date=start_date, end_date=end_date),
+                                  selected, workers)
+    except (FileNotFoundError, ValueError, ImportError) as error:
+        print(f"Error: {error}")
         return None
 
+    stats, totals = StreamingStats(), new_sales_totals()
+    for partition_stats, partition_totals in partials:
+        stats.merge(partition_stats)
+        totals = merge_sales_totals(totals, partition_totals)
+    print(f"Retail sales data processed in {len(selected)} of {num_files} file(s) ({stats.num_rows} rows).")
+
+    total_sales, category_sales, sales_trend = sales_results(totals)
+    return {
+        "summary": stats.describe(),
+        "missing": stats.missing_values(),
+        "total_sales": total_sales,
+        "category_sales": category_sales,
+        "sales_trend": sales_trend,
+    }
+
 def analyze_data(df):
     """Analyze the retail sales dataset to provide insights."""
     if df is None:
         return
-    
-    # Display basic information about the dataset
-    print("\n--- Dataset Information ---")
-    print(df.info())
-    
-    print("\n--- Summary Statistics ---")
-    print(df.describe(include='all'))  # Include all columns in summary statistics
-
-    # Check for missing values
-    print("\n--- Missing Values ---")
-    print(df.isnull().sum())
-
-    # Calculate total sales and add a new column
-    df['Total_Sales'] = df['Quantity_Sold'] * df['Sale_Price']
-    total_sales = df['Total_Sales'].sum()
-    print(f"\nTotal Sales: ${total_sales:.2f}")
-
-    # Visualize total sales by product category
-    category_sales = df.groupby('Product_Category')['Total_Sales'].sum().reset_index()
-    
-    plt.figure(figsize=(10, 5))
-    plt.bar(category_sales['Product_Category'], category_sales['Total_Sales'], color='coral')
-    plt.title('Total Sales by Product Category')
-    plt.xlabel('Product Category')
-    plt.ylabel('Total Sales ($)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.show()
-
-    # Additional Analysis: Sales Trends Over Time
-    df['Order_Date'] = pd.to_datetime(df['Order_Date'])  # Convert to datetime
-    sales_trend = df.groupby(df['Order_Date'].dt.to_period("M"))['Total_Sales'].sum().reset_index()
-
-    plt.figure(figsize=(10, 5))
-    plt.plot(sales_trend['Order_Date'].dt.to_timestamp(), sales_trend['Total_Sales'], marker='o', color='blue')
-    plt.title('Monthly Sales Trend')
-    plt.xlabel('Month')
-    plt.ylabel('Total Sales ($)')
-    plt.grid()
-    plt.tight_layout()
-    plt.show()
+    report_aggregates(sys.modules[__name__], compute_aggregates(df))
 
 if __name__ == "__main__":
-    # Load the retail sales data from the CSV file
-    FILE_PATH = 'Data/retail_sales_data.csv'
-    retail_sales_data = load_retail_sales_data(FILE_PATH)
-    analyze_data(retail_sales_data)
+    main(sys.modules[__name__])
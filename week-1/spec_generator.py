@@ -0,0 +1,277 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from dataset_engine import (
+    CUSTOMER_GENDERS,
+    DEPARTMENTS,
+    ORDER_STATUSES,
+    PAYMENT_METHODS,
+    PRODUCT_CATEGORIES,
+    PRODUCT_NAMES,
+    WEATHER_CONDITIONS,
+    make_rng,
+    sequential_ids,
+)
+
+# Title: Schema-Driven Dataset Generator
+# Purpose: Generate datasets from declarative specs instead of hand-written generators. Each
+#          column has a distribution (uniform, normal, lognormal, Zipf-weighted categories, ...),
+#          columns can be correlated through a correlation spec (a Gaussian copula) or derived
+#          from other columns, and any column can have a null rate. Every column is built as a
+#          whole NumPy array, so millions of rows are generated per call.
+#
+# A spec is a dict with:
+#   "columns":      {name: column spec}, generated in order (a column may use the ones before it)
+#   "correlations": {(name_a, name_b): correlation} between numeric columns (optional)
+#
+# Column spec "kind"s and their parameters:
+#   id         prefix, offset               prefix + row number (offset + row index)
+#   category   values, weights | zipf       values drawn with the given weights, or Zipf
+#                                           weights 1 / rank**zipf (uniform if neither is given)
+#   lookup     column, values               a fixed value per category of another column
+#   bool       p                            True with probability p
+#   uniform    low, high                    continuous uniform
+#   integer    low, high                    uniform integers, both ends inclusive
+#   normal     mean, std
+#   lognormal  mean, sigma                  exp of a normal with that mean and std
+#   date       days                         dates within the given days before end_date
+#   product    columns                      product of the given columns
+#   linear     terms, intercept             intercept + sum(weight * column)
+# Common options for the numeric kinds: scale_by ({"column": category column, "factors":
+# {category: multiplier}}), min, max (clip), decimals (round) and dtype ("int" rounds to integers).
+# Every kind except id accepts null_rate, the fraction of values replaced by missing values
+# (integer columns with nulls become nullable Int64 columns).
+
+# Column kinds whose values come from a standard normal draw, so they can be correlated
+CORRELATABLE_KINDS = {"uniform", "integer", "normal", "lognormal"}
+
+EMPLOYEE_SPEC = {
+    "columns": {
+        "Employee_ID": {"kind": "id", "prefix": "E", "offset": 1000},
+        "Name": {"kind": "id", "prefix": "Employee_"},
+        "Age": {"kind": "normal", "mean": 38, "std": 9, "min": 22, "max": 60, "dtype": "int"},
+        "Department": {"kind": "category", "values": DEPARTMENTS, "weights": [0.1, 0.35, 0.25, 0.15, 0.15]},
+        "Salary": {
+            "kind": "lognormal", "mean": np.log(65000), "sigma": 0.2, "min": 30000, "max": 200000, "dtype": "int",
+            "scale_by": {"column": "Department", "factors": {
+                "HR": 0.9, "Engineering": 1.25, "Sales": 1.0, "Marketing": 0.95, "Finance": 1.1,
+            }},
+        },
+        "Joining_Year": {"kind": "integer", "low": 2010, "high": 2023},
+        "Performance_Score": {"kind": "normal", "mean": 3.4, "std": 0.7, "min": 1.0, "max": 5.0,
+                              "decimals": 2, "null_rate": 0.02},
+        "Years_in_Company": {"kind": "integer", "low": 1, "high": 12},
+        "Remote_Work": {"kind": "bool", "p": 0.35},
+    },
+    "correlations": {
+        ("Age", "Salary"): 0.5,
+        ("Age", "Joining_Year"): -0.4,  # Older employees tend to have joined earlier
+        ("Joining_Year", "Years_in_Company"): -0.9,  # Earlier joiners have been at the company longer
+        ("Age", "Years_in_Company"): 0.35,  # Implied by the two above (and keeps the matrix valid)
+        ("Performance_Score", "Salary"): 0.3,
+    },
+}
+
+OCEAN_CONDITIONS_SPEC = {
+    "columns": {
+        "Sample_ID": {"kind": "id", "prefix": "S", "offset": 1},
+        "Temperature_C": {"kind": "normal", "mean": 18, "std": 5, "min": 5.0, "max": 30.0, "decimals": 2},
+        "Salinity_PPT": {"kind": "normal", "mean": 35, "std": 1.5, "min": 30.0, "max": 40.0, "decimals": 2},
+        "Wave_Height_M": {"kind": "lognormal", "mean": np.log(1.2), "sigma": 0.5, "min": 0.1, "max": 5.0,
+                          "decimals": 2},
+        "Current_Speed_KPH": {"kind": "lognormal", "mean": np.log(3), "sigma": 0.5, "min": 0.5, "max": 10.0,
+                              "decimals": 2},
+        "Depth_M": {"kind": "integer", "low": 1, "high": 100},
+        "Weather_Condition": {"kind": "category", "values": WEATHER_CONDITIONS,
+                              "weights": [0.35, 0.3, 0.2, 0.05, 0.1]},
+    },
+    "correlations": {
+        ("Temperature_C", "Depth_M"): -0.5,  # Deeper water is colder
+        ("Temperature_C", "Salinity_PPT"): 0.2,
+        ("Wave_Height_M", "Current_Speed_KPH"): 0.6,
+    },
+}
+
+RETAIL_SALES_SPEC = {
+    "columns": {
+        "Order_ID": {"kind": "id", "prefix": "O", "offset": 1},
+        "Product_Name": {"kind": "category", "values": PRODUCT_NAMES, "zipf": 1.1},  # A few best sellers
+        "Quantity_Sold": {"kind": "lognormal", "mean": np.log(2.5), "sigma": 0.6, "min": 1, "max": 10,
+                          "dtype": "int"},
+        "Sale_Price": {"kind": "lognormal", "mean": np.log(35), "sigma": 0.6, "min": 5.0, "max": 500.0,
+                       "decimals": 2},
+        "Total_Sales": {"kind": "product", "columns": ["Quantity_Sold", "Sale_Price"], "decimals": 2},
+        "Order_Date": {"kind": "date", "days": 30},
+        "Customer_Age": {"kind": "normal", "mean": 38, "std": 12, "min": 18, "max": 65, "dtype": "int"},
+        "Customer_Gender": {"kind": "category", "values": CUSTOMER_GENDERS, "weights": [0.48, 0.48, 0.04]},
+        "Payment_Method": {"kind": "category", "values": PAYMENT_METHODS, "weights": [0.6, 0.25, 0.15]},
+        "Shipping_Cost": {"kind": "normal", "mean": 12, "std": 4, "min": 5.0, "max": 25.0, "decimals": 2},
+        "Order_Status": {"kind": "category", "values": ORDER_STATUSES, "weights": [0.8, 0.15, 0.05]},
+        "Product_Category": {"kind": "lookup", "column": "Product_Name", "values": PRODUCT_CATEGORIES},
+    },
+    "correlations": {
+        ("Quantity_Sold", "Sale_Price"): -0.3,  # Expensive items are bought in smaller quantities
+        ("Sale_Price", "Shipping_Cost"): 0.4,
+    },
+}
+
+# Built-in specs for the week-1 datasets, by the same names as data_io.SCHEMAS. They have the
+# columns and value ranges of the uniform generators in dataset_engine, but with skewed
+# distributions (Zipf-weighted categories, lognormal prices and salaries), correlated numeric
+# columns and, for employees, missing values; create_*_dataset.py use them with realistic=True.
+SPECS = {
+    "employee": EMPLOYEE_SPEC,
+    "ocean_conditions": OCEAN_CONDITIONS_SPEC,
+    "retail_sales": RETAIL_SALES_SPEC,
+}
+
+
+def normal_cdf(z):
+    """Standard normal CDF, vectorized (Abramowitz and Stegun 7.1.26, error below 1.5e-7)."""
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+def correlated_normals(rng, names, correlations, num_rows):
+    """
+    Draw a standard normal column for each name, correlated as given by correlations
+    ({(a, b): r}, the rest 0), by multiplying independent draws by the Cholesky factor.
+    The draws are single precision, which is plenty for synthetic data and twice as fast.
+    """
+    index = {name: position for position, name in enumerate(names)}
+    matrix = np.eye(len(names))
+    for (a, b), correlation in correlations.items():
+        matrix[index[a], index[b]] = matrix[index[b], index[a]] = correlation
+    try:
+        factor = np.linalg.cholesky(matrix).astype(np.float32)
+    except np.linalg.LinAlgError:
+        raise ValueError("The correlation spec is not a valid (positive definite) correlation matrix.") from None
+    # One row per column, so every column is a contiguous array
+    normals = factor @ rng.standard_normal((len(names), num_rows), dtype=np.float32)
+    return dict(zip(names, normals))
+
+
+def category_weights(column):
+    """Return the probability of each value of a category column spec."""
+    count = len(column["values"])
+    if "weights" in column:
+        weights = np.asarray(column["weights"], dtype=np.float64)
+    elif "zipf" in column:
+        weights = 1 / np.arange(1, count + 1) ** column["zipf"]
+    else:
+        weights = np.ones(count)
+    return weights / weights.sum()
+
+
+def _numeric_values(rng, column, z, num_rows):
+    """Draw a numeric column, from its correlated normal z when given, else directly."""
+    kind = column["kind"]
+    if kind in ("normal", "lognormal"):
+        z = z if z is not None else rng.standard_normal(num_rows, dtype=np.float32)
+        z = z.astype(np.float64)
+        if kind == "normal":
+            return column["mean"] + column["std"] * z
+        return np.exp(column["mean"] + column["sigma"] * z)
+    # Uniform kinds map a correlated normal through its CDF onto [0, 1)
+    u = normal_cdf(z) if z is not None else rng.random(num_rows)
+    if kind == "uniform":
+        return column["low"] + (column["high"] - column["low"]) * u
+    values = column["low"] + np.floor(u * (column["high"] - column["low"] + 1))
+    return np.minimum(values, column["high"]).astype(np.int64)
+
+
+def _finish_numeric(values, column, columns):
+    """Apply scale_by, clipping, rounding and the integer dtype to a numeric column."""
+    scale_by = column.get("scale_by")
+    if scale_by:
+        categories = columns[scale_by["column"]]
+        factors = np.array([scale_by["factors"].get(value, 1.0) for value in categories.categories])
+        values = values * factors[categories.codes]
+    if "min" in column or "max" in column:
+        values = np.clip(values, column.get("min"), column.get("max"))
+    if column.get("dtype") == "int":
+        return np.round(values).astype(np.int64)
+    if "decimals" in column:
+        return np.round(values, column["decimals"])
+    return values
+
+
+def _apply_nulls(rng, values, null_rate):
+    """Replace a null_rate fraction of values with missing values, keeping a suitable dtype."""
+    missing = rng.random(len(values)) < null_rate
+    if isinstance(values, pd.Categorical):
+        codes = np.where(missing, -1, values.codes)
+        return pd.Categorical.from_codes(codes, dtype=values.dtype)
+    if values.dtype == bool:
+        return pd.arrays.BooleanArray(values, missing)
+    if np.issubdtype(values.dtype, np.integer):
+        return pd.arrays.IntegerArray(values.astype(np.int64), missing)
+    values = values.copy()
+    values[missing] = np.datetime64("NaT") if np.issubdtype(values.dtype, np.datetime64) else np.nan
+    return values
+
+
+def generate_from_spec(num_rows, rng=None, start=0, spec=None, end_date=None):
+    """
+    Generate num_rows rows described by spec (one of SPECS or a dict in the same format).
+    start is the row offset of the first row, so IDs stay contiguous across chunks, and
+    date columns fall within their window of days before end_date (today if not given).
+    The signature matches the dataset_engine generators, so spec_generator(spec) can be
+    passed to write_dataset.
+    """
+    rng = rng if rng is not None else make_rng()
+    spec = SPECS[spec] if isinstance(spec, str) else spec
+    end_date = np.datetime64(end_date if end_date is not None else "today", "D")
+    correlations = spec.get("correlations", {})
+
+    names = list(dict.fromkeys(name for pair in correlations for name in pair))
+    for name in names:
+        if spec["columns"][name]["kind"] not in CORRELATABLE_KINDS:
+            raise ValueError(f"Column '{name}' cannot be correlated; use one of {sorted(CORRELATABLE_KINDS)}.")
+    latent = correlated_normals(rng, names, correlations, num_rows) if names else {}
+
+    columns = {}
+    for name, column in spec["columns"].items():
+        kind = column["kind"]
+        if kind == "id":
+            values = sequential_ids(column["prefix"], column.get("offset", 0) + start, num_rows)
+        elif kind == "category":
+            # Inverse-CDF sampling: one uniform draw and a binary search per row
+            cdf = np.cumsum(category_weights(column))
+            codes = np.minimum(np.searchsorted(cdf, rng.random(num_rows), side="right"), len(cdf) - 1)
+            values = pd.Categorical.from_codes(codes, categories=column["values"])
+        elif kind == "lookup":
+            source = columns[column["column"]]
+            codes = np.where(source.codes >= 0, source.codes % len(column["values"]), -1)
+            values = pd.Categorical.from_codes(codes, categories=column["values"])
+        elif kind == "bool":
+            values = rng.random(num_rows) < column["p"]
+        elif kind == "date":
+            days_ago = rng.integers(0, column["days"] + 1, size=num_rows).astype("timedelta64[D]")
+            values = (end_date - days_ago).astype("datetime64[s]")
+        elif kind == "product":
+            values = _finish_numeric(np.prod([np.asarray(columns[other], dtype=np.float64)
+                                              for other in column["columns"]], axis=0), column, columns)
+        elif kind == "linear":
+            values = column.get("intercept", 0) + sum(weight * np.asarray(columns[other], dtype=np.float64)
+                                                      for other, weight in column["terms"].items())
+            values = _finish_numeric(values, column, columns)
+        elif kind in CORRELATABLE_KINDS:
+            values = _finish_numeric(_numeric_values(rng, column, latent.get(name), num_rows), column, columns)
+        else:
+            raise ValueError(f"Unknown column kind '{kind}' for column '{name}'.")
+
+        if column.get("null_rate") and kind != "id":
+            values = _apply_nulls(rng, values, column["null_rate"])
+        columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def spec_generator(spec):
+    """Return a generator function for spec (a name in SPECS or a spec dict) usable with write_dataset."""
+    return partial(generate_from_spec, spec=spec)
@@ -0,0 +1,232 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Title: Streaming Statistics
+# Purpose: Compute the numbers behind df.describe(), df.isnull().sum() and df.corr() in a single
+#          pass over chunks of a dataset, so they can be produced for files larger than memory.
+#          Every accumulator can be merged with another one built from different chunks or in
+#          a different process.
+
+# Quantiles reported by describe(), as in pandas
+DESCRIBE_PERCENTILES = [0.25, 0.5, 0.75]
+
+# Distinct values tracked per non-numeric column before its counts are dropped
+MAX_CATEGORIES = 10_000
+
+
+class QuantileDigest:
+    """
+    Approximate quantiles of a stream of numbers, in the style of a merging t-digest.
+    Values are kept as weighted centroids that are small near the tails and larger near the
+    median; two digests are merged by pooling and re-compressing their centroids.
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    def update(self, values):
+        """Add an array of values (NaN must already be removed)."""
+        values = np.asarray(values, dtype=np.float64)
+        self._compress(values, np.ones(len(values)))
+
+    def merge(self, other):
+        """Fold another digest into this one."""
+        self._compress(other.means, other.weights)
+        return self
+
+    def _compress(self, means, weights):
+        """Pool new centroids with the current ones and merge neighbours that share a k-scale bucket."""
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        if len(means) == 0:
+            return
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        if len(means) <= self.compression:
+            # Small inputs are kept exactly, one centroid per value
+            self.means, self.weights = means, weights
+            return
+
+        # Map the cumulative weight at each centroid onto the k1 scale; one centroid per unit of k
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bucket = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q, minimum=None, maximum=None):
+        """Return the approximate q-quantile; minimum/maximum pin the ends when known."""
+        if len(self.means) == 0:
+            return np.nan
+        # Centroid centres as 0-based ranks, so exact data interpolates like pandas' quantile
+        total = self.weights.sum()
+        positions = np.cumsum(self.weights) - (self.weights + 1) / 2
+        means = self.means
+        if minimum is not None and maximum is not None:
+            positions = np.r_[0.0, positions, total - 1]
+            means = np.r_[minimum, means, maximum]
+        return float(np.interp(q * (total - 1), positions, means))
+
+
+class StreamingStats:
+    """
+    Single-pass, mergeable summary of a dataset: row and null counts, per-column mean,
+    variance (Welford/Chan updates), min, max and approximate quantiles for numeric columns,
+    value counts for the other columns, and the pairwise Pearson correlation matrix.
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.num_rows = 0
+        self.null_counts = pd.Series(dtype="int64")
+        self.numeric_columns = None
+        self.other_columns = None
+        # Pairwise accumulators: entry [i, j] covers the rows where columns i and j are both present
+        self.pair_count = None
+        self.pair_mean = None  # mean of column i over those rows
+        self.pair_m2 = None  # sum of squared deviations of column i over those rows
+        self.comoment = None  # sum of products of the deviations of columns i and j
+        self.minimum = None
+        self.maximum = None
+        self.digests = None
+        self.value_counts = {}
+
+    def _start(self, df):
+        """Set up the accumulators from the columns of the first chunk."""
+        numeric = df.select_dtypes(include="number").columns
+        self.numeric_columns = [name for name in df.columns if name in numeric and df[name].dtype != bool]
+        self.null_counts = pd.Series(0, index=df.columns, dtype="int64")
+        self.other_columns = [name for name in df.columns if name not in self.numeric_columns]
+        k = len(self.numeric_columns)
+        self.pair_count = np.zeros((k, k))
+        self.pair_mean = np.zeros((k, k))
+        self.pair_m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+        self.minimum = np.full(k, np.inf)
+        self.maximum = np.full(k, -np.inf)
+        self.digests = [QuantileDigest(self.compression) for _ in range(k)]
+        self.value_counts = {name: pd.Series(dtype="int64") for name in self.other_columns}
+
+    def update(self, df):
+        """Fold one chunk (a DataFrame) into the statistics."""
+        if self.numeric_columns is None:
+            self._start(df)
+        self.num_rows += len(df)
+        self.null_counts = self.null_counts.add(df.isnull().sum(), fill_value=0).astype("int64")
+
+        values = df[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        if len(values):
+            self._merge_moments(*self._chunk_moments(values, present))
+            with np.errstate(invalid="ignore"):
+                self.minimum = np.fmin(self.minimum, np.where(present, values, np.inf).min(axis=0))
+                self.maximum = np.fmax(self.maximum, np.where(present, values, -np.inf).max(axis=0))
+            for index, digest in enumerate(self.digests):
+                digest.update(values[present[:, index], index])
+
+        for name in self.other_columns:
+            counts = self.value_counts[name]
+            if counts is None:
+                continue  # Too many distinct values to track
+            counts = counts.add(df[name].astype(str)[df[name].notna()].value_counts(), fill_value=0)
+            self.value_counts[name] = counts.astype("int64") if len(counts) <= MAX_CATEGORIES else None
+        return self
+
+    @staticmethod
+    def _chunk_moments(values, present):
+        """Return the pairwise count, mean, M2 and co-moment matrices of one chunk."""
+        weight = present.astype(np.float64)
+        # Centre each column on its chunk mean first to keep the products well conditioned
+        with np.errstate(invalid="ignore", divide="ignore"):
+            shift = np.where(weight.sum(axis=0) > 0, np.nansum(values, axis=0) / weight.sum(axis=0), 0.0)
+        centered = np.where(present, values - shift, 0.0)
+
+        count = weight.T @ weight
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, (centered.T @ weight) / count, 0.0)
+        m2 = (centered ** 2).T @ weight - count * mean ** 2
+        comoment = centered.T @ centered - count * mean * mean.T
+        return count, mean + shift[:, None], m2, comoment
+
+    def _merge_moments(self, count, mean, m2, comoment):
+        """Combine pairwise moments with the running ones (Chan et al. parallel update)."""
+        total = self.pair_count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.pair_mean
+            factor = np.where(total > 0, self.pair_count * count / total, 0.0)
+            self.comoment = self.comoment + comoment + delta * delta.T * factor
+            self.pair_m2 = self.pair_m2 + m2 + delta ** 2 * factor
+            self.pair_mean = self.pair_mean + delta * np.where(total > 0, count / total, 0.0)
+        self.pair_count = total
+
+    def merge(self, other):
+        """Fold statistics computed over other chunks (or in another process) into these."""
+        if other.numeric_columns is None:
+            return self
+        if self.numeric_columns is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if other.numeric_columns != self.numeric_columns:
+            raise ValueError("Cannot merge statistics computed over different numeric columns.")
+        self.num_rows += other.num_rows
+        self.null_counts = self.null_counts.add(other.null_counts, fill_value=0).astype("int64")
+        self._merge_moments(other.pair_count, other.pair_mean, other.pair_m2, other.comoment)
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        for digest, other_digest in zip(self.digests, other.digests):
+            digest.merge(other_digest)
+        for name in self.other_columns:
+            mine, theirs = self.value_counts.get(name), other.value_counts.get(name)
+            if mine is None or theirs is None:
+                self.value_counts[name] = None
+            else:
+                counts = mine.add(theirs, fill_value=0)
+                self.value_counts[name] = counts.astype("int64") if len(counts) <= MAX_CATEGORIES else None
+        return self
+
+    def describe(self):
+        """Return summary statistics laid out like df.describe(include='all')."""
+        rows = {}
+        for index, name in enumerate(self.numeric_columns or []):
+            count = self.pair_count[index, index]
+            variance = self.pair_m2[index, index] / (count - 1) if count > 1 else np.nan
+            minimum = self.minimum[index] if count else np.nan
+            maximum = self.maximum[index] if count else np.nan
+            stats = {
+                "count": count,
+                "mean": self.pair_mean[index, index] if count else np.nan,
+                "std": np.sqrt(variance),
+                "min": minimum,
+            }
+            for q in DESCRIBE_PERCENTILES:
+                stats[f"{q:.0%}"] = self.digests[index].quantile(q, minimum, maximum)
+            stats["max"] = maximum
+            rows[name] = stats
+        for name in self.other_columns or []:
+            counts = self.value_counts[name]
+            stats = {"count": self.num_rows - self.null_counts.get(name, 0)}
+            if counts is not None and len(counts):
+                stats.update({"unique": len(counts), "top": counts.idxmax(), "freq": counts.max()})
+            rows[name] = stats
+        index = ["count", "unique", "top", "freq", "mean", "std", "min"]
+        index += [f"{q:.0%}" for q in DESCRIBE_PERCENTILES] + ["max"]
+        summary = pd.DataFrame(rows, index=index)[[name for name in self.null_counts.index if name in rows]]
+        # Drop the rows that do not apply to any column, as pandas does
+        return summary.dropna(how="all")
+
+    def missing_values(self):
+        """Return the number of missing values per column, like df.isnull().sum()."""
+        return self.null_counts
+
+    def corr(self):
+        """Return the Pearson correlation matrix of the numeric columns, like df.corr(numeric_only=True)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = self.comoment / np.sqrt(self.pair_m2 * self.pair_m2.T)
+        matrix[self.pair_count < 2] = np.nan
+        return pd.DataFrame(matrix, index=self.numeric_columns, columns=self.numeric_columns)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The week-1 modules import each other by plain name, as when a script is run from week-1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
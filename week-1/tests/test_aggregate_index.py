@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregate_index import INDEX_SPECS, build_index, index_path_for, load_index, open_index
+from dataset_engine import generate_retail_sales_data, make_rng
+
+
+def write_rows(path, start, num_rows, seed, **overrides):
+    df = generate_retail_sales_data(num_rows, make_rng(seed), start=start)
+    for column, value in overrides.items():
+        df[column] = value
+    df.to_csv(path, mode="a" if start else "w", header=not start, index=False)
+
+
+@pytest.fixture
+def sales_file(tmp_path):
+    path = str(tmp_path / "sales.csv")
+    write_rows(path, 0, 2_000, seed=1)
+    return path
+
+
+def append_updates(path):
+    """Append three blocks of rows, the later ones adding a new category and new months."""
+    write_rows(path, 2_000, 300, seed=2)
+    write_rows(path, 2_300, 200, seed=3, Product_Category="Books")
+    write_rows(path, 2_500, 100, seed=4, Order_Date="2031-06-15")
+
+
+def assert_same_index(index, expected):
+    assert index.num_rows == expected.num_rows
+    for key in expected.keys:
+        assert index.groups[key].labels == expected.groups[key].labels
+        for measure in expected.measures:
+            pd.testing.assert_frame_equal(index.group_stats(key, measure), expected.group_stats(key, measure),
+                                          rtol=1e-9)
+        for label in expected.groups[key].labels:
+            np.testing.assert_array_equal(index.rows(**{key: label}), expected.rows(**{key: label}))
+
+
+def test_updates_match_a_full_rebuild(sales_file):
+    index, how = open_index("retail_sales", sales_file)
+    assert how == "built"
+    append_updates(sales_file)
+    index, how = open_index("retail_sales", sales_file)
+    assert how == "updated"
+    assert len(index.groups["Product_Category"].runs) == 2
+    assert_same_index(index, build_index("retail_sales", sales_file))
+
+
+def test_each_update_adds_a_run(sales_file):
+    open_index("retail_sales", sales_file)
+    write_rows(sales_file, 2_000, 300, seed=2)
+    open_index("retail_sales", sales_file)
+    write_rows(sales_file, 2_300, 200, seed=3, Product_Category="Books")
+    index, how = open_index("retail_sales", sales_file)
+    assert how == "updated"
+    assert len(index.groups["Product_Category"].runs) == 3
+    assert index.groups["Product_Category"].run_counts.shape == (3, 6)
+    assert_same_index(index, build_index("retail_sales", sales_file))
+
+    # The runs survive saving and loading, and rebuild merges them again
+    assert_same_index(load_index(index_path_for(sales_file)), index)
+    rebuilt, how = open_index("retail_sales", sales_file, rebuild=True)
+    assert how == "built"
+    assert len(rebuilt.groups["Product_Category"].runs) == 1
+    assert_same_index(rebuilt, index)
+
+
+def test_index_matches_pandas(sales_file):
+    append_updates(sales_file)
+    open_index("retail_sales", sales_file)
+    index, _ = open_index("retail_sales", sales_file)
+    df = pd.read_csv(sales_file, parse_dates=["Order_Date"])
+    expected = df.groupby("Product_Category")["Sale_Price"].agg(["count", "mean", "std"])
+    stats = index.group_stats("Product_Category", "Sale_Price")
+    np.testing.assert_array_equal(stats.index, expected.index)
+    np.testing.assert_allclose(stats["Sale_Price_mean"], expected["mean"], rtol=1e-9)
+    np.testing.assert_allclose(stats["Sale_Price_std"], expected["std"], rtol=1e-9)
+
+    month = df["Order_Date"].dt.strftime("%Y-%m")
+    # Generated orders are dated relative to today, so take the month of the first Books row
+    label = month[2_300]
+    matches = np.flatnonzero((df["Product_Category"] == "Books") & (month == label))
+    assert 0 < len(matches) <= 200
+    np.testing.assert_array_equal(index.rows(Product_Category="Books", Order_Month=label), matches)
+    assert len(index.rows(Order_Month="2031-06")) == 100
+
+
+def test_unchanged_file_is_loaded_and_rewritten_file_is_rebuilt(sales_file):
+    open_index("retail_sales", sales_file)
+    assert open_index("retail_sales", sales_file)[1] == "loaded"
+    write_rows(sales_file, 0, 1_500, seed=5)
+    index, how = open_index("retail_sales", sales_file)
+    assert how == "built"
+    assert index.num_rows == 1_500
+
+
+def test_unknown_key_is_rejected(sales_file):
+    index, _ = open_index("retail_sales", sales_file)
+    with pytest.raises(ValueError):
+        index.rows(Customer_Gender="Other")
+    assert set(index.keys) == set(INDEX_SPECS["retail_sales"]["keys"])
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_quality import RULE_SPECS, DataValidator, rule_violations, validate_file
+from dataset_engine import (
+    generate_employee_data,
+    generate_ocean_conditions_data,
+    generate_retail_sales_data,
+    make_rng,
+)
+
+STATUSES = ["Shipped", "Shipped", None, "Lost", "Cancelled"]
+
+
+def broken_rows(values, rule, **columns):
+    df = pd.DataFrame({rule["column"]: values, **columns})
+    return np.flatnonzero(rule_violations(df, rule)).tolist()
+
+
+def test_required():
+    rule = {"kind": "required", "column": "Age"}
+    assert broken_rows([30, np.nan, 41], rule) == [1]
+    assert broken_rows(pd.array([30, None, 41], dtype="Int64"), rule) == [1]
+
+
+def test_range_on_numbers():
+    assert broken_rows([0.5, 1.0, np.nan, 5.0, 5.01], {"kind": "range", "column": "Score", "min": 1.0, "max": 5.0}) \
+        == [0, 4]
+    assert broken_rows([17, 18, 99], {"kind": "range", "column": "Age", "min": 18}) == [0]
+    assert broken_rows([17, 18, 99], {"kind": "range", "column": "Age", "max": 65}) == [2]
+
+
+def test_range_on_dates():
+    tomorrow = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    dates = pd.Series([pd.Timestamp("2024-03-01"), pd.NaT, tomorrow + pd.Timedelta(days=1)])
+    assert broken_rows(dates, {"kind": "range", "column": "Order_Date", "max": "today"}) == [2]
+    assert broken_rows(dates, {"kind": "range", "column": "Order_Date", "min": "2024-03-02"}) == [0]
+
+
+@pytest.mark.parametrize("dtype", ["object", "str", "category"])
+def test_allowed(dtype):
+    rule = {"kind": "allowed", "column": "Order_Status", "values": ["Shipped", "Processing", "Cancelled"]}
+    assert broken_rows(pd.Series(STATUSES, dtype=dtype), rule) == [3]
+
+
+@pytest.mark.parametrize("dtype", ["object", "str", "category"])
+def test_pattern(dtype):
+    rule = {"kind": "pattern", "column": "Order_ID", "pattern": r"O\d+"}
+    ids = pd.Series(["O1", "O22", None, "O3x", "XO4", ""], dtype=dtype)
+    # The whole value must match, not just a prefix or a substring
+    assert broken_rows(ids, rule) == [3, 4, 5]
+
+
+def test_pattern_on_numbers():
+    assert broken_rows([1, 22, -3], {"kind": "pattern", "column": "Code", "pattern": r"\d+"}) == [2]
+
+
+def test_product():
+    rule = {"kind": "product", "column": "Total_Sales", "columns": ["Quantity_Sold", "Sale_Price"], "decimals": 2}
+    totals = [29.97, 29.96, 100.0, 3 * 0.1 + 0.004]
+    assert broken_rows(totals, rule, Quantity_Sold=[3, 3, 10, 3], Sale_Price=[9.99, 9.99, 10.01, 0.1]) == [1, 2]
+
+
+def test_unknown_kind_is_rejected_before_reading():
+    with pytest.raises(ValueError, match="Unknown rule kind"):
+        DataValidator([{"kind": "unique", "column": "Order_ID"}])
+
+
+def test_validator_counts_across_chunks():
+    rules = [{"kind": "range", "column": "Age", "min": 18}, {"kind": "required", "column": "Age"}]
+    validator = DataValidator(rules, max_samples=2)
+    validator.update(pd.DataFrame({"Age": [10.0, 30.0, np.nan]}))
+    validator.update(pd.DataFrame({"Age": [5.0, 4.0, np.nan]}))
+    report = validator.report()
+    assert report["Violations"].tolist() == [3, 2]
+    assert report["Sample_Rows"].tolist() == ["0, 3", "2, 5"]
+    assert validator.num_rows == 6
+    assert validator.num_violations == 5
+
+
+@pytest.mark.parametrize("name, generator", [
+    ("employee", generate_employee_data),
+    ("ocean_conditions", generate_ocean_conditions_data),
+    ("retail_sales", generate_retail_sales_data),
+])
+def test_generated_files_pass(tmp_path, name, generator):
+    path = tmp_path / f"{name}.csv"
+    generator(3_000, make_rng(5)).to_csv(path, index=False)
+    validator = validate_file(name, str(path), chunk_size=1_000)
+    assert validator.num_rows == 3_000
+    assert validator.num_violations == 0, validator.report()
+
+
+def test_broken_rows_are_found_in_a_file(tmp_path):
+    df = generate_retail_sales_data(3_000, make_rng(6))
+    df.loc[1_500, "Order_ID"] = "X1500"
+    df["Product_Category"] = df["Product_Category"].astype("str")
+    df.loc[2_500, "Product_Category"] = "Books"
+    df.loc[10, "Total_Sales"] += 1
+    df.loc[20, "Customer_Age"] = np.nan
+    path = tmp_path / "retail_sales.csv"
+    df.to_csv(path, index=False)
+
+    report = validate_file("retail_sales", str(path), chunk_size=1_000).report().set_index("Rule")
+    broken = report[report["Violations"] > 0]
+    assert broken["Sample_Rows"].to_dict() == {
+        "Customer_Age is present": "20",
+        r"Order_ID matches O\d+": "1500",
+        "Total_Sales = Quantity_Sold * Sale_Price": "10",
+        "Product_Category is one of 5 values": "2500",
+    }
+    assert len(report) == len(RULE_SPECS["retail_sales"])
@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+import pytest
+
+import dataset_engine
+from dataset_engine import generate_ocean_conditions_data, generate_retail_sales_data, write_dataset
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Let write_dataset start workers for small datasets on any machine."""
+    monkeypatch.setattr(dataset_engine, "PARALLEL_MIN_ROWS", 0)
+    monkeypatch.setattr(dataset_engine.os, "cpu_count", lambda: 4)
+
+
+def read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("generator", [generate_retail_sales_data, generate_ocean_conditions_data])
+def test_csv_output_does_not_depend_on_workers(tmp_path, parallel, generator):
+    outputs = []
+    for workers in (1, 2):
+        file_name = str(tmp_path / f"data-{workers}.csv")
+        columns, files = write_dataset(generator, 2_500, file_name, seed=7, chunk_size=1_000, workers=workers)
+        assert files == [file_name]
+        outputs.append(read_bytes(file_name))
+    assert outputs[0] == outputs[1]
+    # No shard files are left behind by the parallel merge
+    assert sorted(os.listdir(tmp_path)) == ["data-1.csv", "data-2.csv"]
+
+
+def test_parquet_output_does_not_depend_on_workers(tmp_path, parallel):
+    frames = []
+    for workers in (1, 2):
+        file_name = str(tmp_path / f"data-{workers}.parquet")
+        write_dataset(generate_retail_sales_data, 2_500, file_name, seed=7, chunk_size=1_000, workers=workers)
+        frames.append(pd.read_parquet(file_name))
+    assert len(frames[0]) == 2_500
+    pd.testing.assert_frame_equal(frames[0], frames[1])
+
+
+def test_sharded_output_does_not_depend_on_workers(tmp_path, parallel):
+    shards = []
+    for workers in (1, 2):
+        directory = tmp_path / str(workers)
+        directory.mkdir()
+        _, files = write_dataset(generate_retail_sales_data, 2_500, str(directory / "data.csv"), seed=7,
+                                 chunk_size=1_000, workers=workers, sharded=True)
+        shards.append([read_bytes(path) for path in files])
+    assert len(shards[0]) == 3
+    assert shards[0] == shards[1]
+
+
+def test_same_seed_gives_same_rows(tmp_path):
+    first = str(tmp_path / "first.csv")
+    second = str(tmp_path / "second.csv")
+    write_dataset(generate_retail_sales_data, 1_500, first, seed=11, chunk_size=500)
+    write_dataset(generate_retail_sales_data, 1_500, second, seed=11, chunk_size=500)
+    assert read_bytes(first) == read_bytes(second)
+    assert pd.read_csv(first)["Order_ID"].is_unique
@@ -0,0 +1,112 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import partitions
+import retail_sales_analysis
+from data_io import convert_dataset
+from dataset_engine import generate_employee_data, generate_retail_sales_data, make_rng
+from partitions import find_partitions, partition_date, prune_partitions, rows_in_date_range, select_partitions
+
+DAYS = ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04"]
+
+
+def retail_day(day, seed, num_rows=200):
+    df = generate_retail_sales_data(num_rows, make_rng(seed))
+    df["Order_Date"] = pd.Timestamp(day)
+    return df
+
+
+@pytest.fixture
+def partition_dir(tmp_path):
+    """One retail file per day, a Hive-style day, an undated retail file and an employee file."""
+    for seed, day in enumerate(DAYS):
+        retail_day(day, seed).to_csv(tmp_path / f"retail_sales_{day}.csv", index=False)
+    (tmp_path / "Order_Date=2024-03-05").mkdir()
+    retail_day("2024-03-05", 10).to_csv(tmp_path / "Order_Date=2024-03-05" / "part-0.csv", index=False)
+    retail_day("2024-02-20", 11).to_csv(tmp_path / "retail_sales_backfill.csv", index=False)
+    generate_employee_data(50, make_rng(12)).to_csv(tmp_path / "employee_data.csv", index=False)
+    (tmp_path / "README.txt").write_text("not a data file")
+    return tmp_path
+
+
+def test_partition_date_uses_the_last_valid_date():
+    assert partition_date("2024-01-31/retail_sales_2024-03-02.csv") == date(2024, 3, 2)
+    assert partition_date("Order_Date=2024-03-05/part-0.csv") == date(2024, 3, 5)
+    assert partition_date("2024-03-01/run-9999-99-99.csv") == date(2024, 3, 1)
+    assert partition_date("retail_sales_backfill.csv") is None
+
+
+def test_find_partitions_lists_data_files_only(partition_dir):
+    names = [os.path.relpath(path, partition_dir) for path in find_partitions(str(partition_dir))]
+    assert names == sorted(names)
+    assert len(names) == 7
+    assert "README.txt" not in names
+    assert find_partitions(str(partition_dir / "retail_sales_2024-*.csv")) == \
+        [str(partition_dir / f"retail_sales_{day}.csv") for day in DAYS]
+    with pytest.raises(FileNotFoundError):
+        find_partitions(str(partition_dir / "*.parquet"))
+
+
+def test_npcol_store_is_one_partition(partition_dir):
+    store = partition_dir / "retail_sales_2024-03-06.npcol"
+    convert_dataset(str(partition_dir / "retail_sales_2024-03-01.csv"), str(store))
+    paths = find_partitions(str(partition_dir))
+    assert str(store) in paths
+    assert not any(path.startswith(str(store) + os.sep) for path in paths)
+
+
+def test_prune_keeps_dated_range_and_undated_files(partition_dir):
+    paths = find_partitions(str(partition_dir))
+    kept = prune_partitions(paths, "2024-03-02", date(2024, 3, 3))
+    assert [os.path.basename(path) for path in kept] == [
+        "employee_data.csv", "retail_sales_2024-03-02.csv", "retail_sales_2024-03-03.csv",
+        "retail_sales_backfill.csv",
+    ]
+    assert prune_partitions(paths) == paths
+    assert len(prune_partitions(paths, start_date="2024-03-04")) == 4
+
+
+def test_select_skips_pruned_and_foreign_files_unread(partition_dir, monkeypatch):
+    opened = []
+    real_read_column_names = partitions.read_column_names
+    monkeypatch.setattr(partitions, "read_column_names",
+                        lambda path: opened.append(os.path.basename(path)) or real_read_column_names(path))
+    selected, num_files = select_partitions(str(partition_dir), retail_sales_analysis.ANALYSIS_COLUMNS,
+                                            "2024-03-03", "2024-03-05")
+    assert num_files == 7
+    assert [os.path.relpath(path, partition_dir) for path in selected] == [
+        os.path.join("Order_Date=2024-03-05", "part-0.csv"), "retail_sales_2024-03-03.csv",
+        "retail_sales_2024-03-04.csv", "retail_sales_backfill.csv",
+    ]
+    # Only the kept partitions have their header read; the employee file is dropped by its columns
+    assert "retail_sales_2024-03-01.csv" not in opened
+    assert "employee_data.csv" in opened
+
+
+def test_select_reports_empty_selections(partition_dir):
+    retail = partition_dir / "retail_sales_2024-03-01.csv"
+    with pytest.raises(FileNotFoundError):
+        select_partitions(str(retail), retail_sales_analysis.ANALYSIS_COLUMNS, "2025-01-01")
+    with pytest.raises(ValueError):
+        select_partitions(str(partition_dir / "employee_*.csv"), retail_sales_analysis.ANALYSIS_COLUMNS)
+
+
+def test_rows_in_date_range_includes_the_whole_end_day():
+    df = pd.DataFrame({"Order_Date": pd.to_datetime(["2024-03-01 00:00", "2024-03-02 23:59", "2024-03-03 00:00"])})
+    assert len(rows_in_date_range(df, "Order_Date", "2024-03-02", "2024-03-02")) == 1
+    assert len(rows_in_date_range(df, "Order_Date", end_date="2024-03-02")) == 2
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_partitioned_totals_match_the_selected_rows(partition_dir, workers):
+    aggregates = retail_sales_analysis.compute_aggregates_partitioned(str(partition_dir), workers,
+                                                                      "2024-03-02", "2024-03-04")
+    rows = pd.concat([pd.read_csv(partition_dir / f"retail_sales_{day}.csv", parse_dates=["Order_Date"])
+                      for day in DAYS[1:]])
+    expected = retail_sales_analysis.compute_aggregates(rows)
+    assert aggregates["total_sales"] == expected["total_sales"]
+    pd.testing.assert_frame_equal(aggregates["category_sales"], expected["category_sales"])
+    assert aggregates["summary"].loc["count", "Sale_Price"] == len(rows)
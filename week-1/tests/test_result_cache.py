@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache, cached_result
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+    return str(path)
+
+
+def test_key_is_stable_for_an_unchanged_file(cache, data_file):
+    assert cache.key(data_file, "sales:1") == cache.key(data_file, "sales:1")
+
+
+def test_key_depends_on_namespace_and_contents(cache, data_file):
+    key = cache.key(data_file, "sales:1")
+    assert cache.key(data_file, "sales:2") != key
+    # Same size and modification time, different bytes: the hash still tells them apart
+    stat = os.stat(data_file)
+    with open(data_file, "w") as file:
+        file.write("a,b\n3,4\n")
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    cache_without_index = ResultCache(cache.cache_dir + "-fresh")
+    assert cache_without_index.key(data_file, "sales:1") != key
+
+
+def test_key_changes_when_the_file_is_modified(cache, data_file):
+    key = cache.key(data_file, "sales:1")
+    with open(data_file, "a") as file:
+        file.write("5,6\n")
+    assert cache.key(data_file, "sales:1") != key
+
+
+def test_hash_is_reused_while_size_and_mtime_match(cache, data_file, monkeypatch):
+    calls = []
+    real_hash_file = result_cache.hash_file
+    monkeypatch.setattr(result_cache, "hash_file", lambda path: calls.append(path) or real_hash_file(path))
+    cache.key(data_file, "sales:1")
+    cache.key(data_file, "employee:1")
+    assert len(calls) == 1
+    os.utime(data_file, ns=(0, 10**9))
+    cache.key(data_file, "sales:1")
+    assert len(calls) == 2
+
+
+def test_cached_result_computes_once(cache, data_file):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total": 42}
+
+    assert cached_result(data_file, "sales:1", compute, cache) == ({"total": 42}, False)
+    assert cached_result(data_file, "sales:1", compute, cache) == ({"total": 42}, True)
+    assert len(calls) == 1
+
+
+def test_failed_computation_is_not_cached(cache, data_file):
+    assert cached_result(data_file, "sales:1", lambda: None, cache) == (None, False)
+    assert cached_result(data_file, "sales:1", lambda: 7, cache) == (7, False)
+
+
+def entry_names(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name != result_cache.FINGERPRINT_INDEX)
+
+
+def test_evicts_least_recently_used_entries(cache):
+    value = "x" * 1_000
+    for age, key in enumerate(["old", "middle", "new"]):
+        cache.put(key, value)
+        # Spread the modification times so the order does not depend on timer resolution
+        os.utime(cache._entry_path(key), ns=(10**18 + age, 10**18 + age))
+    entry_size = os.path.getsize(cache._entry_path("old"))
+
+    # Reading an entry makes it the most recently used one
+    assert cache.get("old") == value
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+    assert entry_names(cache) == ["new.pkl", "old.pkl"]
+    assert cache.get("middle") is None
+
+
+def test_evict_keeps_the_fingerprint_index(cache, data_file):
+    cache.put(cache.key(data_file, "sales:1"), "x" * 1_000)
+    cache.max_bytes = 0
+    cache.evict()
+    assert entry_names(cache) == []
+    assert os.path.exists(os.path.join(cache.cache_dir, result_cache.FINGERPRINT_INDEX))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_stats import StreamingStats
+
+MOMENTS = ["count", "mean", "std", "min", "max"]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(3)
+    num_rows = 5_000
+    df = pd.DataFrame({
+        "price": rng.uniform(5, 500, num_rows),
+        # A large offset checks that the variance does not lose precision
+        "level": 1e9 + rng.normal(0, 1, num_rows),
+        "quantity": rng.integers(1, 20, num_rows),
+        "status": pd.Categorical(rng.choice(["Shipped", "Processing", "Cancelled"], num_rows)),
+    })
+    df["cost"] = df["price"] * 0.3 + rng.normal(0, 5, num_rows)
+    # Missing values in different rows of each column make the correlations pairwise
+    df.loc[rng.random(num_rows) < 0.1, "price"] = np.nan
+    df.loc[rng.random(num_rows) < 0.05, "cost"] = np.nan
+    df.loc[rng.random(num_rows) < 0.02, "status"] = np.nan
+    return df
+
+
+def stream(df, chunk_size):
+    stats = StreamingStats()
+    for start in range(0, len(df), chunk_size):
+        stats.update(df.iloc[start:start + chunk_size])
+    return stats
+
+
+@pytest.mark.parametrize("chunk_size", [1, 777, 5_000])
+def test_moments_match_pandas(frame, chunk_size):
+    if chunk_size == 1:
+        frame = frame.head(300)
+    summary = stream(frame, chunk_size).describe()
+    numeric = frame.describe()
+    pd.testing.assert_frame_equal(summary.loc[MOMENTS, numeric.columns].astype("float64"),
+                                  numeric.loc[MOMENTS], rtol=1e-9)
+
+
+def test_quantiles_are_close_to_pandas(frame):
+    # The digest interpolates between centroids, so only continuous columns are compared
+    columns = ["price", "level", "cost"]
+    summary = stream(frame, 777).describe()[columns]
+    numeric = frame.describe()[columns]
+    spread = numeric.loc["max"] - numeric.loc["min"]
+    for q in ["25%", "50%", "75%"]:
+        error = (summary.loc[q].astype("float64") - numeric.loc[q]).abs()
+        assert (error <= 0.01 * spread).all(), q
+
+
+def test_correlation_matches_pandas(frame):
+    # pandas itself loses digits on the offset column, so compare absolutely
+    pd.testing.assert_frame_equal(stream(frame, 777).corr(), frame.corr(numeric_only=True), rtol=0, atol=1e-6)
+
+
+def test_missing_values_and_categories_match_pandas(frame):
+    stats = stream(frame, 777)
+    pd.testing.assert_series_equal(stats.missing_values(), frame.isnull().sum())
+    summary = stats.describe()
+    expected = frame.describe(include="all")["status"]
+    for row in ["count", "unique", "top", "freq"]:
+        assert summary.loc[row, "status"] == expected[row], row
+
+
+def test_merge_matches_a_single_pass(frame):
+    merged = StreamingStats()
+    for part in np.array_split(np.arange(len(frame)), 4):
+        merged.merge(stream(frame.iloc[part], 500))
+    single = stream(frame, 500)
+    assert merged.num_rows == single.num_rows
+    rows = MOMENTS + ["unique", "top", "freq"]
+    pd.testing.assert_frame_equal(merged.describe().loc[rows], single.describe().loc[rows], rtol=1e-9)
+    pd.testing.assert_frame_equal(merged.corr(), single.corr(), rtol=1e-9)
+
+
+def test_merge_rejects_different_columns(frame):
+    stats = stream(frame[["price", "cost"]], 1_000)
+    with pytest.raises(ValueError):
+        stats.merge(stream(frame[["price", "quantity"]], 1_000))